@@ -0,0 +1,54 @@
+"""
+Per-project node checkpoints.
+
+Every workflow node's output is saved as a `NodeCheckpoint` as soon as the
+node finishes. When a run fails (e.g. the critic hits a rate limit), retrying
+the same project replays the saved outputs instead of calling the LLM again,
+so the run restarts at the first node without a checkpoint.
+
+Each checkpoint also records the model profile and model the node ran on
+(see analyzer.llm_routing), so a project keeps the routing its analysis used.
+Once the run completes the outputs are compressed (`NodeCheckpoint.objects.compress`);
+"refine" requests still replay them for a paraphrased idea.
+"""
+
+from asgiref.sync import sync_to_async
+
+from .models import NodeCheckpoint
+
+
+class ProjectCheckpointStore:
+    """Node checkpoints of one project, loaded once when the run starts."""
+
+    def __init__(self, project):
+        self.project = project
+        self._outputs = {
+            checkpoint.node: checkpoint.saved_output
+            for checkpoint in NodeCheckpoint.objects.filter(project=project)
+        }
+
+    @classmethod
+    async def aload(cls, project):
+        return await sync_to_async(cls)(project)
+
+    def load(self, node: str):
+        """Saved output of the node, or None if it has not completed yet."""
+        return self._outputs.get(node)
+
+    def save(self, node: str, output: dict, profile: str = None, model: str = None) -> None:
+        # A single upsert statement: parallel nodes save at the same time, and
+        # a read-then-write transaction would deadlock on SQLite's write lock
+        NodeCheckpoint.objects.bulk_create(
+            [NodeCheckpoint(project=self.project, node=node, output=output, profile=profile, model=model)],
+            update_conflicts=True,
+            unique_fields=['project', 'node'],
+            update_fields=['output', 'codec', 'data', 'profile', 'model'],
+        )
+        self._outputs[node] = output
+
+    async def asave(self, node: str, output: dict, profile: str = None, model: str = None) -> None:
+        await sync_to_async(self.save)(node, output, profile, model)
+
+    @property
+    def completed_nodes(self) -> list:
+        return list(self._outputs)
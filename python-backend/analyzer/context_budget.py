@@ -0,0 +1,206 @@
+"""
+Token budgets for the review agents' input contexts.
+
+The strategist reads all six specialist reports and the critic reads the plan
+plus two of them, so their prompts grow with every specialist's output. Each
+node gets a token budget (`CONTEXT_TOKEN_BUDGETS`). When the sections of its
+context would exceed it, each over-long section is compacted by extractive
+key-point selection: headings are kept first, then the lines carrying the most
+information (figures, bullets, the opening lines of each subsection), in their
+original order. A section whose heading does not fit is dropped whole, so its
+lines never read as part of the section before it. Text is only ever cut on
+line or sentence boundaries.
+
+Token counts come from tiktoken when its encoding is available locally, or
+from a close regex approximation otherwise, and are cached per string.
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+# Roughly how GPT/Llama-style BPE tokenizers split text: words, numbers in
+# groups of up to three digits, runs of punctuation
+_APPROX_TOKEN_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]+")
+
+_HEADING_RE = re.compile(
+    r"^\s*(#{1,6}\s|\*\*[^*]+\*\*:?\s*$|\d+[.)]\s+[A-Z*][^.]{0,80}:?\s*$|[A-Z][A-Z0-9 &/()\-]{3,}:?\s*$|=== )"
+)
+_BULLET_RE = re.compile(r"^\s*([-*•]|\d+[.)])\s+")
+_FIGURE_RE = re.compile(r"[\d$€£%]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def get_encoding():
+    """Return the tiktoken encoding from settings, or False if it cannot be loaded offline."""
+    global _encoding
+    if _encoding is not None:
+        return _encoding
+
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+            except Exception as e:
+                print(f"⚠️ tiktoken encoding unavailable ({e.__class__.__name__}), approximating token counts")
+                _encoding = False
+    return _encoding
+
+
+def _approximate_tokens(text: str) -> int:
+    count = 0
+    for piece in _APPROX_TOKEN_RE.findall(text):
+        # Long words split into several sub-word tokens
+        count += 1 + (len(piece) - 1) // 6 if piece[0].isalpha() else 1
+    return count
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Number of tokens in `text`; results are cached per string."""
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _approximate_tokens(text)
+
+
+def get_context_budget(node: str) -> int:
+    """Token budget for a node's context sections, or 0 if the node is unbudgeted."""
+    return settings.CONTEXT_TOKEN_BUDGETS.get(node, 0)
+
+
+def _score_line(line: str, position: int) -> float:
+    """Information score of a body line: figures and bullets first, then earlier lines."""
+    score = 1.0 / (1 + position)
+    if _FIGURE_RE.search(line):
+        score += 2
+    if _BULLET_RE.match(line):
+        score += 1
+    return score
+
+
+def _fit_sentences(line: str, budget: int) -> str:
+    """The leading whole sentences of `line` that fit in `budget` tokens."""
+    kept = []
+    used = 0
+    for sentence in _SENTENCE_END_RE.split(line):
+        cost = count_tokens(sentence) + 1
+        if used + cost > budget:
+            break
+        kept.append(sentence)
+        used += cost
+    return " ".join(kept)
+
+
+def compact_text(text: str, budget: int) -> str:
+    """
+    Select the key lines of `text` so that it fits in `budget` tokens.
+
+    Returns `text` unchanged if it already fits.
+    """
+    if count_tokens(text) <= budget:
+        return text
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    headings = set()
+    candidates = []
+    # Heading of the section each body line belongs to (None before the first heading)
+    section_of = {}
+    section = None
+    position = 0
+    for index, line in enumerate(lines):
+        if _HEADING_RE.match(line):
+            headings.add(index)
+            section = index
+            position = 0
+        else:
+            candidates.append((_score_line(line, position), index))
+            section_of[index] = section
+            position += 1
+
+    kept = {}
+    remaining = budget
+    # Headings anchor the structure, but may take at most a quarter of the budget
+    heading_budget = budget // 4
+    for index in sorted(headings):
+        cost = count_tokens(lines[index]) + 1
+        if cost > heading_budget or cost > remaining:
+            break
+        kept[index] = lines[index]
+        heading_budget -= cost
+        remaining -= cost
+
+    if kept:
+        # The body of a dropped heading would otherwise run on under the last kept one
+        candidates = [
+            (score, index) for score, index in candidates
+            if section_of[index] is None or section_of[index] in kept
+        ]
+
+    for _, index in sorted(candidates, key=lambda candidate: (-candidate[0], candidate[1])):
+        line = lines[index]
+        cost = count_tokens(line) + 1
+        if cost > remaining:
+            line = _fit_sentences(line, remaining)
+            if not line:
+                continue
+            cost = count_tokens(line) + 1
+        kept[index] = line
+        remaining -= cost
+
+    # Drop headings left without any of their body lines
+    for index in sorted(headings):
+        if index not in kept:
+            continue
+        following = next((i for i in range(index + 1, len(lines)) if i in headings), len(lines))
+        has_body = any(i in kept for i in range(index + 1, following))
+        if following > index + 1 and not has_body:
+            del kept[index]
+
+    return "\n".join(kept[index] for index in sorted(kept))
+
+
+def fit_sections(sections: dict, budget: int, pinned: tuple = ()) -> dict:
+    """
+    Compact context sections so that together they fit in `budget` tokens.
+
+    Pinned sections are never compacted. The rest of the budget is shared
+    out so that short sections stay whole and the longest ones give up the
+    most. A budget of 0 disables compaction.
+    """
+    counts = {key: count_tokens(text or '') for key, text in sections.items()}
+    if not budget or sum(counts.values()) <= budget:
+        return dict(sections)
+
+    remaining = budget - sum(counts[key] for key in pinned if key in counts)
+    flexible = sorted((key for key in sections if key not in pinned), key=counts.get)
+    allowances = {}
+    for i, key in enumerate(flexible):
+        share = max(remaining, 0) // (len(flexible) - i)
+        allowances[key] = min(counts[key], share)
+        remaining -= allowances[key]
+
+    return {
+        key: text if key not in allowances or allowances[key] >= counts[key] else compact_text(text, allowances[key])
+        for key, text in sections.items()
+    }
+
+
+def budget_sections(node: str, sections: dict, pinned: tuple = ()) -> dict:
+    """Fit a node's context sections to its configured budget and log any compaction."""
+    budget = get_context_budget(node)
+    fitted = fit_sections(sections, budget, pinned=pinned)
+    before = sum(count_tokens(text or '') for text in sections.values())
+    after = sum(count_tokens(text or '') for text in fitted.values())
+    if after < before:
+        print(f"✂️ {node} context compacted: {before} -> {after} tokens (budget {budget})")
+    return fitted
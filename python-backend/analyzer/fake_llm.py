@@ -0,0 +1,138 @@
+"""
+Deterministic fake chat model for offline benchmarks.
+
+`FakeChatModel` stands in for `ChatGroq` so the pipeline's own overhead and
+concurrency behaviour can be measured without API calls. Its latency is
+drawn from a configurable distribution and its output is a report of a
+configurable size, both seeded from the prompt. The same prompt therefore
+always gets the same latency and text, whichever thread or event loop runs it.
+
+Faults can be injected to exercise retries and hedging: a share of calls
+fail with a transient (503) error, and a share turn into stragglers that
+take much longer. These are drawn from the model's own seeded sequence
+rather than from the prompt, so a retried or hedged prompt can fare
+differently.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from .context_budget import count_tokens
+
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal')
+
+WORDS = (
+    "market customers growth revenue pricing competitors segment channel retention "
+    "platform compliance regulation partners acquisition churn margin subscription "
+    "enterprise onboarding infrastructure scalability security funding runway hiring"
+).split()
+
+
+class FakeTransientError(Exception):
+    """Injected failure that looks like an HTTP 503 from the API."""
+
+    status_code = 503
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that sleeps for a sampled latency and returns a generated report."""
+
+    model_name: str = "fake-llm"
+    temperature: float = 0.7
+    max_tokens: int = 4096
+    # Base latency: `fixed`, `uniform` (latency_ms ± jitter) or `lognormal` (median latency_ms, sigma jitter)
+    distribution: str = 'lognormal'
+    latency_ms: float = 100.0
+    jitter: float = 0.25
+    # Extra decode time per generated token
+    per_token_ms: float = 0.0
+    output_tokens: int = 400
+    seed: int = 0
+    # Injected faults: share of calls failing with a 503, and of calls delayed by straggler_ms
+    error_rate: float = 0.0
+    straggler_rate: float = 0.0
+    straggler_ms: float = 0.0
+
+    _faults: random.Random = PrivateAttr(default=None)
+    _faults_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _rng(self, messages) -> random.Random:
+        digest = hashlib.sha256(str(self.seed).encode())
+        for message in messages:
+            digest.update(str(message.content).encode('utf-8'))
+        return random.Random(digest.digest())
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Seconds one completion takes, before per-token decode time."""
+        if self.distribution == 'fixed':
+            latency = self.latency_ms
+        elif self.distribution == 'uniform':
+            latency = self.latency_ms * (1 + self.jitter * rng.uniform(-1, 1))
+        elif self.distribution == 'lognormal':
+            latency = self.latency_ms * rng.lognormvariate(0, self.jitter)
+        else:
+            raise ValueError(f"Unknown latency distribution '{self.distribution}'. Use one of {LATENCY_DISTRIBUTIONS}.")
+        return max(latency, 0) / 1000
+
+    def _draw_fault(self) -> tuple:
+        """(fail, extra seconds) for the next call, from the model's own seeded sequence."""
+        with self._faults_lock:
+            if self._faults is None:
+                self._faults = random.Random(self.seed)
+            fail = self._faults.random() < self.error_rate
+            straggle = self._faults.random() < self.straggler_rate
+        return fail, self.straggler_ms / 1000 if straggle else 0.0
+
+    def _completion(self, messages):
+        """(latency in seconds, AIMessage) for these messages."""
+        rng = self._rng(messages)
+        tokens = min(self.output_tokens, self.max_tokens)
+
+        lines = []
+        for section in range(1, tokens // 80 + 2):
+            lines.append(f"{section}. {rng.choice(WORDS).upper()} {rng.choice(WORDS).upper()}")
+            words = [rng.choice(WORDS) for _ in range(min(79, tokens - 80 * (section - 1)))]
+            if words:
+                lines.append("- " + " ".join(words) + f" ({rng.randint(1, 99)}%).")
+        content = "\n".join(lines)
+
+        prompt_tokens = sum(count_tokens(str(message.content)) for message in messages)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": tokens,
+                "total_tokens": prompt_tokens + tokens,
+            },
+        )
+        latency = self.sample_latency(rng) + tokens * self.per_token_ms / 1000
+        return latency, message
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        latency, message = self._completion(messages)
+        fail, extra = self._draw_fault()
+        time.sleep(latency + extra)
+        if fail:
+            raise FakeTransientError("Injected 503 Service Unavailable")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        latency, message = self._completion(messages)
+        fail, extra = self._draw_fault()
+        await asyncio.sleep(latency + extra)
+        if fail:
+            raise FakeTransientError("Injected 503 Service Unavailable")
+        return ChatResult(generations=[ChatGeneration(message=message)])
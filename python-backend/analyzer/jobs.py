@@ -0,0 +1,313 @@
+"""
+Background execution of analysis jobs.
+
+`POST /analyze` only records a `Project` and hands it to this module, so
+request threads never hold an LLM call. Each node's output is written to the
+project as soon as the node finishes, so clients polling the project see
+partial results while `status` moves pending -> analyzing -> completed / failed.
+
+`ANALYSIS_JOB_BACKEND` picks where jobs run:
+
+- `thread`: a bounded pool of worker threads inside each web process. Jobs
+  are lost if the process dies.
+- `database`: jobs are `AnalysisJob` rows, run by `manage.py run_analysis_workers`
+  on any number of hosts. Workers lease jobs and renew the lease while a job
+  runs. A crashed worker's jobs are claimed again once their lease expires
+  and resume from their node checkpoints. A worker that only stalled past its
+  lease finds out at its next write and discards its results, so it never
+  overwrites those of the worker that took over. Throughput grows with every
+  worker added, up to the LLM rate limits.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Count
+
+from .checkpoints import ProjectCheckpointStore
+from .models import AnalysisJob, Project
+
+
+class JobQueueFull(Exception):
+    """Raised when the job pool already holds as many jobs as it may queue."""
+
+
+class LeaseLost(Exception):
+    """Raised when a worker's claim on a job was taken over by another worker."""
+
+
+class AnalysisJobRunner:
+    """Bounded thread pool that runs analysis jobs for this process."""
+
+    def __init__(self, max_workers: int = 4, max_queued: int = 100):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        # Admission limit for running + queued jobs (ThreadPoolExecutor's own queue is unbounded)
+        self._capacity = threading.BoundedSemaphore(max_workers + max_queued)
+        self._lock = threading.Lock()
+        self._active = set()
+
+    def submit(self, project_id, refresh: bool = False) -> bool:
+        """
+        Queue an analysis for the project (with `refresh`, bypassing cached completions).
+
+        Returns False if the project is already queued or running in this
+        process. Raises JobQueueFull if the pool is at capacity.
+        """
+        with self._lock:
+            if project_id in self._active:
+                return False
+            if not self._capacity.acquire(blocking=False):
+                raise JobQueueFull("Too many analyses are queued. Please retry shortly.")
+            self._active.add(project_id)
+
+        future = self._executor.submit(run_analysis_job, project_id, refresh)
+        future.add_done_callback(lambda _: self._release(project_id))
+        return True
+
+    def is_active(self, project_id) -> bool:
+        """Whether the project is queued or running in this process."""
+        with self._lock:
+            return project_id in self._active
+
+    def _release(self, project_id) -> None:
+        with self._lock:
+            self._active.discard(project_id)
+        self._capacity.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "jobs": len(self._active),
+            }
+
+
+class DatabaseJobQueue:
+    """Durable job queue in the `AnalysisJob` table; the same interface as AnalysisJobRunner."""
+
+    def __init__(self, max_queued: int = 100):
+        self.max_queued = max_queued
+
+    def submit(self, project_id, refresh: bool = False) -> bool:
+        """
+        Queue an analysis for the project (with `refresh`, bypassing cached completions).
+
+        Returns False if the project already has a queued or running job.
+        Raises JobQueueFull if `max_queued` jobs are already waiting.
+        """
+        if AnalysisJob.objects.filter(state='queued').count() >= self.max_queued:
+            raise JobQueueFull("Too many analyses are queued. Please retry shortly.")
+        try:
+            with transaction.atomic():
+                AnalysisJob.objects.create(project_id=project_id, refresh_cache=refresh)
+        except IntegrityError:
+            # one_active_job_per_project: it is already queued or running
+            return False
+        return True
+
+    def is_active(self, project_id) -> bool:
+        """Whether the project has a job queued or running on any worker."""
+        return AnalysisJob.objects.active().filter(project_id=project_id).exists()
+
+    def stats(self) -> dict:
+        counts = dict(AnalysisJob.objects.active().values_list('state').annotate(jobs=Count('id')))
+        return {
+            "max_queued": self.max_queued,
+            "queued": counts.get('queued', 0),
+            "running": counts.get('running', 0),
+        }
+
+
+class AnalysisWorker:
+    """
+    Claims jobs from the database queue and runs up to `concurrency` at once.
+
+    The main loop claims as many jobs as there are free slots, renews the
+    leases of running jobs every third of `lease_seconds`, and sleeps
+    `poll_seconds` when the queue is empty. A job claimed more than
+    `max_attempts` times (its workers kept dying) is failed instead of run
+    again. `stop()` stops claiming; jobs already running are finished first.
+    """
+
+    def __init__(self, concurrency: int = 4, lease_seconds: float = 60, poll_seconds: float = 1,
+                 max_attempts: int = 3, name: str = None):
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='analysis-worker')
+        self._lock = threading.Lock()
+        self._running = {}
+        self._stopping = threading.Event()
+
+    def run(self) -> None:
+        print(f"👷 Worker {self.name} started ({self.concurrency} slots)")
+        next_renewal = 0.0
+        while not self._stopping.is_set() or self._running:
+            try:
+                if time.monotonic() >= next_renewal:
+                    self.renew_leases()
+                    next_renewal = time.monotonic() + self.lease_seconds / 3
+                claimed = [] if self._stopping.is_set() else self.claim()
+            except DatabaseError as e:
+                # e.g. the database restarted: reconnect on the next round
+                print(f"⚠️ Worker {self.name} database error: {e}")
+                connection.close()
+                claimed = []
+            if claimed:
+                continue
+            if self._stopping.is_set():
+                # Draining: keep renewing the leases of the jobs still running
+                time.sleep(0.2)
+            else:
+                self._stopping.wait(self.poll_seconds)
+        self._executor.shutdown()
+        print(f"👷 Worker {self.name} stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def claim(self) -> list:
+        with self._lock:
+            free = self.concurrency - len(self._running)
+        if free <= 0:
+            return []
+        jobs = AnalysisJob.objects.claim(self.name, free, self.lease_seconds)
+        for job in jobs:
+            if job.attempts > self.max_attempts:
+                error = f"Gave up after {job.attempts - 1} attempts; the workers running it stopped responding"
+                print(f"❌ Analysis job {job.pk} for {job.project_id}: {error}")
+                if AnalysisJob.objects.finish(job, 'failed', error):
+                    Project.objects.get(pk=job.project_id).mark_failed(error)
+                continue
+            with self._lock:
+                self._running[job.pk] = job
+            self._executor.submit(self.run_job, job)
+        return jobs
+
+    def renew_leases(self) -> None:
+        with self._lock:
+            running = list(self._running)
+        if not running:
+            return
+        held = AnalysisJob.objects.renew(self.name, running, self.lease_seconds)
+        for job_id in set(running) - held:
+            print(f"⚠️ Worker {self.name} lost the lease on job {job_id}; its result will not be recorded")
+
+    def run_job(self, job) -> None:
+        try:
+            run_analysis_job(job.project_id, refresh=job.refresh_cache, job=job)
+        except Exception as e:
+            print(f"❌ Analysis job {job.pk} crashed: {str(e)}")
+        finally:
+            with self._lock:
+                self._running.pop(job.pk, None)
+            close_old_connections()
+
+
+@contextmanager
+def holding(job):
+    """
+    Transaction for writing a claimed job's results; raises LeaseLost unless the claim still holds.
+
+    The job row is locked first, so the job cannot be claimed by another
+    worker between the check and the writes. A no-op check for `job` None
+    (jobs of the thread backend).
+    """
+    with transaction.atomic():
+        if job is not None and not list(AnalysisJob.objects.held(job).select_for_update().only('pk')):
+            raise LeaseLost(f"job {job.pk} was claimed by another worker")
+        yield
+
+
+def run_analysis_job(project_id, refresh: bool = False, job=None) -> bool:
+    """
+    Run the workflow for one project, persisting each node's output as it completes.
+
+    With `refresh` (a rerun) cached completions are not reused. For a `job`
+    claimed from the database queue, every write is conditional on still
+    holding the claim, and the job is finished with the result; once the
+    claim is lost the run stops and its results are discarded.
+
+    Returns whether the analysis completed; a failure is recorded on the project.
+    """
+    # Imported on first use: web processes that only enqueue jobs never load LangChain
+    from .langgraph_workflow import stream_analysis
+
+    close_old_connections()
+    try:
+        project = Project.objects.get(pk=project_id)
+    except Project.DoesNotExist:
+        print(f"❌ Analysis job {project_id} skipped: project no longer exists")
+        close_old_connections()
+        return False
+
+    try:
+        with holding(job):
+            project.mark_analyzing()
+        checkpoints = ProjectCheckpointStore(project)
+        print(f"📊 Starting analysis job {project_id}: {project.startup_idea[:100]}...")
+
+        result = {}
+        for node_name, results in stream_analysis(
+            project.startup_idea, project.target_market, checkpoints=checkpoints, refresh=refresh,
+        ):
+            if results:
+                result.update(results)
+                with holding(job):
+                    project.save_partial(results)
+
+        with holding(job):
+            project.save_analysis(result)
+            if job is not None:
+                AnalysisJob.objects.finish(job, 'done')
+        print(f"✅ Analysis job {project_id} complete!")
+        return True
+    except LeaseLost as e:
+        print(f"⚠️ Analysis job {project_id} stopped, {e}; its results are discarded")
+        return False
+    except Exception as e:
+        print(f"❌ Analysis job {project_id} failed: {str(e)}")
+        try:
+            with holding(job):
+                project.mark_failed(str(e))
+                if job is not None:
+                    AnalysisJob.objects.finish(job, 'failed', str(e))
+        except LeaseLost:
+            print(f"⚠️ Analysis job {project_id} was claimed by another worker; its failure is discarded")
+        return False
+    finally:
+        close_old_connections()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner():
+    """Return the process-wide job runner (or database queue), creating it from settings on first use."""
+    global _runner
+    if _runner is not None:
+        return _runner
+
+    with _runner_lock:
+        if _runner is None:
+            if settings.ANALYSIS_JOB_BACKEND == 'database':
+                _runner = DatabaseJobQueue(max_queued=settings.ANALYSIS_JOB_QUEUE_SIZE)
+            else:
+                _runner = AnalysisJobRunner(
+                    max_workers=settings.ANALYSIS_JOB_WORKERS,
+                    max_queued=settings.ANALYSIS_JOB_QUEUE_SIZE,
+                )
+    return _runner
@@ -2,737 +2,197 @@
 LangGraph Multi-Agent Workflow for Startup Analysis.
 
 This module contains:
-- Agent system prompts
 - LangGraph state definition
 - Agent node functions
 - Compiled workflow graph
 """
 
-from typing import TypedDict, Optional
-from langgraph.graph import StateGraph, END
+from typing import Annotated, TypedDict, Optional
+from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_groq import ChatGroq
 from django.conf import settings
-import os
+import inspect
+import threading
+import time
+import uuid
+
+from . import metrics
+from .context_budget import budget_sections
+from .llm_cache import get_response_cache, is_refreshing, make_cache_key, refresh_scope
+from .llm_pool import get_llm_pool
+from .llm_resilience import HedgeCancelled, get_resilient_caller
+from .llm_routing import ModelProfile, get_profile, routing_table
+from .llm_scheduler import get_llm_scheduler, tenant_scope
+from .prompts import (
+    MARKET_ANALYST_PROMPT,
+    COST_PREDICTOR_PROMPT,
+    BUSINESS_STRATEGIST_PROMPT,
+    MONETIZATION_PROMPT,
+    LEGAL_ADVISOR_PROMPT,
+    TECH_ARCHITECT_PROMPT,
+    STRATEGIST_PROMPT,
+    CRITIC_PROMPT,
+    REFINEMENT_PROMPT,
+)
+from .sections import select_sections
 
 
 # =============================================================================
 # LLM Configuration (Using Groq Cloud API)
 # =============================================================================
 
-def get_llm():
-    """Get the configured Groq LLM instance."""
-    api_key = settings.GROQ_API_KEY or os.getenv('GROQ_API_KEY')
-    
-    if not api_key:
-        raise ValueError("GROQ_API_KEY is not configured. Set it in your environment variables.")
-    
-    return ChatGroq(
-        model_name="llama-3.3-70b-versatile",
-        temperature=0.7,
-        api_key=api_key,
-        max_tokens=4096
+def current_profile() -> ModelProfile:
+    """The model profile the running node is routed to (see analyzer.llm_routing)."""
+    call = metrics.current_call()
+    return get_profile(call.node if call is not None else None)
+
+
+def get_llm(profile: ModelProfile = None) -> ChatGroq:
+    """Get the shared Groq LLM client for a model profile (default: LLM_DEFAULT_PROFILE) from the client pool."""
+    profile = profile or get_profile()
+    return get_llm_pool().get(profile.model, profile.temperature, profile.max_tokens, profile.timeout)
+
+
+def get_async_llm(profile: ModelProfile = None) -> ChatGroq:
+    """Get the pooled Groq LLM client bound to the running event loop, for `ainvoke`."""
+    profile = profile or get_profile()
+    return get_llm_pool().get_async(profile.model, profile.temperature, profile.max_tokens, profile.timeout)
+
+
+def response_cache_key(llm: ChatGroq, system_prompt: str, user_content: str) -> str:
+    """Cache key for one completion: prompt, normalized user content and model parameters."""
+    return make_cache_key(
+        system_prompt,
+        user_content,
+        model=llm.model_name,
+        temperature=llm.temperature,
+        max_tokens=llm.max_tokens,
     )
 
 
-# =============================================================================
-# Agent System Prompts (Enhanced for comprehensive output)
-# =============================================================================
+def resilience_key(llm: ChatGroq) -> str:
+    """Circuit breaker / hedging key for a client: its model, plus the endpoint when not Groq's own."""
+    base_url = getattr(llm, 'groq_api_base', None)
+    return f"{llm.model_name}@{base_url}" if base_url else llm.model_name
+
+
+def invoke_llm(system_prompt: str, user_content: str) -> str:
+    """
+    Run one completion through the pooled client, bounded by the pool's in-flight limit.
+    
+    The call is first admitted by the rate-limit scheduler, so it waits for
+    RPM/TPM budget instead of being rejected with a 429. Transient failures
+    are retried with backoff, and slow calls may be hedged (see
+    analyzer.llm_resilience).
+    
+    Responses are cached by prompt, normalized user content and model
+    parameters, so a repeated request skips the LLM call entirely, unless
+    the run is a rerun (see `refresh_scope`).
+    
+    The model and its parameters come from the profile the calling node is
+    routed to.
+    """
+    profile = current_profile()
+    llm = get_llm(profile)
+    labels = metrics.llm_labels(profile.name, llm.model_name)
+    
+    cache = get_response_cache()
+    if cache is not None:
+        cache_key = response_cache_key(llm, system_prompt, user_content)
+        cached = None if is_refreshing() else cache.get(cache_key)
+        if cached is not None:
+            metrics.LLM_REQUESTS.inc(*labels, 'cached')
+            return cached
+    
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_content)
+    ]
+    scheduler = get_llm_scheduler()
+    cost = scheduler.estimate_cost(system_prompt, user_content, llm.max_tokens)
+    caller = get_resilient_caller()
+    key = resilience_key(llm)
+    
+    def attempt(race, hedge):
+        # A hedge runs on its primary's rate-limit ticket; a retry is admitted afresh
+        admission = scheduler.join(race.ticket) if hedge else scheduler.admit(llm.model_name, cost)
+        with admission as ticket, get_llm_pool().slot() as waited:
+            if race.cancelled.is_set():
+                # A hedged twin already answered; don't spend the call (admit returns the reservation)
+                raise HedgeCancelled()
+            if not hedge:
+                race.ticket = ticket
+                race.sent.set()
+            with metrics.track_llm_request(labels, waited) as record:
+                started = time.perf_counter()
+                response = llm.invoke(messages)
+                record(response)
+            scheduler.settle(ticket, sum(metrics.token_usage(response)))
+        caller.record_latency(key, time.perf_counter() - started)
+        return response
+    
+    response = caller.call(key, attempt)
+    
+    if cache is not None:
+        cache.set(cache_key, response.content)
+    return response.content
 
-MARKET_ANALYST_PROMPT = """You are a world-class Market Analyst with 20+ years of expertise in global markets, consumer behavior, and competitive intelligence.
-
-Your task is to deliver an EXHAUSTIVE market analysis for the provided startup idea. Be extremely thorough and detailed.
-
-REQUIRED SECTIONS (provide extensive detail for each):
-
-1. TARGET AUDIENCE DEEP DIVE
-   - Primary demographics: age, gender, income levels, education, occupation, geographic distribution
-   - Psychographics: values, interests, lifestyle, buying motivations, pain points
-   - Behavioral patterns: purchasing habits, decision-making process, brand loyalty factors
-   - Customer personas: Create 3-4 detailed buyer personas with names, backgrounds, and specific needs
-
-2. MARKET SIZE ANALYSIS
-   - Total Addressable Market (TAM): Global market value with growth projections for next 5 years
-   - Serviceable Addressable Market (SAM): Realistic market you can reach with current business model
-   - Serviceable Obtainable Market (SOM): Achievable market share in first 3 years
-   - Include specific dollar amounts, percentages, and data sources where applicable
-
-3. COMPETITIVE LANDSCAPE
-   - Direct competitors: List 5-10 competitors with their strengths, weaknesses, pricing, market share
-   - Indirect competitors: Alternative solutions customers might use
-   - Competitive positioning matrix: Where does this idea fit?
-   - Barriers to entry and competitive moats
-
-4. MARKET TRENDS & DYNAMICS
-   - Current industry trends shaping the market
-   - Emerging technologies impacting the space
-   - Consumer behavior shifts post-2020
-   - Regulatory changes affecting the industry
-   - Economic factors and market cycles
-
-5. OPPORTUNITIES & THREATS
-   - Untapped market segments
-   - Geographic expansion opportunities
-   - Strategic partnership possibilities
-   - Potential market disruptions
-   - Risks and mitigation strategies
-
-6. DATA-DRIVEN INSIGHTS
-   - Key statistics and metrics
-   - Industry benchmarks
-   - Growth rate comparisons
-   - Market penetration estimates
-
-Format your response with clear headers and use numbered lists, bullet points, and specific data points. Aim for comprehensive coverage that would satisfy a VC due diligence review."""
-
-COST_PREDICTOR_PROMPT = """You are an expert Financial Analyst and Cost Prediction Specialist with extensive experience in startup funding and financial planning.
-
-Provide an EXTREMELY DETAILED and comprehensive cost breakdown for this startup idea. Include specific dollar amounts with ranges for all estimates.
-
-REQUIRED SECTIONS:
-
-1. INITIAL SETUP COSTS (One-Time Investments)
-   
-   A. Legal & Incorporation ($X - $X range)
-      - Business registration and licenses
-      - Legal entity formation (LLC, C-Corp, etc.)
-      - Initial legal counsel and contracts
-      - Trademark and IP registration
-      - Compliance certifications
-   
-   B. Technology Infrastructure ($X - $X range)
-      - Development environment setup
-      - Cloud infrastructure initial setup
-      - Software licenses and tools
-      - Security implementations
-      - Domain and SSL certificates
-   
-   C. Office & Equipment ($X - $X range)
-      - Workspace setup (remote vs office)
-      - Computer hardware
-      - Office furniture and supplies
-      - Communication systems
-   
-   D. Branding & Marketing Launch ($X - $X range)
-      - Logo and brand identity design
-      - Website development
-      - Initial marketing collateral
-      - Launch campaign budget
-
-2. MONTHLY OPERATING COSTS (Recurring)
-   
-   A. Technology & Infrastructure ($X - $X/month)
-      - Cloud hosting (AWS/GCP/Azure breakdown)
-      - SaaS subscriptions (list specific tools)
-      - API costs and third-party services
-      - Development tools and licenses
-      - Monitoring and security services
-   
-   B. Team & Personnel ($X - $X/month)
-      - Full-time employees (by role with salary ranges)
-      - Contractors and freelancers
-      - Benefits and payroll taxes
-      - Training and development
-      - Recruitment costs
-   
-   C. Marketing & Customer Acquisition ($X - $X/month)
-      - Digital advertising (by channel)
-      - Content marketing
-      - SEO and organic growth
-      - PR and influencer marketing
-      - Customer acquisition cost (CAC) estimate
-   
-   D. Operations & Overhead ($X - $X/month)
-      - Office rent and utilities
-      - Insurance
-      - Accounting and bookkeeping
-      - Legal retainer
-      - Miscellaneous operations
-
-3. FINANCIAL PROJECTIONS (Years 1-3)
-   
-   - Monthly burn rate scenarios (conservative, moderate, aggressive)
-   - Revenue projections by quarter
-   - Break-even analysis
-   - Cash flow projections
-   - Unit economics (LTV, CAC, LTV:CAC ratio)
-
-4. FUNDING REQUIREMENTS
-   
-   - Recommended seed funding amount
-   - Pre-seed vs Seed stage needs
-   - Use of funds breakdown (pie chart data)
-   - Runway calculations (months of operation)
-   - Key milestones for each funding stage
-
-5. COST OPTIMIZATION STRATEGIES
-   
-   - Areas for potential cost reduction
-   - Build vs buy recommendations
-   - Outsourcing opportunities
-   - Phased spending approach
-
-Provide THREE scenarios: Bootstrap (minimal), Standard, and Well-Funded. Include specific numbers in USD for all estimates."""
-
-BUSINESS_STRATEGIST_PROMPT = """You are a legendary Business Strategist who has launched and scaled multiple billion-dollar companies. You've advised Fortune 500 CEOs and successful startup founders.
-
-Create an EXCEPTIONALLY COMPREHENSIVE strategic plan for this startup idea. This should be detailed enough to serve as the foundation for a business plan.
-
-REQUIRED SECTIONS:
-
-1. EXECUTIVE SUMMARY
-   - One-paragraph compelling overview
-   - Key value proposition
-   - Primary market opportunity
-   - Unique differentiators
-
-2. VISION, MISSION & VALUES
-   - Vision Statement: Bold, inspiring 10-year vision
-   - Mission Statement: Clear, actionable purpose
-   - Core Values: 5-7 guiding principles
-   - Company culture DNA
-
-3. VALUE PROPOSITION CANVAS
-   - Customer Jobs: What customers are trying to accomplish
-   - Customer Pains: Frustrations, risks, obstacles
-   - Customer Gains: Desired outcomes and benefits
-   - Pain Relievers: How your solution alleviates pains
-   - Gain Creators: How your solution creates gains
-   - Products & Services: Full offering description
-
-4. BUSINESS MODEL DEEP DIVE
-   - Revenue streams (primary and secondary)
-   - Cost structure
-   - Key resources required
-   - Key activities
-   - Key partnerships
-   - Customer segments
-   - Channels to market
-   - Customer relationships approach
-
-5. GO-TO-MARKET STRATEGY
-   
-   Phase 1: MVP Launch (Months 1-6)
-   - Minimum viable product definition
-   - Early adopter targeting
-   - Beta testing approach
-   - Initial pricing strategy
-   - Launch channels
-   
-   Phase 2: Growth (Months 6-18)
-   - Market expansion plan
-   - Marketing intensification
-   - Sales team building
-   - Partnership development
-   
-   Phase 3: Scale (Months 18-36)
-   - Geographic expansion
-   - Product line extension
-   - Enterprise sales motion
-   - International considerations
-
-6. COMPETITIVE MOATS & ADVANTAGES
-   - Network effects potential
-   - Economies of scale
-   - Switching costs
-   - Brand and reputation
-   - Proprietary technology
-   - Data advantages
-   - Regulatory barriers
-
-7. KEY SUCCESS METRICS & KPIs
-   - North Star metric
-   - Leading indicators
-   - Lagging indicators
-   - Weekly/monthly dashboards
-   - Quarterly OKRs framework
-
-8. RISK ANALYSIS & CONTINGENCY
-   - Top 10 risks with probability and impact
-   - Mitigation strategies for each
-   - Pivot scenarios if needed
-
-9. 90-DAY ACTION PLAN
-   - Week-by-week priorities
-   - Key milestones
-   - Resource allocation
-   - Decision points
-
-Be specific, actionable, and bold. Include frameworks, metrics, and concrete action items throughout."""
-
-MONETIZATION_PROMPT = """You are a Monetization Strategy Expert who has designed pricing models for companies from startups to Fortune 500. You understand psychology, value-based pricing, and sustainable revenue models.
-
-Develop FOUR comprehensive monetization strategies for this startup idea. Each should be detailed enough to implement immediately.
-
-FOR EACH MONETIZATION MODEL, PROVIDE:
-
-MODEL 1: [Primary Recommendation]
-   
-   A. Model Overview
-      - Model name and type
-      - Core mechanics explanation
-      - Why this fits the product
-      - Target customer segment
-   
-   B. Pricing Architecture
-      - Tier 1: Free/Freemium (features, limits, purpose)
-      - Tier 2: Basic/Starter (price, features, target user)
-      - Tier 3: Professional/Growth (price, features, target user)
-      - Tier 4: Enterprise (custom pricing, features, target user)
-      - Add-ons and upsells
-   
-   C. Revenue Projections
-      - Year 1: Monthly and annual projections
-      - Year 2: Growth assumptions and projections
-      - Year 3: Scale assumptions and projections
-      - Conversion rate assumptions
-      - Churn rate assumptions
-      - Average Revenue Per User (ARPU)
-   
-   D. Implementation Details
-      - Technical requirements
-      - Billing system needs
-      - Contract terms
-      - Payment methods
-   
-   E. Pros & Cons Analysis
-      - Advantages (5+)
-      - Disadvantages and risks (5+)
-      - Mitigation strategies
-
-MODEL 2: [Alternative Approach]
-   [Same detailed structure as above]
-
-MODEL 3: [Experimental/Innovative Model]
-   [Same detailed structure as above]
-
-MODEL 4: [Hybrid Model]
-   [Combine elements of above models]
-   [Same detailed structure]
-
-ADDITIONAL SECTIONS:
-
-PRICING PSYCHOLOGY RECOMMENDATIONS
-- Anchoring strategies
-- Decoy pricing opportunities
-- Value framing techniques
-- Social proof integration
-
-MONETIZATION ROADMAP
-- Phase 1: Launch pricing
-- Phase 2: Price optimization
-- Phase 3: Enterprise pricing
-- Phase 4: International pricing
-
-METRICS TO TRACK
-- Monthly Recurring Revenue (MRR)
-- Annual Recurring Revenue (ARR)
-- Customer Lifetime Value (LTV)
-- Customer Acquisition Cost (CAC)
-- Net Revenue Retention
-- Expansion Revenue
-
-Include specific dollar amounts, percentages, and realistic projections based on industry benchmarks."""
-
-LEGAL_ADVISOR_PROMPT = """You are a Senior Legal Counsel specializing in startup law, corporate governance, intellectual property, and regulatory compliance. You've advised hundreds of startups from formation to IPO.
-
-Provide an EXHAUSTIVE legal analysis and compliance roadmap for this startup idea.
-
-REQUIRED SECTIONS:
-
-1. BUSINESS STRUCTURE ANALYSIS
-   
-   Option A: LLC (Limited Liability Company)
-   - Advantages for this specific startup
-   - Disadvantages and limitations
-   - Tax implications
-   - Best suited if...
-   
-   Option B: C-Corporation
-   - Advantages (especially for fundraising)
-   - Disadvantages
-   - Delaware vs home state incorporation
-   - Best suited if...
-   
-   Option C: S-Corporation
-   - Advantages
-   - Disadvantages
-   - Eligibility requirements
-   - Best suited if...
-   
-   RECOMMENDATION: [Specific recommendation with reasoning]
-
-2. INTELLECTUAL PROPERTY STRATEGY
-   
-   A. Trademarks
-      - Brand name availability considerations
-      - Logo protection
-      - Taglines and slogans
-      - Registration process and timeline
-      - International trademark considerations
-   
-   B. Patents
-      - Patentable aspects of the idea
-      - Provisional vs utility patents
-      - Patent search recommendations
-      - Cost estimates and timeline
-   
-   C. Copyrights
-      - Content and code protection
-      - Registration benefits
-      - Work-for-hire considerations
-   
-   D. Trade Secrets
-      - Proprietary information identification
-      - Protection mechanisms
-      - Employee/contractor obligations
-
-3. REGULATORY COMPLIANCE
-   
-   A. Industry-Specific Regulations
-      - Federal regulations applicable
-      - State-specific requirements
-      - Industry certifications needed
-      - Compliance timeline
-   
-   B. Data Privacy & Protection
-      - GDPR compliance requirements
-      - CCPA/CPRA requirements
-      - HIPAA (if applicable)
-      - Children's privacy (COPPA)
-      - Data processing agreements
-   
-   C. Consumer Protection
-      - FTC guidelines
-      - Advertising regulations
-      - Refund and cancellation policies
-      - Disclosure requirements
-   
-   D. Employment Law
-      - Employee vs contractor classification
-      - Employment agreements essentials
-      - Non-compete and non-disclosure
-      - Equity compensation considerations
-
-4. ESSENTIAL LEGAL DOCUMENTS
-   
-   For Customers:
-   - Terms of Service (key provisions)
-   - Privacy Policy (required elements)
-   - Cookie Policy
-   - Acceptable Use Policy
-   - Refund/Cancellation Policy
-   
-   For Team:
-   - Founder agreements
-   - Employment/contractor agreements
-   - Confidentiality agreements
-   - IP assignment agreements
-   - Equity vesting agreements
-   
-   For Investors:
-   - SAFE or convertible notes
-   - Term sheet essentials
-   - Cap table management
-   - Due diligence preparation
-
-5. RISK MITIGATION STRATEGY
-   
-   - Liability exposure analysis
-   - Insurance requirements (D&O, E&O, General Liability)
-   - Dispute resolution mechanisms
-   - Limitation of liability clauses
-   - Indemnification provisions
-
-6. COMPLIANCE ROADMAP & TIMELINE
-   
-   Immediate (Before Launch):
-   - [Specific requirements]
-   
-   Within 90 Days:
-   - [Specific requirements]
-   
-   Within 1 Year:
-   - [Specific requirements]
-   
-   Ongoing:
-   - [Maintenance requirements]
-
-7. LEGAL BUDGET ESTIMATE
-   - Formation costs
-   - IP registration costs
-   - Contract drafting costs
-   - Ongoing legal retainer
-   - Contingency for disputes
-
-Be thorough and specific. Include actionable recommendations and estimated costs where applicable."""
-
-TECH_ARCHITECT_PROMPT = """You are a Principal Technology Architect with 25+ years of experience building scalable systems for startups and enterprises. You've architected systems handling millions of users and billions of transactions.
-
-Design an EXTREMELY COMPREHENSIVE technology architecture for this startup idea.
-
-REQUIRED SECTIONS:
-
-1. ARCHITECTURE OVERVIEW
-   - High-level system architecture description
-   - Architectural patterns chosen (microservices, monolith, serverless, etc.)
-   - Scalability considerations
-   - Key architectural decisions and rationale
-
-2. FRONTEND ARCHITECTURE
-   
-   A. Framework Selection
-      - Recommended framework: [e.g., React, Next.js, Vue.js]
-      - Justification and alternatives considered
-      - Version and key dependencies
-   
-   B. UI Component Strategy
-      - Component library choice
-      - Design system approach
-      - Styling solution (Tailwind, CSS-in-JS, etc.)
-   
-   C. State Management
-      - Solution choice and justification
-      - Data flow patterns
-      - Caching strategy
-   
-   D. Performance Optimization
-      - Code splitting approach
-      - Lazy loading strategy
-      - Image optimization
-      - Core Web Vitals targets
-
-3. BACKEND ARCHITECTURE
-   
-   A. Language & Framework
-      - Primary language: [e.g., Node.js, Python, Go]
-      - Framework: [e.g., Express, FastAPI, Gin]
-      - Justification and alternatives
-   
-   B. API Design
-      - API style (REST, GraphQL, gRPC)
-      - Versioning strategy
-      - Rate limiting approach
-      - Documentation (OpenAPI/Swagger)
-   
-   C. Authentication & Authorization
-      - Auth solution (Auth0, Firebase, custom)
-      - Token strategy (JWT, sessions)
-      - RBAC implementation
-      - OAuth2/OIDC integration
-
-4. DATABASE ARCHITECTURE
-   
-   A. Primary Database
-      - Technology choice (PostgreSQL, MongoDB, etc.)
-      - Data modeling approach
-      - Schema design principles
-      - Indexing strategy
-   
-   B. Caching Layer
-      - Caching solution (Redis, Memcached)
-      - Cache invalidation strategy
-      - Cache-aside vs write-through
-   
-   C. Search (if applicable)
-      - Search engine choice
-      - Indexing approach
-   
-   D. Data Scaling
-      - Sharding strategy
-      - Read replicas
-      - Connection pooling
-
-5. CLOUD INFRASTRUCTURE
-   
-   A. Cloud Provider Recommendation
-      - Primary provider and justification
-      - Multi-cloud considerations
-      - Cost optimization strategies
-   
-   B. Core Services
-      - Compute (containers, serverless, VMs)
-      - Storage solutions
-      - CDN configuration
-      - DNS and domain management
-   
-   C. Infrastructure as Code
-      - IaC tool choice (Terraform, Pulumi, CloudFormation)
-      - Environment management
-      - Secrets management
-
-6. DEVOPS & CI/CD
-   
-   A. Development Workflow
-      - Git branching strategy
-      - Code review process
-      - Testing requirements
-   
-   B. CI/CD Pipeline
-      - Pipeline stages
-      - Testing automation
-      - Deployment strategies (blue-green, canary)
-   
-   C. Monitoring & Observability
-      - Logging solution
-      - Metrics collection
-      - Alerting strategy
-      - APM tools
-
-7. SECURITY ARCHITECTURE
-   
-   - Security principles applied
-   - OWASP considerations
-   - Encryption (at rest, in transit)
-   - Security scanning and auditing
-   - Incident response preparation
-
-8. THIRD-PARTY INTEGRATIONS
-   
-   - Payment processing recommendation
-   - Email service provider
-   - SMS/Notification services
-   - Analytics and tracking
-   - Error monitoring
-   - Feature flags
-
-9. MVP DEVELOPMENT PLAN
-   
-   Phase 1: Foundation (Weeks 1-4)
-   - [Specific deliverables]
-   
-   Phase 2: Core Features (Weeks 5-8)
-   - [Specific deliverables]
-   
-   Phase 3: Launch Ready (Weeks 9-12)
-   - [Specific deliverables]
-
-10. TEAM COMPOSITION
-    
-    MVP Team:
-    - Roles needed with responsibilities
-    - Skill requirements
-    - Hiring vs outsourcing recommendations
-    
-    Scale Team:
-    - Additional roles for growth phase
-    - Organizational structure
-
-11. TECHNOLOGY BUDGET ESTIMATE
-    
-    - Monthly infrastructure costs (by tier)
-    - Development tool costs
-    - Third-party service costs
-    - Scaling cost projections
-
-Include architecture diagrams descriptions, specific technology versions, and cost estimates throughout."""
-
-STRATEGIST_PROMPT = """You are the Chief Strategy Officer synthesizing insights from a world-class team of specialists into a unified, actionable strategic plan.
-
-Based on all the analyses provided, create a COMPREHENSIVE synthesized strategic plan that:
-
-1. EXECUTIVE SYNTHESIS
-   - Key insights from each specialist
-   - Critical success factors identified
-   - Primary risks and opportunities
-   - Strategic priorities ranking
-
-2. INTEGRATED STRATEGIC FRAMEWORK
-   - How market, financial, and technical strategies align
-   - Dependencies between different elements
-   - Synergies identified
-   - Conflicts resolved
-
-3. PRIORITIZED ACTION ROADMAP
-   - Immediate actions (Week 1-2)
-   - Short-term priorities (Month 1)
-   - Medium-term goals (Months 2-6)
-   - Long-term objectives (6-18 months)
-
-4. RESOURCE ALLOCATION
-   - Budget allocation across areas
-   - Team priorities
-   - Time investment recommendations
-
-5. SUCCESS METRICS DASHBOARD
-   - North Star metric
-   - Key Performance Indicators by area
-   - Milestones and checkpoints
-
-6. RISK MITIGATION MATRIX
-   - Top risks with probability and impact
-   - Mitigation strategies
-   - Contingency plans
-
-7. 90-DAY EXECUTION PLAYBOOK
-   - Week-by-week action items
-   - Decision points
-   - Review cadence
-
-Be specific, actionable, and ensure all elements work together cohesively."""
-
-CRITIC_PROMPT = """You are a seasoned Devil's Advocate and Critical Analyst with a track record of identifying blind spots that cause startups to fail.
-
-Your role is to RIGOROUSLY stress-test the strategic plan and identify ALL potential weaknesses.
-
-CRITICAL ANALYSIS FRAMEWORK:
-
-1. ASSUMPTION AUDIT
-   - List every major assumption in the plan
-   - Rate each assumption's validity (Strong/Moderate/Weak)
-   - Identify unverified or risky assumptions
-   - Recommend validation approaches
-
-2. RISK DEEP DIVE
-   - Market risks: What if the market doesn't respond as expected?
-   - Competitive risks: What moves could competitors make?
-   - Execution risks: What could go wrong operationally?
-   - Financial risks: Cash flow and funding concerns
-   - Technical risks: Technology implementation challenges
-   - Team risks: People and capability gaps
-   - Regulatory risks: Compliance and legal threats
-
-3. GAP ANALYSIS
-   - What's missing from the analysis?
-   - What scenarios weren't considered?
-   - What data would strengthen the plan?
-   - What expertise is lacking?
-
-4. MARKET REALITY CHECK
-   - Is the market sizing realistic?
-   - Are customer acquisition assumptions valid?
-   - Is the competitive analysis complete?
-   - Are the growth projections achievable?
-
-5. EXECUTION FEASIBILITY
-   - Is the timeline realistic?
-   - Are the resource requirements accurate?
-   - Can the team actually deliver this?
-   - What are the hardest parts to execute?
-
-6. ALTERNATIVE PERSPECTIVES
-   - What other approaches might work better?
-   - What would a skeptical investor say?
-   - What would a direct competitor think?
-   - What would a potential customer question?
-
-7. FAILURE MODE ANALYSIS
-   - Most likely ways this could fail
-   - Early warning signs to watch
-   - Circuit breakers and pivot triggers
-
-8. RECOMMENDATIONS FOR IMPROVEMENT
-   - Priority fixes (must address before launch)
-   - Important improvements (address within 90 days)
-   - Nice-to-haves (consider for future)
-
-Be constructively brutal. Your goal is to make this plan bulletproof by exposing every weakness NOW."""
+
+async def ainvoke_llm(system_prompt: str, user_content: str) -> str:
+    """Async version of `invoke_llm`, using `ainvoke` on the event loop's pooled client."""
+    profile = current_profile()
+    llm = get_async_llm(profile)
+    labels = metrics.llm_labels(profile.name, llm.model_name)
+    
+    cache = get_response_cache()
+    if cache is not None:
+        cache_key = response_cache_key(llm, system_prompt, user_content)
+        cached = None if is_refreshing() else await cache.aget(cache_key)
+        if cached is not None:
+            metrics.LLM_REQUESTS.inc(*labels, 'cached')
+            return cached
+    
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_content)
+    ]
+    scheduler = get_llm_scheduler()
+    cost = scheduler.estimate_cost(system_prompt, user_content, llm.max_tokens)
+    caller = get_resilient_caller()
+    key = resilience_key(llm)
+    
+    async def attempt(race, hedge):
+        admission = scheduler.ajoin(race.ticket) if hedge else scheduler.aadmit(llm.model_name, cost)
+        async with admission as ticket, get_llm_pool().aslot() as waited:
+            if not hedge:
+                race.ticket = ticket
+                race.sent.set()
+            with metrics.track_llm_request(labels, waited) as record:
+                started = time.perf_counter()
+                response = await llm.ainvoke(messages)
+                record(response)
+            scheduler.settle(ticket, sum(metrics.token_usage(response)))
+        caller.record_latency(key, time.perf_counter() - started)
+        return response
+    
+    response = await caller.acall(key, attempt)
+    
+    if cache is not None:
+        await cache.aset(cache_key, response.content)
+    return response.content
 
 
 # =============================================================================
 # LangGraph State Definition
 # =============================================================================
 
+def merge_timings(left: dict, right: dict) -> dict:
+    """Reducer that lets parallel nodes each contribute their own timing entry."""
+    return {**(left or {}), **(right or {})}
+
+
 class AnalysisState(TypedDict):
     startup_idea: str
     target_market: Optional[str]
@@ -745,6 +205,7 @@ class AnalysisState(TypedDict):
     strategist_synthesis: str
     critic_review: str
     final_strategy: str
+    node_timings: Annotated[dict, merge_timings]
 
 
 # =============================================================================
@@ -759,197 +220,429 @@ def create_user_context(state: AnalysisState) -> str:
     return context
 
 
+def create_synthesis_context(state: AnalysisState) -> str:
+    """Create the strategist's input from all six specialist outputs, fitted to its token budget."""
+    sections = budget_sections("strategist_synthesis", {
+        key: state[key] for key in (
+            'market_analysis', 'cost_prediction', 'business_strategy',
+            'monetization', 'legal_considerations', 'tech_stack',
+        )
+    })
+    return f"""
+Original Startup Idea: {state['startup_idea']}
+{f"Target Market: {state['target_market']}" if state.get('target_market') else ""}
+
+=== MARKET ANALYSIS ===
+{sections['market_analysis']}
+
+=== COST PREDICTION ===
+{sections['cost_prediction']}
+
+=== BUSINESS STRATEGY ===
+{sections['business_strategy']}
+
+=== MONETIZATION MODELS ===
+{sections['monetization']}
+
+=== LEGAL CONSIDERATIONS ===
+{sections['legal_considerations']}
+
+=== TECHNOLOGY STACK ===
+{sections['tech_stack']}
+"""
+
+
+# Sections of the specialist reports the critic checks the plan against (see analyzer.sections)
+CRITIC_SECTIONS = {
+    'market_analysis': ('market_size_analysis', 'competitive_landscape', 'opportunities_threats'),
+    'cost_prediction': ('initial_setup_costs', 'financial_projections', 'funding_requirements'),
+}
+
+
+def create_critic_context(state: AnalysisState) -> str:
+    """Create the critic's input from the synthesized plan and key analysis data, fitted to its token budget."""
+    # The plan under review is never compacted; the supporting data shares what is left
+    sections = budget_sections(
+        "critic_review",
+        {
+            'strategist_synthesis': state['strategist_synthesis'],
+            **{key: select_sections(key, state[key], keys) for key, keys in CRITIC_SECTIONS.items()},
+        },
+        pinned=('strategist_synthesis',),
+    )
+    return f"""
+Original Startup Idea: {state['startup_idea']}
+
+=== STRATEGIST'S SYNTHESIZED PLAN ===
+{sections['strategist_synthesis']}
+
+=== KEY DATA FROM ANALYSES ===
+Market Analysis Summary:
+{sections['market_analysis']}
+
+Cost Estimates:
+{sections['cost_prediction']}
+"""
+
+
+def create_refinement_context(state: AnalysisState) -> str:
+    """Create the final refinement input from the plan and the critic's review."""
+    return f"""
+Startup Idea: {state['startup_idea']}
+{f"Target Market: {state['target_market']}" if state.get('target_market') else ""}
+
+=== YOUR ORIGINAL SYNTHESIZED PLAN ===
+{state['strategist_synthesis']}
+
+=== CRITIC'S REVIEW ===
+{state['critic_review']}
+
+Based on this feedback, provide a refined final strategy that addresses the valid concerns while maintaining strategic coherence.
+"""
+
+
 def market_analyst_node(state: AnalysisState) -> dict:
     """Market Analyst agent."""
     print("🔍 Market Analyst working...")
-    llm = get_llm()
     context = create_user_context(state)
-    response = llm.invoke([
-        SystemMessage(content=MARKET_ANALYST_PROMPT),
-        HumanMessage(content=context)
-    ])
-    return {"market_analysis": response.content}
+    return {"market_analysis": invoke_llm(MARKET_ANALYST_PROMPT, context)}
+
+
+async def amarket_analyst_node(state: AnalysisState) -> dict:
+    """Market Analyst agent (async)."""
+    print("🔍 Market Analyst working...")
+    context = create_user_context(state)
+    return {"market_analysis": await ainvoke_llm(MARKET_ANALYST_PROMPT, context)}
 
 
 def cost_predictor_node(state: AnalysisState) -> dict:
     """Cost Predictor agent."""
     print("💰 Cost Predictor working...")
-    llm = get_llm()
     context = create_user_context(state)
-    response = llm.invoke([
-        SystemMessage(content=COST_PREDICTOR_PROMPT),
-        HumanMessage(content=context)
-    ])
-    return {"cost_prediction": response.content}
+    return {"cost_prediction": invoke_llm(COST_PREDICTOR_PROMPT, context)}
+
+
+async def acost_predictor_node(state: AnalysisState) -> dict:
+    """Cost Predictor agent (async)."""
+    print("💰 Cost Predictor working...")
+    context = create_user_context(state)
+    return {"cost_prediction": await ainvoke_llm(COST_PREDICTOR_PROMPT, context)}
 
 
 def business_strategist_node(state: AnalysisState) -> dict:
     """Business Strategist agent."""
     print("🎯 Business Strategist working...")
-    llm = get_llm()
     context = create_user_context(state)
-    response = llm.invoke([
-        SystemMessage(content=BUSINESS_STRATEGIST_PROMPT),
-        HumanMessage(content=context)
-    ])
-    return {"business_strategy": response.content}
+    return {"business_strategy": invoke_llm(BUSINESS_STRATEGIST_PROMPT, context)}
+
+
+async def abusiness_strategist_node(state: AnalysisState) -> dict:
+    """Business Strategist agent (async)."""
+    print("🎯 Business Strategist working...")
+    context = create_user_context(state)
+    return {"business_strategy": await ainvoke_llm(BUSINESS_STRATEGIST_PROMPT, context)}
 
 
 def monetization_node(state: AnalysisState) -> dict:
     """Monetization Expert agent."""
     print("💳 Monetization Expert working...")
-    llm = get_llm()
     context = create_user_context(state)
-    response = llm.invoke([
-        SystemMessage(content=MONETIZATION_PROMPT),
-        HumanMessage(content=context)
-    ])
-    return {"monetization": response.content}
+    return {"monetization": invoke_llm(MONETIZATION_PROMPT, context)}
+
+
+async def amonetization_node(state: AnalysisState) -> dict:
+    """Monetization Expert agent (async)."""
+    print("💳 Monetization Expert working...")
+    context = create_user_context(state)
+    return {"monetization": await ainvoke_llm(MONETIZATION_PROMPT, context)}
 
 
 def legal_advisor_node(state: AnalysisState) -> dict:
     """Legal Advisor agent."""
     print("⚖️ Legal Advisor working...")
-    llm = get_llm()
     context = create_user_context(state)
-    response = llm.invoke([
-        SystemMessage(content=LEGAL_ADVISOR_PROMPT),
-        HumanMessage(content=context)
-    ])
-    return {"legal_considerations": response.content}
+    return {"legal_considerations": invoke_llm(LEGAL_ADVISOR_PROMPT, context)}
+
+
+async def alegal_advisor_node(state: AnalysisState) -> dict:
+    """Legal Advisor agent (async)."""
+    print("⚖️ Legal Advisor working...")
+    context = create_user_context(state)
+    return {"legal_considerations": await ainvoke_llm(LEGAL_ADVISOR_PROMPT, context)}
 
 
 def tech_architect_node(state: AnalysisState) -> dict:
     """Tech Architect agent."""
     print("💻 Tech Architect working...")
-    llm = get_llm()
     context = create_user_context(state)
-    response = llm.invoke([
-        SystemMessage(content=TECH_ARCHITECT_PROMPT),
-        HumanMessage(content=context)
-    ])
-    return {"tech_stack": response.content}
+    return {"tech_stack": invoke_llm(TECH_ARCHITECT_PROMPT, context)}
+
+
+async def atech_architect_node(state: AnalysisState) -> dict:
+    """Tech Architect agent (async)."""
+    print("💻 Tech Architect working...")
+    context = create_user_context(state)
+    return {"tech_stack": await ainvoke_llm(TECH_ARCHITECT_PROMPT, context)}
 
 
 def strategist_synthesis_node(state: AnalysisState) -> dict:
     """Strategist synthesizes all agent outputs."""
     print("🔮 Strategist synthesizing insights...")
-    llm = get_llm()
-    
-    synthesis_context = f"""
-Original Startup Idea: {state['startup_idea']}
-{f"Target Market: {state['target_market']}" if state.get('target_market') else ""}
-
-=== MARKET ANALYSIS ===
-{state['market_analysis']}
+    context = create_synthesis_context(state)
+    return {"strategist_synthesis": invoke_llm(STRATEGIST_PROMPT, context)}
 
-=== COST PREDICTION ===
-{state['cost_prediction']}
-
-=== BUSINESS STRATEGY ===
-{state['business_strategy']}
 
-=== MONETIZATION MODELS ===
-{state['monetization']}
-
-=== LEGAL CONSIDERATIONS ===
-{state['legal_considerations']}
-
-=== TECHNOLOGY STACK ===
-{state['tech_stack']}
-"""
-    
-    response = llm.invoke([
-        SystemMessage(content=STRATEGIST_PROMPT),
-        HumanMessage(content=synthesis_context)
-    ])
-    return {"strategist_synthesis": response.content}
+async def astrategist_synthesis_node(state: AnalysisState) -> dict:
+    """Strategist synthesizes all agent outputs (async)."""
+    print("🔮 Strategist synthesizing insights...")
+    context = create_synthesis_context(state)
+    return {"strategist_synthesis": await ainvoke_llm(STRATEGIST_PROMPT, context)}
 
 
 def critic_review_node(state: AnalysisState) -> dict:
     """Critic reviews and challenges the strategist's plan."""
     print("🔍 Critic reviewing the plan...")
-    llm = get_llm()
-    
-    critic_context = f"""
-Original Startup Idea: {state['startup_idea']}
+    context = create_critic_context(state)
+    return {"critic_review": invoke_llm(CRITIC_PROMPT, context)}
 
-=== STRATEGIST'S SYNTHESIZED PLAN ===
-{state['strategist_synthesis']}
 
-=== KEY DATA FROM ANALYSES ===
-Market Analysis Summary: {state['market_analysis'][:2000]}...
-Cost Estimates: {state['cost_prediction'][:2000]}...
-"""
-    
-    response = llm.invoke([
-        SystemMessage(content=CRITIC_PROMPT),
-        HumanMessage(content=critic_context)
-    ])
-    return {"critic_review": response.content}
+async def acritic_review_node(state: AnalysisState) -> dict:
+    """Critic reviews and challenges the strategist's plan (async)."""
+    print("🔍 Critic reviewing the plan...")
+    context = create_critic_context(state)
+    return {"critic_review": await ainvoke_llm(CRITIC_PROMPT, context)}
 
 
 def final_refinement_node(state: AnalysisState) -> dict:
     """Strategist refines plan based on critic feedback."""
     print("✨ Generating final refined strategy...")
-    llm = get_llm()
-    
-    refinement_prompt = """You are the Senior Business Strategist again.
-Review the Critic's feedback and refine your strategic plan.
-Address the valid concerns raised while maintaining the core strategy's strengths.
-Create a FINAL, battle-tested strategic plan that is comprehensive and actionable.
+    context = create_refinement_context(state)
+    return {"final_strategy": invoke_llm(REFINEMENT_PROMPT, context)}
 
-Format your response clearly with headers and bullet points. Do not use asterisks for emphasis - use clear section headers instead."""
 
-    refinement_context = f"""
-=== YOUR ORIGINAL SYNTHESIZED PLAN ===
-{state['strategist_synthesis']}
+async def afinal_refinement_node(state: AnalysisState) -> dict:
+    """Strategist refines plan based on critic feedback (async)."""
+    print("✨ Generating final refined strategy...")
+    context = create_refinement_context(state)
+    return {"final_strategy": await ainvoke_llm(REFINEMENT_PROMPT, context)}
 
-=== CRITIC'S REVIEW ===
-{state['critic_review']}
 
-Based on this feedback, provide a refined final strategy that addresses the valid concerns while maintaining strategic coherence.
-"""
-    
-    response = llm.invoke([
-        SystemMessage(content=refinement_prompt),
-        HumanMessage(content=refinement_context)
-    ])
-    return {"final_strategy": response.content}
+# =============================================================================
+# Node Timing
+# =============================================================================
+
+def get_checkpoint_store(config: dict):
+    """The run's node checkpoint store (see analyzer.checkpoints), if one was passed."""
+    return (config or {}).get("configurable", {}).get("checkpoint_store")
+
+
+def get_analysis_id(config: dict):
+    """The id of the run a node belongs to, used to share LLM rate limits fairly between runs."""
+    return (config or {}).get("configurable", {}).get("analysis_id")
+
+
+def get_refresh_cache(config: dict) -> bool:
+    """Whether the run bypasses cached completions (a rerun)."""
+    return bool((config or {}).get("configurable", {}).get("refresh_cache"))
+
+
+def node_routing() -> dict:
+    """Profile and model the running node's completion used (None for both if it made none)."""
+    call = metrics.current_call()
+    if call is None:
+        return {"profile": None, "model": None}
+    return {"profile": call.profile, "model": call.model}
+
+
+def checkpointed_node(name: str, func):
+    """
+    Wrap a (sync or async) node so that its output is saved to the run's
+    checkpoint store, and replayed from it when an earlier attempt already
+    completed the node.
+    """
+
+    if inspect.iscoroutinefunction(func):
+        async def async_wrapper(state: AnalysisState, config: dict) -> dict:
+            store = get_checkpoint_store(config)
+            if store is not None:
+                saved = store.load(name)
+                if saved is not None:
+                    print(f"⏭️ {name} restored from checkpoint")
+                    return saved
+            update = await func(state)
+            if store is not None:
+                await store.asave(name, update, **node_routing())
+            return update
+
+        return async_wrapper
+
+    def wrapper(state: AnalysisState, config: dict) -> dict:
+        store = get_checkpoint_store(config)
+        if store is not None:
+            saved = store.load(name)
+            if saved is not None:
+                print(f"⏭️ {name} restored from checkpoint")
+                return saved
+        update = func(state)
+        if store is not None:
+            store.save(name, update, **node_routing())
+        return update
+
+    return wrapper
+
+
+def timed_node(name: str, func):
+    """
+    Wrap a (sync or async) node so it records its start/finish times (and the
+    model profile it used) in `node_timings`, and its wall time and errors in
+    the `/metrics` histograms.
+    """
+    # No functools.wraps here: RunnableLambda inspects the signature to decide
+    # whether to pass `config`, and must see this wrapper's, not the node's.
+
+    if inspect.iscoroutinefunction(func):
+        async def async_wrapper(state: AnalysisState, config: dict) -> dict:
+            with metrics.node_call(name) as call, tenant_scope(get_analysis_id(config)), \
+                    refresh_scope(get_refresh_cache(config)):
+                started = time.perf_counter()
+                update = await func(state, config)
+                finished = time.perf_counter()
+            return {
+                **update,
+                "node_timings": {name: {
+                    "started": started, "finished": finished, "profile": call.profile, "model": call.model,
+                }},
+            }
+
+        return async_wrapper
+
+    def wrapper(state: AnalysisState, config: dict) -> dict:
+        with metrics.node_call(name) as call, tenant_scope(get_analysis_id(config)), \
+                refresh_scope(get_refresh_cache(config)):
+            started = time.perf_counter()
+            update = func(state, config)
+            finished = time.perf_counter()
+        return {
+            **update,
+            "node_timings": {name: {
+                "started": started, "finished": finished, "profile": call.profile, "model": call.model,
+            }},
+        }
+
+    return wrapper
+
+
+def summarize_timings(node_timings: dict) -> dict:
+    """
+    Summarize per-node timings for a finished run.
+
+    Returns the duration of every node, the model profile and model of every
+    node that called the LLM (`routing`) plus, for the specialist phase, the
+    sequential cost (sum of node durations), the actual wall-clock time and
+    the time saved by running the specialists in parallel.
+    """
+    nodes = {
+        name: round(timing["finished"] - timing["started"], 3)
+        for name, timing in node_timings.items()
+    }
+    routing = {
+        name: {"profile": timing["profile"], "model": timing["model"]}
+        for name, timing in node_timings.items()
+        if timing.get("profile")
+    }
+
+    specialists = [node_timings[name] for name, *_ in SPECIALIST_NODES if name in node_timings]
+    if not specialists:
+        return {"nodes": nodes, "routing": routing}
+
+    sequential = sum(t["finished"] - t["started"] for t in specialists)
+    wall_clock = max(t["finished"] for t in specialists) - min(t["started"] for t in specialists)
+
+    return {
+        "nodes": nodes,
+        "routing": routing,
+        "specialists": {
+            "sequential_seconds": round(sequential, 3),
+            "wall_clock_seconds": round(wall_clock, 3),
+            "saved_seconds": round(sequential - wall_clock, 3),
+        },
+    }
 
 
 # =============================================================================
 # Build the LangGraph Workflow
 # =============================================================================
 
+# Phase 1 specialists as (name, sync node, async node). None of them reads
+# another's output, so they run as a parallel fan-out from START and join
+# before the strategist synthesis.
+SPECIALIST_NODES = [
+    ("market_analyst", market_analyst_node, amarket_analyst_node),
+    ("cost_predictor", cost_predictor_node, acost_predictor_node),
+    ("business_strategist", business_strategist_node, abusiness_strategist_node),
+    ("monetization", monetization_node, amonetization_node),
+    ("legal_advisor", legal_advisor_node, alegal_advisor_node),
+    ("tech_architect", tech_architect_node, atech_architect_node),
+]
+
+# Phase 2-4 nodes, run one after another
+REVIEW_NODES = [
+    ("strategist_synthesis", strategist_synthesis_node, astrategist_synthesis_node),
+    ("critic_review", critic_review_node, acritic_review_node),
+    ("final_refinement", final_refinement_node, afinal_refinement_node),
+]
+
+
+def agent_node(name: str, func, afunc) -> RunnableLambda:
+    """
+    Graph node with both implementations: `invoke`/`stream` run the sync
+    function, `ainvoke`/`astream` await the async one.
+    """
+    return RunnableLambda(
+        timed_node(name, checkpointed_node(name, func)),
+        afunc=timed_node(name, checkpointed_node(name, afunc)),
+        name=name,
+    )
+
+
+def get_max_concurrency() -> int:
+    """Maximum number of nodes LangGraph may run at the same time."""
+    return settings.ANALYSIS_MAX_CONCURRENCY
+
+
+def create_run_config(checkpoints=None, refresh: bool = False) -> dict:
+    """
+    LangGraph config for one run, optionally with a node checkpoint store to
+    resume from. With `refresh`, cached completions are not reused.
+    """
+    config = {
+        "max_concurrency": get_max_concurrency(),
+        "configurable": {"analysis_id": uuid.uuid4().hex, "refresh_cache": refresh},
+    }
+    if checkpoints is not None:
+        config["configurable"]["checkpoint_store"] = checkpoints
+    return config
+
+
 def build_analysis_graph() -> StateGraph:
     """Build the multi-agent analysis graph."""
     
     workflow = StateGraph(AnalysisState)
     
+    # Fail at compile time, not mid-run, on a route to an unknown profile or node
+    routing_table([name for name, *_ in SPECIALIST_NODES + REVIEW_NODES])
+    
     # Add all agent nodes
-    workflow.add_node("market_analyst", market_analyst_node)
-    workflow.add_node("cost_predictor", cost_predictor_node)
-    workflow.add_node("business_strategist", business_strategist_node)
-    workflow.add_node("monetization", monetization_node)
-    workflow.add_node("legal_advisor", legal_advisor_node)
-    workflow.add_node("tech_architect", tech_architect_node)
-    workflow.add_node("strategist_synthesis", strategist_synthesis_node)
-    workflow.add_node("critic_review", critic_review_node)
-    workflow.add_node("final_refinement", final_refinement_node)
-    
-    # Set entry point
-    workflow.set_entry_point("market_analyst")
-    
-    # Phase 1: Run 6 specialist agents sequentially
-    workflow.add_edge("market_analyst", "cost_predictor")
-    workflow.add_edge("cost_predictor", "business_strategist")
-    workflow.add_edge("business_strategist", "monetization")
-    workflow.add_edge("monetization", "legal_advisor")
-    workflow.add_edge("legal_advisor", "tech_architect")
-    
-    # Phase 2: Strategist synthesizes all outputs
-    workflow.add_edge("tech_architect", "strategist_synthesis")
+    for name, func, afunc in SPECIALIST_NODES + REVIEW_NODES:
+        workflow.add_node(name, agent_node(name, func, afunc))
+    
+    # Phase 1: Fan out to the 6 specialist agents in parallel
+    specialist_names = [name for name, *_ in SPECIALIST_NODES]
+    for name in specialist_names:
+        workflow.add_edge(START, name)
+    
+    # Phase 2: Strategist synthesizes all outputs once every specialist is done
+    workflow.add_edge(specialist_names, "strategist_synthesis")
     
     # Phase 3: Critic reviews the synthesis
     workflow.add_edge("strategist_synthesis", "critic_review")
@@ -963,20 +656,63 @@ def build_analysis_graph() -> StateGraph:
     return workflow.compile()
 
 
-def run_analysis(startup_idea: str, target_market: Optional[str] = None) -> dict:
-    """
-    Run the complete multi-agent analysis workflow.
+# =============================================================================
+# Compiled Graph Registry
+# =============================================================================
+
+# Compiling the StateGraph is pure overhead per request, and a compiled graph
+# holds no per-run state, so each process compiles it once and every worker
+# thread shares it.
+GRAPH_BUILDERS = {
+    "analysis": build_analysis_graph,
+}
+
+_compiled_graphs = {}
+_compiled_graphs_lock = threading.Lock()
+
+
+def get_compiled_graph(name: str = "analysis"):
+    """Return the process-wide compiled graph, compiling it on first use."""
+    graph = _compiled_graphs.get(name)
+    if graph is not None:
+        return graph
     
-    Args:
-        startup_idea: The startup idea to analyze
-        target_market: Optional target market specification
-        
-    Returns:
-        Dictionary containing all analysis results
+    with _compiled_graphs_lock:
+        # Another thread may have compiled it while we waited for the lock
+        graph = _compiled_graphs.get(name)
+        if graph is None:
+            graph = GRAPH_BUILDERS[name]()
+            _compiled_graphs[name] = graph
+            print(f"🧩 Compiled '{name}' graph")
+    return graph
+
+
+def rebuild_compiled_graphs() -> None:
     """
-    graph = build_analysis_graph()
-    
-    initial_state: AnalysisState = {
+    Drop every cached graph so the next request recompiles it.
+
+    Call this after changing prompts, node functions or the graph topology
+    at runtime.
+    """
+    with _compiled_graphs_lock:
+        _compiled_graphs.clear()
+
+
+# State keys that make up the analysis result, mapped to their result/Project field names
+RESULT_FIELDS = {
+    "market_analysis": "market_analysis",
+    "cost_prediction": "cost_prediction",
+    "business_strategy": "business_strategy",
+    "monetization": "monetization",
+    "legal_considerations": "legal_considerations",
+    "tech_stack": "tech_stack",
+    "final_strategy": "strategist_critique",
+}
+
+
+def create_initial_state(startup_idea: str, target_market: Optional[str] = None) -> AnalysisState:
+    """Create the empty workflow state for a new analysis."""
+    return {
         "startup_idea": startup_idea,
         "target_market": target_market,
         "market_analysis": "",
@@ -988,16 +724,148 @@ def run_analysis(startup_idea: str, target_market: Optional[str] = None) -> dict
         "strategist_synthesis": "",
         "critic_review": "",
         "final_strategy": "",
+        "node_timings": {},
     }
+
+
+def log_timings(timings: dict) -> None:
+    """Print how long the specialist phase took compared to running it sequentially, and the models used."""
+    if timings.get("routing"):
+        print("🧭 Models: " + ", ".join(
+            f"{name}={route['profile']} ({route['model']})" for name, route in timings["routing"].items()
+        ))
+    if "specialists" in timings:
+        phase = timings["specialists"]
+        print(
+            f"⏱️ Specialists took {phase['wall_clock_seconds']}s wall-clock "
+            f"({phase['sequential_seconds']}s sequential, saved {phase['saved_seconds']}s)"
+        )
+
+
+def collect_result(final_state: AnalysisState) -> dict:
+    """Pick the analysis results and timing summary out of a finished run's state."""
+    timings = summarize_timings(final_state["node_timings"])
+    log_timings(timings)
+    
+    result = {field: final_state[key] for key, field in RESULT_FIELDS.items()}
+    result["timings"] = timings
+    return result
+
+
+def run_analysis(
+    startup_idea: str, target_market: Optional[str] = None, checkpoints=None, refresh: bool = False,
+) -> dict:
+    """
+    Run the complete multi-agent analysis workflow.
     
-    final_state = graph.invoke(initial_state)
+    Thin sync wrapper over the same compiled graph `arun_analysis` uses;
+    it runs the sync node implementations.
     
-    return {
-        "market_analysis": final_state["market_analysis"],
-        "cost_prediction": final_state["cost_prediction"],
-        "business_strategy": final_state["business_strategy"],
-        "monetization": final_state["monetization"],
-        "legal_considerations": final_state["legal_considerations"],
-        "tech_stack": final_state["tech_stack"],
-        "strategist_critique": final_state["final_strategy"],
-    }
+    Args:
+        startup_idea: The startup idea to analyze
+        target_market: Optional target market specification
+        checkpoints: Optional node checkpoint store; nodes it already holds
+            are replayed instead of calling the LLM
+        refresh: Call the LLM even for completions in the response cache
+            (for reruns), and cache the new completions
+        
+    Returns:
+        Dictionary containing all analysis results
+    """
+    graph = get_compiled_graph()
+    initial_state = create_initial_state(startup_idea, target_market)
+    
+    final_state = graph.invoke(initial_state, config=create_run_config(checkpoints, refresh))
+    return collect_result(final_state)
+
+
+async def arun_analysis(
+    startup_idea: str, target_market: Optional[str] = None, checkpoints=None, refresh: bool = False,
+) -> dict:
+    """
+    Run the complete multi-agent analysis workflow on the event loop.
+    
+    Every node awaits `ainvoke`, so no thread is held while LLM calls are
+    in flight and one event loop can multiplex many analyses.
+    
+    Returns:
+        Dictionary containing all analysis results (same shape as run_analysis)
+    """
+    graph = get_compiled_graph()
+    initial_state = create_initial_state(startup_idea, target_market)
+    
+    final_state = await graph.ainvoke(initial_state, config=create_run_config(checkpoints, refresh))
+    return collect_result(final_state)
+
+
+def stream_analysis(
+    startup_idea: str, target_market: Optional[str] = None, checkpoints=None, refresh: bool = False,
+):
+    """
+    Run the workflow, yielding each node's output as soon as the node finishes.
+    
+    Yields:
+        (node_name, results) tuples, where `results` maps result field names
+        (see RESULT_FIELDS) to the text the node produced. Nodes that produce
+        intermediate state only (synthesis, critique) yield an empty dict.
+    """
+    graph = get_compiled_graph()
+    initial_state = create_initial_state(startup_idea, target_market)
+    
+    node_timings = {}
+    for chunk in graph.stream(
+        initial_state,
+        config=create_run_config(checkpoints, refresh),
+        stream_mode="updates",
+    ):
+        for node_name, update in chunk.items():
+            node_timings.update(update.get("node_timings", {}))
+            yield node_name, {
+                RESULT_FIELDS[key]: value
+                for key, value in update.items()
+                if key in RESULT_FIELDS
+            }
+    
+    log_timings(summarize_timings(node_timings))
+
+
+async def astream_analysis(
+    startup_idea: str,
+    target_market: Optional[str] = None,
+    tokens: bool = False,
+    checkpoints=None,
+    refresh: bool = False,
+):
+    """
+    Async variant of stream_analysis for the ASGI app.
+    
+    Yields:
+        ("node", node_name, results) as each node finishes, where `results`
+        maps result field names to the node's text, and, when `tokens` is
+        set, ("token", node_name, delta) for every LLM token as it arrives.
+    """
+    graph = get_compiled_graph()
+    initial_state = create_initial_state(startup_idea, target_market)
+    stream_mode = ["updates", "messages"] if tokens else ["updates"]
+    
+    node_timings = {}
+    async for mode, chunk in graph.astream(
+        initial_state,
+        config=create_run_config(checkpoints, refresh),
+        stream_mode=stream_mode,
+    ):
+        if mode == "messages":
+            message, metadata = chunk
+            if message.content:
+                yield "token", metadata.get("langgraph_node"), message.content
+            continue
+        
+        for node_name, update in chunk.items():
+            node_timings.update(update.get("node_timings", {}))
+            yield "node", node_name, {
+                RESULT_FIELDS[key]: value
+                for key, value in update.items()
+                if key in RESULT_FIELDS
+            }
+    
+    log_timings(summarize_timings(node_timings))
@@ -0,0 +1,193 @@
+"""
+Content-addressed cache for agent completions.
+
+A cache key is the hash of the normalized user content, the system prompt
+text and the model parameters. Re-submitting the same (or a trivially
+re-spaced / re-cased) idea therefore hits the cache for every agent. Editing
+one prompt constant such as `MARKET_ANALYST_PROMPT` changes only that agent's
+keys, so the other agents keep their entries.
+
+A rerun (`"rerun": true`) must not replay the completions it is meant to
+redo, so its nodes run inside `refresh_scope`: they skip cache reads and
+overwrite the entries with their fresh completions.
+
+Backends:
+- `memory`: per-process LRU with TTL and max-entries eviction
+- `django`: any Django cache from `CACHES` (database/SQLite, file, Redis...)
+- `none`: caching disabled
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivially edited inputs share a key."""
+    return re.sub(r'\s+', ' ', text or '').strip().casefold()
+
+
+def make_cache_key(system_prompt: str, user_content: str, **model_params) -> str:
+    """Hash the prompt, the normalized user content and the model parameters."""
+    payload = json.dumps(
+        {
+            "system": system_prompt,
+            "user": normalize_text(user_content),
+            "model": model_params,
+        },
+        sort_keys=True,
+    )
+    return "llm:" + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LRUResponseCache:
+    """In-memory LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def aget(self, key: str):
+        return self.get(key)
+
+    async def aset(self, key: str, value: str) -> None:
+        self.set(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class DjangoResponseCache:
+    """
+    Cache backed by one of Django's configured caches.
+
+    TTL comes from `ttl`; size-based eviction is the cache's own
+    `OPTIONS['MAX_ENTRIES']` / `CULL_FREQUENCY`.
+    """
+
+    def __init__(self, alias: str = 'default', ttl: float = None):
+        self.alias = alias
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def get(self, key: str):
+        value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value, timeout=self.ttl)
+
+    async def aget(self, key: str):
+        value = await self._cache.aget(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def aset(self, key: str, value: str) -> None:
+        await self._cache.aset(key, value, timeout=self.ttl)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {"backend": "django", "alias": self.alias, "hits": self.hits, "misses": self.misses}
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide response cache configured in settings, or None if disabled."""
+    global _response_cache
+    if _response_cache is not None:
+        return _response_cache
+
+    backend = settings.LLM_CACHE_BACKEND
+    if backend == 'none':
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            ttl = settings.LLM_CACHE_TTL or None
+            if backend == 'memory':
+                _response_cache = LRUResponseCache(max_entries=settings.LLM_CACHE_MAX_ENTRIES, ttl=ttl)
+            elif backend == 'django':
+                _response_cache = DjangoResponseCache(alias=settings.LLM_CACHE_ALIAS, ttl=ttl)
+            else:
+                raise ValueError(f"Unknown LLM_CACHE_BACKEND '{backend}'. Use 'memory', 'django' or 'none'.")
+    return _response_cache
+
+
+_refreshing = ContextVar('llm_cache_refreshing', default=False)
+
+
+@contextmanager
+def refresh_scope(enabled: bool = True):
+    """Within this context, completions bypass cache reads (their results are still cached)."""
+    token = _refreshing.set(enabled)
+    try:
+        yield
+    finally:
+        _refreshing.reset(token)
+
+
+def is_refreshing() -> bool:
+    """Whether the current context is refreshing cached completions instead of reading them."""
+    return _refreshing.get()
+
+
+def reset_response_cache() -> None:
+    """Forget the process-wide cache instance so it is rebuilt from settings."""
+    global _response_cache
+    with _response_cache_lock:
+        _response_cache = None
@@ -0,0 +1,244 @@
+"""
+Shared LLM client pool.
+
+Building a `ChatGroq` per node call means a fresh HTTP client, and a fresh
+TLS handshake, for every one of the nine agents. The pool keeps one client
+per (model, temperature, max_tokens, timeout) combination for the lifetime of the
+process. All of them share a single keep-alive `httpx.Client`, and a
+semaphore bounds how many completions this worker has in flight at once.
+
+Async callers get clients backed by an `httpx.AsyncClient`. Async
+connections belong to the event loop that opened them, so those clients are
+kept per event loop, and share the same in-flight bound as sync callers.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
+from django.conf import settings
+from langchain_groq import ChatGroq
+
+from . import metrics
+
+
+class LLMClientPool:
+    """Process-wide pool of `ChatGroq` clients sharing one HTTP connection pool."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = None,
+        max_in_flight: int = 8,
+        max_connections: int = 20,
+        timeout: float = 120.0,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_in_flight = max_in_flight
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.http_client = httpx.Client(limits=self._limits(), timeout=timeout)
+
+        self._clients = {}
+        # event loop -> (httpx.AsyncClient, {params: ChatGroq})
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+        # Metrics (guarded by _lock)
+        self.hits = 0
+        self.misses = 0
+        self.acquisitions = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.active = 0
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+
+    def _build(
+        self, model: str, temperature: float, max_tokens: int, timeout: float = None, http_async_client=None,
+    ) -> ChatGroq:
+        return ChatGroq(
+            model_name=model,
+            temperature=temperature,
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_tokens=max_tokens,
+            # Per-request timeout; None keeps the shared HTTP client's
+            request_timeout=timeout,
+            http_client=self.http_client,
+            http_async_client=http_async_client,
+            # Retries are handled by analyzer.llm_resilience, not the SDK
+            max_retries=0,
+        )
+
+    def get(self, model: str, temperature: float, max_tokens: int, timeout: float = None) -> ChatGroq:
+        """Return the shared client for these parameters, creating it on first use."""
+        key = (model, temperature, max_tokens, timeout)
+        with self._lock:
+            llm = self._clients.get(key)
+            if llm is not None:
+                self._record_hit()
+                return llm
+
+            llm = self._build(model, temperature, max_tokens, timeout)
+            self._clients[key] = llm
+            self._record_miss()
+            return llm
+
+    def get_async(self, model: str, temperature: float, max_tokens: int, timeout: float = None) -> ChatGroq:
+        """Return the client for these parameters bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        key = (model, temperature, max_tokens, timeout)
+        with self._lock:
+            if loop not in self._async_clients:
+                self._async_clients[loop] = (
+                    httpx.AsyncClient(limits=self._limits(), timeout=self.timeout),
+                    {},
+                )
+            http_async_client, clients = self._async_clients[loop]
+
+            llm = clients.get(key)
+            if llm is not None:
+                self._record_hit()
+                return llm
+
+            llm = self._build(model, temperature, max_tokens, timeout, http_async_client=http_async_client)
+            clients[key] = llm
+            self._record_miss()
+            return llm
+
+    def _client_count(self) -> int:
+        return len(self._clients) + sum(len(clients) for _, clients in self._async_clients.values())
+
+    # _record_hit and _record_miss are called with _lock held
+    def _record_hit(self) -> None:
+        self.hits += 1
+        metrics.LLM_POOL_LOOKUPS.inc('hit')
+
+    def _record_miss(self) -> None:
+        self.misses += 1
+        metrics.LLM_POOL_LOOKUPS.inc('miss')
+        metrics.LLM_POOL_CLIENTS.set(self._client_count())
+
+    def _record_acquired(self, waited: float) -> None:
+        with self._lock:
+            self.acquisitions += 1
+            self.active += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            metrics.LLM_POOL_IN_FLIGHT.set(self.active)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.active -= 1
+            metrics.LLM_POOL_IN_FLIGHT.set(self.active)
+        self._in_flight.release()
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold one of the pool's in-flight completion slots for the duration of a call.
+
+        Yields the seconds spent waiting for the slot.
+        """
+        started = time.perf_counter()
+        self._in_flight.acquire()
+        waited = time.perf_counter() - started
+        self._record_acquired(waited)
+        try:
+            yield waited
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Async version of `slot`; waits for a free slot without blocking the event loop."""
+        started = time.perf_counter()
+        # The semaphore is shared with sync callers, so poll it rather than
+        # parking an executor thread per waiting coroutine
+        delay = 0.005
+        while not self._in_flight.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        waited = time.perf_counter() - started
+        self._record_acquired(waited)
+        try:
+            yield waited
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the pool's hit/miss and wait-time metrics.
+
+        Only meaningful inside the serving process; the same counts are
+        exported on `/metrics` (`llm_pool_*`, `llm_queue_wait_seconds`).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "clients": self._client_count(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "in_flight": self.active,
+                "max_in_flight": self.max_in_flight,
+                "slot_acquisitions": self.acquisitions,
+                "wait_seconds_total": round(self.wait_seconds_total, 3),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.acquisitions, 3) if self.acquisitions else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 3),
+            }
+
+    def close(self) -> None:
+        """Close the shared HTTP connections and forget every client."""
+        with self._lock:
+            self._clients.clear()
+            # Async clients are closed with their event loop
+            self._async_clients.clear()
+            metrics.LLM_POOL_CLIENTS.set(0)
+        self.http_client.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_pool() -> LLMClientPool:
+    """Return the process-wide pool, creating it from settings on first use."""
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None:
+            api_key = settings.GROQ_API_KEY or os.getenv('GROQ_API_KEY')
+            if not api_key:
+                raise ValueError("GROQ_API_KEY is not configured. Set it in your environment variables.")
+
+            _pool = LLMClientPool(
+                api_key=api_key,
+                base_url=settings.GROQ_API_BASE,
+                max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                timeout=settings.LLM_REQUEST_TIMEOUT,
+            )
+    return _pool
+
+
+def reset_llm_pool() -> None:
+    """Close and discard the process-wide pool (e.g. after the API key changes)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
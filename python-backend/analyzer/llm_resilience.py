@@ -0,0 +1,392 @@
+"""
+Retries, circuit breaking and hedged requests for LLM calls.
+
+One failed or stalled completion used to fail or stall the whole analysis.
+Every completion attempt now runs through `ResilientCaller`:
+
+- Transient errors (429, 5xx, timeouts, dropped connections) are retried with
+  full-jitter exponential backoff, honouring `Retry-After` when the API sends
+  it. Other errors (bad request, auth) fail at once.
+- A circuit breaker per model and endpoint opens after consecutive transient
+  failures. While it is open, calls fail fast instead of piling onto a failing
+  upstream. After a cool-down, one trial call decides whether it closes again.
+- Optionally, once a call has run longer than a percentile of that model's
+  recent latencies, a hedged duplicate is sent and the first success wins.
+  The loser is cancelled. In sync code, a loser that is already mid-request
+  cannot be interrupted, so its result is discarded. Hedging at the pN latency
+  duplicates at most (100 - N)% of calls.
+
+Each retry goes through rate-limit admission again and takes a pool slot
+again, so retries stay within the configured budgets. A failed attempt has
+already given its reservation back. A hedge takes its own pool slot but runs
+on its primary's rate-limit ticket, so the pair reserves one call's tokens.
+The hedge timer starts once the primary was admitted and holds a slot,
+because the latencies it is compared to exclude those waits.
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import httpx
+from django.conf import settings
+
+from . import metrics
+
+
+# HTTP statuses worth retrying: request timeout, conflict, rate limit, server errors
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit breaker is open."""
+
+
+class HedgeCancelled(Exception):
+    """Raised by an attempt that was superseded before it reached the API."""
+
+
+class HedgeRace:
+    """
+    State shared by the attempts of one try: the primary and, if it is slow, its hedge.
+
+    The primary records its rate-limit `ticket` and sets `sent` once it was
+    admitted and got a pool slot. `cancelled` is set once one of them won.
+    """
+
+    def __init__(self, sent=None):
+        self.cancelled = threading.Event()
+        self.sent = sent or threading.Event()
+        self.ticket = None
+
+
+def is_transient(exc: Exception) -> bool:
+    """Whether an error from an LLM call is worth retrying."""
+    status_code = getattr(exc, 'status_code', None)
+    if status_code is not None:
+        return status_code in TRANSIENT_STATUS_CODES
+    try:
+        import groq
+        if isinstance(exc, (groq.APIConnectionError, groq.APITimeoutError)):
+            return True
+    except ImportError:
+        pass
+    return isinstance(exc, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+def retry_after(exc: Exception):
+    """Seconds the API asked us to wait (`Retry-After` header), if it did."""
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, exc: Exception, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    requested = retry_after(exc)
+    if requested is not None:
+        delay = max(delay, min(requested, cap))
+    return delay
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker: closed -> open -> half-open -> closed."""
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: int) -> None:
+        self.state = state
+        metrics.LLM_CIRCUIT_STATE.set(state, self.name)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(self.HALF_OPEN)
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise CircuitOpenError(f"Circuit for {self.name} is open after repeated failures; retry shortly.")
+
+    def record_success(self) -> None:
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                print(f"🟢 Circuit for {self.name} closed")
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        # A threshold of 0 means the breaker never opens, so there is nothing to track
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                print(f"🔴 Circuit for {self.name} opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def record_neutral(self) -> None:
+        """A call ended without saying anything about upstream health (e.g. a bad request)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Recent successful call latencies of one model, for the hedging threshold."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int):
+        """The p-th percentile of recent latencies, or None until there are `min_samples`."""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+class ResilientCaller:
+    """Retries, circuit breakers and hedging for LLM call attempts, per model/endpoint."""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        breaker_failures: int = 5,
+        breaker_reset: float = 30.0,
+        hedge_percentile: float = 0,
+        hedge_min_samples: int = 20,
+        hedge_workers: int = 32,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_workers = hedge_workers
+
+        self._breakers = {}
+        self._trackers = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, self.breaker_failures, self.breaker_reset)
+            return breaker
+
+    def tracker(self, name: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(name)
+            if tracker is None:
+                tracker = self._trackers[name] = LatencyTracker()
+            return tracker
+
+    def record_latency(self, name: str, seconds: float) -> None:
+        """Feed one successful request's latency (excluding queue waits) to the hedging threshold."""
+        if self.hedge_percentile:
+            self.tracker(name).record(seconds)
+
+    def hedge_after(self, name: str):
+        """Seconds after which a call to `name` gets a hedged duplicate, or None for no hedging."""
+        if not self.hedge_percentile:
+            return None
+        return self.tracker(name).percentile(self.hedge_percentile, self.hedge_min_samples)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.hedge_workers, thread_name_prefix='llm-hedge')
+            return self._executor
+
+    def _outcome(self, breaker: CircuitBreaker, exc: Exception, attempt: int) -> float:
+        """Record a failed attempt; return the delay before retrying, or re-raise if it should not be retried."""
+        if not is_transient(exc):
+            breaker.record_neutral()
+            raise exc
+        breaker.record_failure()
+        if attempt >= self.max_retries:
+            raise exc
+        metrics.LLM_RETRIES.inc(breaker.name)
+        delay = backoff_delay(attempt, exc, self.backoff_base, self.backoff_max)
+        print(f"🔁 {breaker.name} call failed ({exc.__class__.__name__}), retrying in {delay:.1f}s")
+        return delay
+
+    def call(self, name: str, attempt):
+        """
+        Run `attempt(race, hedge)` with retries, circuit breaking and hedging.
+
+        `race` is the HedgeRace of the try, and `hedge` is True for the hedged
+        duplicate. An attempt should raise HedgeCancelled instead of calling
+        the API once `race.cancelled` is set, and set `race.sent` when it
+        sends its request.
+        """
+        breaker = self.breaker(name)
+        for retry in range(self.max_retries + 1):
+            breaker.before_call()
+            try:
+                result = self._hedged(name, attempt)
+            except Exception as e:
+                time.sleep(self._outcome(breaker, e, retry))
+                continue
+            breaker.record_success()
+            return result
+
+    def _hedged(self, name: str, attempt):
+        race = HedgeRace()
+        threshold = self.hedge_after(name)
+        if threshold is None:
+            return attempt(race, False)
+
+        executor = self._get_executor()
+        # Attempts run on executor threads but must see this thread's context
+        # (current node for metrics, analysis for fair rate limiting)
+        primary = executor.submit(contextvars.copy_context().run, attempt, race, False)
+        primary.add_done_callback(lambda _: race.sent.set())
+        race.sent.wait()
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        metrics.LLM_HEDGES.inc(name, 'sent')
+        hedge = executor.submit(contextvars.copy_context().run, attempt, race, True)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    race.cancelled.set()
+                    if future is hedge:
+                        metrics.LLM_HEDGES.inc(name, 'won')
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def acall(self, name: str, attempt):
+        """Async version of `call`; `attempt(race, hedge)` is a coroutine function and losing hedges are cancelled."""
+        breaker = self.breaker(name)
+        for retry in range(self.max_retries + 1):
+            breaker.before_call()
+            try:
+                result = await self._ahedged(name, attempt)
+            except asyncio.CancelledError:
+                breaker.record_neutral()
+                raise
+            except Exception as e:
+                await asyncio.sleep(self._outcome(breaker, e, retry))
+                continue
+            breaker.record_success()
+            return result
+
+    async def _ahedged(self, name: str, attempt):
+        race = HedgeRace(asyncio.Event())
+        threshold = self.hedge_after(name)
+        if threshold is None:
+            return await attempt(race, False)
+
+        primary = asyncio.ensure_future(attempt(race, False))
+        primary.add_done_callback(lambda _: race.sent.set())
+        pending = {primary}
+        try:
+            await race.sent.wait()
+            done, pending = await asyncio.wait(pending, timeout=threshold)
+            if done:
+                return primary.result()
+
+            metrics.LLM_HEDGES.inc(name, 'sent')
+            hedge = asyncio.ensure_future(attempt(race, True))
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            metrics.LLM_HEDGES.inc(name, 'won')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Cancel the losing request (or both, if we were cancelled ourselves)
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {"state": ("closed", "half-open", "open")[breaker.state], "failures": breaker.failures}
+                for name, breaker in self._breakers.items()
+            }
+
+
+_caller = None
+_caller_lock = threading.Lock()
+
+
+def get_resilient_caller() -> ResilientCaller:
+    """Return the process-wide caller, creating it from settings on first use."""
+    global _caller
+    if _caller is not None:
+        return _caller
+
+    with _caller_lock:
+        if _caller is None:
+            _caller = ResilientCaller(
+                max_retries=settings.LLM_MAX_RETRIES,
+                backoff_base=settings.LLM_RETRY_BACKOFF,
+                backoff_max=settings.LLM_RETRY_BACKOFF_MAX,
+                breaker_failures=settings.LLM_BREAKER_FAILURES,
+                breaker_reset=settings.LLM_BREAKER_RESET,
+                hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+                hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+            )
+    return _caller
+
+
+def reset_resilient_caller() -> None:
+    """Forget the process-wide caller (breakers, latency history) so it is rebuilt from settings."""
+    global _caller
+    with _caller_lock:
+        _caller = None
@@ -0,0 +1,66 @@
+"""
+Per-node model routing.
+
+Each workflow node is routed to a model profile: the model, temperature,
+max_tokens and request timeout of its completions. The specialists write
+self-contained reports and often do fine on a small, fast model. The
+synthesis, critique and refinement reason across all of them and get the
+large one.
+
+Profiles are defined in `LLM_MODEL_PROFILES`. Nodes are routed with
+`LLM_NODE_PROFILES` (e.g. "market_analyst=fast,legal_advisor=fast"). Nodes
+without a route use `LLM_DEFAULT_PROFILE`. Completions are labelled with
+their profile in `/metrics`, and the profile and model each node used are
+recorded on the run's node checkpoints, so the routing can be tuned from
+measured latency and token usage.
+"""
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    name: str
+    model: str
+    temperature: float
+    max_tokens: int
+    # Seconds before one completion request times out
+    timeout: float
+
+
+def get_profile(node: str = None) -> ModelProfile:
+    """The model profile a node is routed to (the default profile for None)."""
+    name = settings.LLM_NODE_PROFILES.get(node, settings.LLM_DEFAULT_PROFILE)
+    try:
+        options = settings.LLM_MODEL_PROFILES[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Node {node!r} is routed to unknown model profile {name!r}; "
+            f"LLM_MODEL_PROFILES defines {', '.join(settings.LLM_MODEL_PROFILES)}"
+        ) from None
+    return ModelProfile(
+        name=name,
+        model=options['model'],
+        temperature=options.get('temperature', 0.7),
+        max_tokens=options.get('max_tokens', 4096),
+        timeout=options.get('timeout', settings.LLM_REQUEST_TIMEOUT),
+    )
+
+
+def routing_table(nodes) -> dict:
+    """
+    Profile of each of `nodes`, by node name.
+
+    Raises ImproperlyConfigured for a route to an unknown profile, and for a
+    route naming a node that is not in `nodes` (most likely a typo).
+    """
+    unknown = set(settings.LLM_NODE_PROFILES) - set(nodes)
+    if unknown:
+        raise ImproperlyConfigured(
+            f"LLM_NODE_PROFILES routes unknown nodes {', '.join(sorted(unknown))}; "
+            f"nodes are {', '.join(nodes)}"
+        )
+    return {node: get_profile(node) for node in nodes}
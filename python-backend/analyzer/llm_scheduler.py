@@ -0,0 +1,399 @@
+"""
+Rate-limit-aware admission for LLM calls.
+
+Groq limits each model by requests per minute (RPM) and tokens per minute
+(TPM). Firing calls as soon as a node is ready trips 429s under load, and one
+failed call fails the whole analysis. Instead, every completion asks the
+scheduler for admission first:
+
+- Each model has an RPM and a TPM token bucket, refilled continuously.
+- A call's token cost is estimated up front as its prompt tokens plus
+  `max_tokens`. Once the response reports its real usage, the difference is
+  settled with the bucket. A call that fails gives its tokens back, and one
+  cancelled before it was sent (or while in flight) gives back its request too.
+- A hedged duplicate of a call joins the call's ticket instead of reserving
+  its own. Whichever of the two answers settles the ticket once.
+- Calls that do not fit wait in a queue instead of being sent.
+- Waiting calls are grouped by analysis and admitted round-robin across
+  analyses, so one large analysis (or batch) cannot starve the others.
+  Within an analysis, calls are admitted first come, first served.
+
+Limits are per worker process, so divide your plan's limits across workers.
+With both limits at 0 the scheduler admits everything immediately.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from . import metrics
+from .context_budget import count_tokens
+from .llm_resilience import HedgeCancelled
+
+
+class TokenBucket:
+    """Continuously refilled bucket holding at most one minute's allowance."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 if it can be taken now)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(missing / self.rate, 0.0)
+
+    def take(self, amount: float) -> None:
+        # May go negative when a call used more than was reserved; later calls then wait longer
+        self.tokens -= amount
+
+    def give(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class Ticket:
+    """One call waiting for (or holding) admission."""
+
+    __slots__ = ('model', 'cost', 'tenant', 'enqueued', 'granted', 'settled', 'holders', '_event', '_future', '_loop')
+
+    def __init__(self, model: str, cost: int, tenant):
+        self.model = model
+        self.cost = cost
+        self.tenant = tenant
+        self.enqueued = time.perf_counter()
+        self.granted = False
+        # Set once the reservation was settled or returned, so it is never given back twice
+        self.settled = False
+        # Attempts running on the ticket: the call, plus its hedge while one runs
+        self.holders = 1
+        self._event = None
+        self._future = None
+        self._loop = None
+
+    def _wake(self) -> None:
+        if self._future is not None:
+            self._loop.call_soon_threadsafe(_resolve, self._future)
+        elif self._event is not None:
+            self._event.set()
+
+
+def _resolve(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_current_tenant = ContextVar('llm_scheduler_tenant', default=None)
+
+
+@contextmanager
+def tenant_scope(tenant):
+    """Attribute the LLM calls made in this context to `tenant` (one analysis run) for fair sharing."""
+    token = _current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+class LLMScheduler:
+    """Admits LLM calls within per-model RPM/TPM budgets, sharing them fairly across analyses."""
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.enabled = bool(requests_per_minute or tokens_per_minute)
+
+        self._buckets = {}
+        # tenant -> deque of waiting tickets; order is the round-robin order
+        self._queues = OrderedDict()
+        self._condition = threading.Condition()
+        self._dispatcher = None
+        self._anonymous = itertools.count()
+
+        # Metrics (guarded by _condition)
+        self.admitted = 0
+        self.queued = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _model_buckets(self, model: str) -> tuple:
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            buckets = self._buckets[model] = (
+                TokenBucket(self.requests_per_minute) if self.requests_per_minute else None,
+                TokenBucket(self.tokens_per_minute) if self.tokens_per_minute else None,
+            )
+        return buckets
+
+    def _delay(self, ticket: Ticket, now: float) -> float:
+        requests, tokens = self._model_buckets(ticket.model)
+        return max(
+            requests.delay(1, now) if requests else 0.0,
+            tokens.delay(ticket.cost, now) if tokens else 0.0,
+        )
+
+    def _grant(self, ticket: Ticket) -> None:
+        requests, tokens = self._model_buckets(ticket.model)
+        if requests:
+            requests.take(1)
+        if tokens:
+            tokens.take(min(ticket.cost, tokens.capacity))
+        ticket.granted = True
+
+        waited = time.perf_counter() - ticket.enqueued
+        self.admitted += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        metrics.LLM_RATE_LIMIT_WAIT.observe(waited, ticket.model)
+
+    def _queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _enqueue(self, ticket: Ticket) -> bool:
+        """Admit the ticket now if nobody is waiting and it fits; otherwise queue it. Returns True if admitted."""
+        with self._condition:
+            if not self._queues and self._delay(ticket, time.monotonic()) == 0:
+                self._grant(ticket)
+                return True
+
+            if ticket.tenant is None:
+                ticket.tenant = ('call', next(self._anonymous))
+            self._queues.setdefault(ticket.tenant, deque()).append(ticket)
+            self.queued += 1
+            metrics.LLM_RATE_LIMIT_QUEUE_DEPTH.set(self._queue_depth())
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name='llm-scheduler', daemon=True)
+                self._dispatcher.start()
+            self._condition.notify()
+            return False
+
+    def _withdraw(self, ticket: Ticket) -> None:
+        """Take a ticket whose caller gave up out of the queue, or return its reservation."""
+        with self._condition:
+            if ticket.granted:
+                self._settle_locked(ticket, 0, refund_request=True)
+                return
+            queue = self._queues.get(ticket.tenant)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[ticket.tenant]
+                metrics.LLM_RATE_LIMIT_QUEUE_DEPTH.set(self._queue_depth())
+                self._condition.notify()
+
+    def _dispatch(self) -> None:
+        """Admit queued tickets round-robin across tenants as the buckets refill."""
+        with self._condition:
+            while True:
+                if not self._queues:
+                    self._condition.wait()
+                    continue
+
+                now = time.monotonic()
+                wait = None
+                blocked_models = set()
+                for tenant, queue in list(self._queues.items()):
+                    ticket = queue[0]
+                    # A model whose next-in-turn call is waiting admits nobody
+                    # else ahead of it, so large calls are not starved
+                    if ticket.model in blocked_models:
+                        continue
+                    delay = self._delay(ticket, now)
+                    if delay > 0:
+                        blocked_models.add(ticket.model)
+                        wait = delay if wait is None else min(wait, delay)
+                        continue
+
+                    queue.popleft()
+                    # The tenant just served goes to the back of the round
+                    self._queues.move_to_end(tenant)
+                    if not queue:
+                        del self._queues[tenant]
+                    self._grant(ticket)
+                    ticket._wake()
+                    metrics.LLM_RATE_LIMIT_QUEUE_DEPTH.set(self._queue_depth())
+                    wait = 0
+                    break
+
+                if wait:
+                    self._condition.wait(timeout=wait)
+
+    def estimate_cost(self, system_prompt: str, user_content: str, max_tokens: int) -> int:
+        """Tokens to reserve for a call: the whole prompt plus the most it may generate."""
+        if not self.enabled:
+            return 0
+        return count_tokens(system_prompt) + count_tokens(user_content) + (max_tokens or 0)
+
+    def _ticket(self, model: str, cost: int) -> Ticket:
+        return Ticket(model, cost, _current_tenant.get())
+
+    @contextmanager
+    def admit(self, model: str, cost: int):
+        """
+        Wait (blocking) until a call of `cost` tokens to `model` fits the budgets; yields its ticket.
+
+        If the block raises without settling the ticket, the reservation is
+        settled as 0 tokens used (the request still counts), or returned whole
+        for HedgeCancelled.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        ticket = self._ticket(model, cost)
+        ticket._event = threading.Event()
+        if not self._enqueue(ticket):
+            ticket._event.wait()
+        with self._holding(ticket):
+            yield ticket
+
+    @asynccontextmanager
+    async def aadmit(self, model: str, cost: int):
+        """Async version of `admit`; waits without blocking the event loop."""
+        if not self.enabled:
+            yield None
+            return
+
+        ticket = self._ticket(model, cost)
+        loop = asyncio.get_running_loop()
+        ticket._loop = loop
+        ticket._future = loop.create_future()
+        if not self._enqueue(ticket):
+            try:
+                await ticket._future
+            except asyncio.CancelledError:
+                self._withdraw(ticket)
+                raise
+        with self._holding(ticket):
+            yield ticket
+
+    @contextmanager
+    def join(self, ticket):
+        """
+        Run a hedged duplicate of an admitted call on that call's ticket, reserving nothing more.
+
+        The reservation is only given back if the call and its hedge both end
+        without settling it.
+        """
+        if ticket is None:
+            yield None
+            return
+
+        with self._condition:
+            ticket.holders += 1
+        with self._holding(ticket):
+            yield ticket
+
+    @asynccontextmanager
+    async def ajoin(self, ticket):
+        """Async version of `join`."""
+        with self.join(ticket) as joined:
+            yield joined
+
+    @contextmanager
+    def _holding(self, ticket: Ticket):
+        try:
+            yield
+        except BaseException as e:
+            self._leave(ticket, e)
+            raise
+        self._leave(ticket, None)
+
+    def _leave(self, ticket: Ticket, error) -> None:
+        """An attempt on the ticket ended; the last one to end returns an unsettled reservation if it failed."""
+        with self._condition:
+            ticket.holders -= 1
+            if ticket.holders or error is None:
+                return
+            cancelled = isinstance(error, (HedgeCancelled, asyncio.CancelledError))
+            self._settle_locked(ticket, 0, refund_request=cancelled)
+
+    def _settle_locked(self, ticket: Ticket, used_tokens: int, refund_request: bool = False) -> None:
+        if ticket.settled:
+            return
+        ticket.settled = True
+        requests, tokens = self._model_buckets(ticket.model)
+        if tokens:
+            tokens.give(min(ticket.cost, tokens.capacity) - used_tokens)
+        if requests and refund_request:
+            requests.give(1)
+        self._condition.notify()
+
+    def settle(self, ticket, used_tokens: int) -> None:
+        """Replace a ticket's estimated cost with the tokens the call actually used."""
+        if ticket is None or not used_tokens:
+            return
+        with self._condition:
+            self._settle_locked(ticket, used_tokens)
+
+    def release(self, ticket) -> None:
+        """Return the whole reservation of a call that was never sent."""
+        if ticket is not None:
+            self._withdraw(ticket)
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth, wait times and the remaining budgets per model."""
+        with self._condition:
+            now = time.monotonic()
+            budgets = {}
+            for model, (requests, tokens) in self._buckets.items():
+                if requests:
+                    requests._refill(now)
+                if tokens:
+                    tokens._refill(now)
+                budgets[model] = {
+                    "requests_available": round(requests.tokens, 1) if requests else None,
+                    "tokens_available": round(tokens.tokens) if tokens else None,
+                }
+            return {
+                "enabled": self.enabled,
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "queue_depth": self._queue_depth(),
+                "waiting_analyses": len(self._queues),
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "wait_seconds_total": round(self.wait_seconds_total, 3),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.admitted, 3) if self.admitted else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 3),
+                "budgets": budgets,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler, creating it from settings on first use."""
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(
+                requests_per_minute=settings.LLM_RATE_LIMIT_RPM,
+                tokens_per_minute=settings.LLM_RATE_LIMIT_TPM,
+            )
+    return _scheduler
+
+
+def reset_llm_scheduler() -> None:
+    """Forget the process-wide scheduler so it is rebuilt from settings."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
@@ -0,0 +1,89 @@
+"""
+Benchmark: prompt tokens sent to the review agents with and without context budgets.
+
+Builds specialist reports of a given size, then measures the strategist and
+critic contexts unbudgeted (the raw concatenation) and with the budgets from
+`CONTEXT_TOKEN_BUDGETS`, along with the time spent compacting.
+
+Usage:
+    python manage.py bench_context --section-tokens 3000
+"""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from analyzer import context_budget
+from analyzer.context_budget import count_tokens
+from analyzer.langgraph_workflow import (
+    create_critic_context,
+    create_initial_state,
+    create_synthesis_context,
+)
+
+
+SPECIALIST_KEYS = (
+    'market_analysis', 'cost_prediction', 'business_strategy',
+    'monetization', 'legal_considerations', 'tech_stack',
+)
+
+WORDS = (
+    "market customers growth revenue pricing competitors segment channel retention "
+    "platform compliance regulation partners acquisition churn margin subscription "
+    "enterprise onboarding infrastructure scalability security funding runway hiring"
+).split()
+
+
+def make_report(rng: random.Random, tokens: int) -> str:
+    """A report shaped like the agents' output: numbered headings, bullets and prose with figures."""
+    lines = []
+    section = 0
+    while count_tokens("\n".join(lines)) < tokens:
+        section += 1
+        lines.append(f"## {section}. {rng.choice(WORDS).title()} {rng.choice(WORDS).title()}")
+        for _ in range(rng.randint(4, 8)):
+            words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 30)))
+            if rng.random() < 0.4:
+                words += f" reaching ${rng.randint(1, 900)}K by year {rng.randint(1, 5)} ({rng.randint(2, 60)}% share)"
+            prefix = "- " if rng.random() < 0.6 else ""
+            lines.append(f"{prefix}{words.capitalize()}. {rng.choice(WORDS).capitalize()} matters here.")
+    return "\n".join(lines)
+
+
+class Command(BaseCommand):
+    help = "Compare review-agent prompt sizes with and without per-node context budgets."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--section-tokens', type=int, default=3000, help="Approximate tokens per specialist report")
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        state = create_initial_state("A marketplace connecting local farmers with restaurants", "US restaurants")
+        for key in SPECIALIST_KEYS:
+            state[key] = make_report(rng, options['section_tokens'])
+        state['strategist_synthesis'] = make_report(rng, options['section_tokens'])
+
+        for name, builder in (("strategist_synthesis", create_synthesis_context), ("critic_review", create_critic_context)):
+            with override_settings(CONTEXT_TOKEN_BUDGETS={}):
+                raw_tokens = count_tokens(builder(state))
+
+            count_tokens.cache_clear()
+            started = time.perf_counter()
+            budgeted = builder(state)
+            cold_ms = (time.perf_counter() - started) * 1e3
+
+            started = time.perf_counter()
+            builder(state)
+            warm_ms = (time.perf_counter() - started) * 1e3
+
+            budgeted_tokens = count_tokens(budgeted)
+            self.stdout.write(f"{name}:")
+            self.stdout.write(f"  budget:           {context_budget.get_context_budget(name)} tokens")
+            self.stdout.write(f"  unbudgeted:       {raw_tokens} tokens")
+            self.stdout.write(f"  budgeted:         {budgeted_tokens} tokens")
+            self.stdout.write(f"  compaction time:  {cold_ms:.1f} ms cold, {warm_ms:.1f} ms warm")
+            if raw_tokens:
+                self.stdout.write(self.style.SUCCESS(f"  prompt reduction: {1 - budgeted_tokens / raw_tokens:.0%}"))
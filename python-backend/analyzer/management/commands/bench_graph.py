@@ -0,0 +1,45 @@
+"""
+Microbenchmark: per-request graph compilation vs. the cached compiled graph.
+
+Usage:
+    python manage.py bench_graph --iterations 200
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from analyzer.langgraph_workflow import (
+    build_analysis_graph,
+    get_compiled_graph,
+    rebuild_compiled_graphs,
+)
+
+
+class Command(BaseCommand):
+    help = "Compare the cost of compiling the analysis graph per request with reusing the cached graph."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        compile_seconds = self._time(build_analysis_graph, iterations)
+
+        rebuild_compiled_graphs()
+        get_compiled_graph()  # warm the registry, as the first request would
+        cached_seconds = self._time(get_compiled_graph, iterations)
+
+        self.stdout.write(f"Iterations:            {iterations}")
+        self.stdout.write(f"Compile per request:   {compile_seconds / iterations * 1e3:.3f} ms/request")
+        self.stdout.write(f"Cached compiled graph: {cached_seconds / iterations * 1e6:.3f} µs/request")
+        if cached_seconds:
+            self.stdout.write(self.style.SUCCESS(f"Speedup:               {compile_seconds / cached_seconds:,.0f}x"))
+
+    @staticmethod
+    def _time(func, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return time.perf_counter() - started
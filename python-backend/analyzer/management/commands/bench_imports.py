@@ -0,0 +1,106 @@
+"""
+Measure what a web process imports before it runs any analysis.
+
+Starts fresh interpreters with `python -X importtime`, sets Django up and
+imports the URLconf (so every view module), then reports the total import
+time, peak RSS and the slowest top-level packages. The same is measured with
+the LangGraph workflow imported as well, which is what every process paid
+before the workflow was imported lazily.
+
+With `--check` the command fails if the web process loads any of the LLM
+stack (HEAVY_PACKAGES) or takes longer than `--budget-ms` to import, so CI
+can keep the lazy imports from regressing.
+
+Usage:
+    python manage.py bench_imports
+    python manage.py bench_imports --check --budget-ms 1500
+"""
+
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Packages only the analysis workflow needs
+HEAVY_PACKAGES = ('langchain', 'langchain_core', 'langchain_groq', 'langgraph', 'groq', 'tiktoken')
+
+SCRIPT = """
+import os, resource, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'startup_analyzer.settings')
+import django
+django.setup()
+import analyzer.urls
+{extra}
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10)
+"""
+
+CASES = (
+    ("web process (lazy)", ""),
+    ("with the workflow", "import analyzer.langgraph_workflow"),
+)
+
+
+def measure(extra: str) -> dict:
+    """Import timings of one fresh interpreter: total ms, peak RSS in MB and ms spent in each top-level package."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SCRIPT.format(extra=extra)],
+        cwd=settings.BASE_DIR, capture_output=True, text=True,
+    )
+    if process.returncode != 0:
+        raise CommandError(f"Import failed:\n{process.stderr[-2000:]}")
+
+    total_us, packages = 0, {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        # Own time of every module, summed per top-level package (`langchain_core.messages` -> `langchain_core`)
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us) / 1000
+    return {
+        "total_ms": total_us / 1000,
+        "rss_mb": float(process.stdout.strip().splitlines()[-1]),
+        "packages": packages,
+    }
+
+
+class Command(BaseCommand):
+    help = "Measure import time and memory of a web process, with and without the LLM stack."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help="Interpreters started per case (median is reported)")
+        parser.add_argument('--top', type=int, default=8, help="Slowest top-level packages to list")
+        parser.add_argument('--check', action='store_true', help="Fail if the web process loads the LLM stack")
+        parser.add_argument('--budget-ms', type=float, default=0, help="With --check, also fail above this import time")
+
+    def handle(self, *args, **options):
+        results = {}
+        for label, extra in CASES:
+            runs = [measure(extra) for _ in range(options['repeat'])]
+            results[label] = {
+                "total_ms": statistics.median(run["total_ms"] for run in runs),
+                "rss_mb": statistics.median(run["rss_mb"] for run in runs),
+                "packages": runs[-1]["packages"],
+            }
+
+        self.stdout.write(f"{'Case':<24}{'import ms':>12}{'peak RSS MB':>14}")
+        for label, result in results.items():
+            self.stdout.write(f"{label:<24}{result['total_ms']:>12.1f}{result['rss_mb']:>14.1f}")
+
+        web = results[CASES[0][0]]
+        self.stdout.write("\nSlowest packages imported by the web process:")
+        for package, ms in sorted(web["packages"].items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"  {package:<28}{ms:>10.1f} ms")
+
+        loaded = sorted(set(web["packages"]) & set(HEAVY_PACKAGES))
+        if options['check']:
+            if loaded:
+                raise CommandError(f"The web process imports the LLM stack: {', '.join(loaded)}")
+            if options['budget_ms'] and web["total_ms"] > options['budget_ms']:
+                raise CommandError(f"Import time {web['total_ms']:.0f} ms is over the {options['budget_ms']:.0f} ms budget")
+            self.stdout.write(self.style.SUCCESS("OK: the web process does not load the LLM stack"))
@@ -0,0 +1,404 @@
+"""
+Offline load test of the analysis pipeline with a deterministic fake LLM.
+
+`get_llm()` / `get_async_llm()` are swapped for `FakeChatModel`, so no API
+calls are made. Every model profile (see analyzer.llm_routing) gets its own
+fake model, and `--profile-latency` gives each its own latency. That way a
+routing of nodes to profiles (LLM_NODE_PROFILES) can be compared offline. Each target is driven by 1..N concurrent clients in each
+execution mode:
+
+- `sync`: blocking calls, graph nodes run one at a time (the original behaviour)
+- `threaded`: blocking calls, specialists fanned out over threads; for
+  `/analyze` the request only queues a background job and the client polls
+  `/analyze/<id>` until it completes
+- `async`: every client is a coroutine on one event loop (`arun_analysis`,
+  or the ASGI app)
+
+Targets are `workflow` (`run_analysis` / `arun_analysis`), `analyze`
+(`/analyze`, `/analyze/wait`) and `projects` (`GET /projects/`, which has no
+threaded mode). Projects created by the run are deleted afterwards.
+
+Reports throughput, p50/p95/p99 latency and peak RSS per run, and writes
+them as JSON. Pass a previous report as `--baseline` to print the change.
+
+Usage:
+    python manage.py bench_load --concurrency 1,4,16 --requests 32 --output bench.json
+    python manage.py bench_load --targets workflow --modes async --latency-ms 800 --baseline bench.json
+    LLM_NODE_PROFILES=market_analyst=fast,legal_advisor=fast \
+        python manage.py bench_load --targets workflow --profile-latency fast=150,large=800
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import platform
+import resource
+import statistics
+import threading
+import time
+import uuid
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import Client
+from django.test.utils import override_settings
+
+from analyzer import langgraph_workflow
+from analyzer.fake_llm import LATENCY_DISTRIBUTIONS, FakeChatModel
+from analyzer.llm_cache import reset_response_cache
+from analyzer.llm_pool import reset_llm_pool
+from analyzer.llm_resilience import reset_resilient_caller
+from analyzer.llm_routing import get_profile
+from analyzer.models import Project
+
+
+TARGETS = ('workflow', 'analyze', 'projects')
+MODES = ('sync', 'threaded', 'async')
+IDEA_PREFIX = "[bench] "
+
+
+def percentile(values: list, p: float) -> float:
+    """Linear-interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # No procfs: fall back to the lifetime peak (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if platform.system() == 'Darwin' else peak * 1024
+
+
+class RSSSampler:
+    """Samples RSS on a background thread and keeps the peak."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def run_threads(concurrency: int, total: int, call) -> list:
+    """Run `call(i)` for i in range(total) from `concurrency` client threads; return (latency, ok) pairs."""
+    counter = itertools.count()
+    samples = []
+    lock = threading.Lock()
+
+    def client():
+        try:
+            while (i := next(counter)) < total:
+                started = time.perf_counter()
+                try:
+                    ok = call(i)
+                except Exception:
+                    ok = False
+                with lock:
+                    samples.append((time.perf_counter() - started, ok))
+        finally:
+            close_old_connections()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+async def run_tasks(concurrency: int, total: int, acall) -> list:
+    """Async version of `run_threads`: `concurrency` client coroutines on the running loop."""
+    counter = itertools.count()
+    samples = []
+
+    async def client():
+        while (i := next(counter)) < total:
+            started = time.perf_counter()
+            try:
+                ok = await acall(i)
+            except Exception:
+                ok = False
+            samples.append((time.perf_counter() - started, ok))
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return samples
+
+
+class Command(BaseCommand):
+    help = "Load-test the workflow and endpoints offline with a fake LLM, in sync, threaded and async modes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--targets', default=','.join(TARGETS), help=f"Comma-separated subset of {TARGETS}")
+        parser.add_argument('--modes', default=','.join(MODES), help=f"Comma-separated subset of {MODES}")
+        parser.add_argument('--concurrency', default='1,4', help="Comma-separated client counts, e.g. 1,4,16")
+        parser.add_argument('--requests', type=int, default=8, help="Requests per target/mode/concurrency run")
+        parser.add_argument('--distribution', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+        parser.add_argument('--latency-ms', type=float, default=100.0, help="Median fake completion latency")
+        parser.add_argument(
+            '--profile-latency', default='',
+            help="Median fake latency per model profile, e.g. fast=150,large=800 (others use --latency-ms)",
+        )
+        parser.add_argument('--jitter', type=float, default=0.25, help="Spread of the latency distribution")
+        parser.add_argument('--per-token-ms', type=float, default=0.0, help="Extra fake latency per output token")
+        parser.add_argument('--output-tokens', type=int, default=400, help="Tokens per fake completion")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="Share of fake completions failing with a 503")
+        parser.add_argument('--straggler-rate', type=float, default=0.0, help="Share of fake completions that straggle")
+        parser.add_argument('--straggler-ms', type=float, default=0.0, help="Extra latency of a straggling completion")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--seed-projects', type=int, default=200, help="Completed projects listed by the projects target")
+        parser.add_argument('--output', help="Write the report as JSON to this path")
+        parser.add_argument('--baseline', help="Previous JSON report to compare against")
+
+    def handle(self, *args, **options):
+        targets = self._choices(options['targets'], TARGETS)
+        modes = self._choices(options['modes'], MODES)
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        profile_latency = self._profile_latency(options['profile_latency'])
+        models = {
+            name: self.fake_model(options, profile['model'], profile_latency.get(name, options['latency_ms']))
+            for name, profile in settings.LLM_MODEL_PROFILES.items()
+        }
+        model = models[settings.LLM_DEFAULT_PROFILE]
+
+        def fake_llm(profile=None):
+            return models[(profile or get_profile()).name]
+
+        self.requests = options['requests']
+        self.run_id = uuid.uuid4().hex[:8]
+
+        results = []
+        # Every request must reach the (fake) model, so the response cache and
+        # near-duplicate detection (the bench ideas differ only in a counter) are off
+        with override_settings(
+            ALLOWED_HOSTS=['*'],
+            LLM_CACHE_BACKEND='none',
+            SIMILAR_IDEA_THRESHOLD=0,
+            GROQ_API_KEY=settings.GROQ_API_KEY or 'offline-benchmark',
+        ), mock.patch.object(langgraph_workflow, 'get_llm', fake_llm), \
+                mock.patch.object(langgraph_workflow, 'get_async_llm', fake_llm):
+            reset_response_cache()
+            reset_llm_pool()
+            reset_resilient_caller()
+            try:
+                if 'projects' in targets:
+                    self.seed_projects(options['seed_projects'])
+                for target in targets:
+                    for mode in modes:
+                        if target == 'projects' and mode == 'threaded':
+                            continue
+                        for concurrency in levels:
+                            results.append(self.run(target, mode, concurrency))
+            finally:
+                Project.objects.filter(startup_idea__startswith=IDEA_PREFIX).delete()
+                reset_response_cache()
+                reset_llm_pool()
+                reset_resilient_caller()
+
+        report = {
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "python": platform.python_version(),
+            "config": {
+                "requests": self.requests,
+                "fake_llm": model.model_dump(
+                    include={
+                        'distribution', 'latency_ms', 'jitter', 'per_token_ms', 'output_tokens', 'seed',
+                        'error_rate', 'straggler_rate', 'straggler_ms',
+                    },
+                ),
+                "profile_latency_ms": {name: fake.latency_ms for name, fake in models.items()},
+                "LLM_NODE_PROFILES": settings.LLM_NODE_PROFILES,
+                "ANALYSIS_MAX_CONCURRENCY": settings.ANALYSIS_MAX_CONCURRENCY,
+                "ANALYSIS_JOB_WORKERS": settings.ANALYSIS_JOB_WORKERS,
+                "LLM_MAX_IN_FLIGHT": settings.LLM_MAX_IN_FLIGHT,
+                "LLM_MAX_RETRIES": settings.LLM_MAX_RETRIES,
+                "LLM_HEDGE_PERCENTILE": settings.LLM_HEDGE_PERCENTILE,
+            },
+            "results": results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        if options['baseline']:
+            self.compare(results, options['baseline'])
+
+    @staticmethod
+    def fake_model(options: dict, model_name: str, latency_ms: float) -> FakeChatModel:
+        return FakeChatModel(
+            model_name=model_name,
+            distribution=options['distribution'],
+            latency_ms=latency_ms,
+            jitter=options['jitter'],
+            per_token_ms=options['per_token_ms'],
+            output_tokens=options['output_tokens'],
+            seed=options['seed'],
+            error_rate=options['error_rate'],
+            straggler_rate=options['straggler_rate'],
+            straggler_ms=options['straggler_ms'],
+        )
+
+    @staticmethod
+    def _profile_latency(value: str) -> dict:
+        """Parse `--profile-latency` ("fast=150,large=800") into {profile: ms}."""
+        try:
+            latency = {
+                name.strip(): float(ms)
+                for name, ms in (item.split('=', 1) for item in value.split(',') if item.strip())
+            }
+        except ValueError:
+            raise CommandError("--profile-latency takes profile=milliseconds pairs, e.g. fast=150,large=800")
+        unknown = set(latency) - set(settings.LLM_MODEL_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown model profile(s) {sorted(unknown)}; use any of {tuple(settings.LLM_MODEL_PROFILES)}.")
+        return latency
+
+    @staticmethod
+    def _choices(value: str, allowed: tuple) -> list:
+        chosen = [choice.strip() for choice in value.split(',') if choice.strip()]
+        unknown = set(chosen) - set(allowed)
+        if unknown:
+            raise CommandError(f"Unknown choice(s) {sorted(unknown)}; use any of {allowed}.")
+        return chosen
+
+    def idea(self, i: int) -> str:
+        # Distinct ideas so no run can reuse another's stored analysis by exact match;
+        # they are near-duplicates of each other, hence SIMILAR_IDEA_THRESHOLD=0 above
+        return f"{IDEA_PREFIX}{self.run_id}-{i}: a marketplace connecting local farmers with restaurants"
+
+    def seed_projects(self, count: int) -> None:
+        Project.objects.bulk_create(
+            Project(startup_idea=self.idea(f"seed-{i}"), status='completed', market_analysis="1. MARKET\n" * 200)
+            for i in range(count)
+        )
+
+    def run(self, target: str, mode: str, concurrency: int) -> dict:
+        # `sync` runs the graph's nodes one at a time, as before the fan-out
+        max_concurrency = 1 if mode == 'sync' else settings.ANALYSIS_MAX_CONCURRENCY
+        self.run_id = uuid.uuid4().hex[:8]
+
+        with override_settings(ANALYSIS_MAX_CONCURRENCY=max_concurrency), RSSSampler() as rss:
+            started = time.perf_counter()
+            if mode == 'async':
+                samples = asyncio.run(run_tasks(concurrency, self.requests, self.async_call(target)))
+            else:
+                samples = run_threads(concurrency, self.requests, self.sync_call(target, mode))
+            elapsed = time.perf_counter() - started
+
+        latencies = [latency for latency, ok in samples if ok]
+        result = {
+            "target": target,
+            "mode": mode,
+            "concurrency": concurrency,
+            "requests": len(samples),
+            "errors": sum(1 for _, ok in samples if not ok),
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else None,
+            "p50_ms": round(percentile(latencies, 50) * 1e3, 1) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95) * 1e3, 1) if latencies else None,
+            "p99_ms": round(percentile(latencies, 99) * 1e3, 1) if latencies else None,
+            "mean_ms": round(statistics.fmean(latencies) * 1e3, 1) if latencies else None,
+            "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+        }
+        self.stdout.write(
+            f"{target:<9} {mode:<9} c={concurrency:<3} {result['throughput_rps']:>8} req/s  "
+            f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  "
+            f"errors {result['errors']}  peak RSS {result['peak_rss_mb']} MB"
+        )
+        return result
+
+    def sync_call(self, target: str, mode: str):
+        if target == 'workflow':
+            return lambda i: bool(langgraph_workflow.run_analysis(self.idea(i)))
+
+        if target == 'projects':
+            def list_projects(i):
+                return Client().get('/projects/').status_code == 200
+            return list_projects
+
+        if mode == 'sync':
+            def analyze_inline(i):
+                response = Client().post(
+                    '/analyze', {"startupIdea": self.idea(i), "wait": True}, content_type='application/json',
+                )
+                return response.status_code == 200
+            return analyze_inline
+
+        def analyze_queued(i):
+            client = Client()
+            response = client.post('/analyze', {"startupIdea": self.idea(i)}, content_type='application/json')
+            if response.status_code != 202:
+                return False
+            status_url = response.json()['statusUrl']
+            while True:
+                status = client.get(status_url).json()['status']
+                if status in ('completed', 'failed'):
+                    return status == 'completed'
+                time.sleep(0.01)
+        return analyze_queued
+
+    def async_call(self, target: str):
+        if target == 'workflow':
+            async def analyze(i):
+                return bool(await langgraph_workflow.arun_analysis(self.idea(i)))
+            return analyze
+
+        import httpx
+        from django.core.asgi import get_asgi_application
+
+        app = get_asgi_application()
+
+        async def request(method, url, **kwargs):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                return await client.request(method, url, timeout=None, **kwargs)
+
+        if target == 'projects':
+            async def list_projects(i):
+                return (await request('GET', '/projects/')).status_code == 200
+            return list_projects
+
+        async def analyze_wait(i):
+            response = await request('POST', '/analyze/wait', json={"startupIdea": self.idea(i)})
+            return response.status_code == 200
+        return analyze_wait
+
+    def compare(self, results: list, baseline_path: str) -> None:
+        with open(baseline_path) as baseline_file:
+            baseline = {
+                (run['target'], run['mode'], run['concurrency']): run
+                for run in json.load(baseline_file)['results']
+            }
+
+        self.stdout.write(f"\nChange vs {baseline_path}:")
+        for run in results:
+            before = baseline.get((run['target'], run['mode'], run['concurrency']))
+            if before is None:
+                continue
+            changes = []
+            for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'peak_rss_mb'):
+                if before.get(key) and run.get(key) is not None:
+                    changes.append(f"{key} {(run[key] - before[key]) / before[key]:+.1%}")
+            self.stdout.write(f"{run['target']:<9} {run['mode']:<9} c={run['concurrency']:<3} " + "  ".join(changes))
@@ -0,0 +1,114 @@
+"""
+Benchmark the /projects endpoints against a large seeded table.
+
+Seeds projects with realistic multi-kilobyte analysis sections inside a
+transaction that is rolled back afterwards, so the database is left as it was.
+
+The deep-page case reads page 21 of 100 rows, or the last page when
+`--count` seeds fewer than 2,100 projects.
+
+Usage:
+    python manage.py bench_projects --count 10000
+"""
+
+import math
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from analyzer.models import Project
+from analyzer.serializers import ProjectSerializer
+from analyzer.streaming import json_content, response_json
+
+
+SECTION_TEXT = (
+    "1. MARKET OVERVIEW\n"
+    "   - Total addressable market estimates, growth rates and segment sizes.\n"
+) * 60  # ~8 KB, in line with a typical agent response
+
+
+DEEP_PAGE = 21
+DEEP_PAGE_SIZE = 100
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare the unpaginated full-row project listing with the paginated, projected endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options['count'] < 1:
+            raise CommandError("--count must be at least 1")
+        try:
+            with transaction.atomic():
+                self.seed(options['count'])
+                self.run(options['count'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        started = time.perf_counter()
+        Project.objects.bulk_create(
+            (
+                Project(
+                    startup_idea=f"Idea #{i}: a marketplace connecting local farmers with urban consumers. " * 3,
+                    target_market="Urban consumers in tier-1 cities",
+                    status='completed',
+                    **{field: SECTION_TEXT for field in Project.ANALYSIS_FIELDS},
+                )
+                for i in range(count)
+            ),
+            batch_size=500,
+        )
+        self.stdout.write(f"Seeded {count} projects in {time.perf_counter() - started:.1f}s\n")
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def run(self, count, repeat):
+        client = Client()
+        project_id = Project.objects.values_list('id', flat=True).first()
+
+        def full_listing():
+            # What GET /projects used to do: every row, every column, one blob
+            return len(str(ProjectSerializer(Project.objects.all(), many=True).data))
+
+        def first_page():
+            return len(json_content(client.get('/projects/')))
+
+        # Follow `next` links; there is no link past the last page
+        deep_page = min(DEEP_PAGE, math.ceil(count / DEEP_PAGE_SIZE))
+        deep_page_url = f'/projects/?page_size={DEEP_PAGE_SIZE}'
+        for _ in range(deep_page - 1):
+            deep_page_url = response_json(client.get(deep_page_url))['next']
+
+        def read_deep_page():
+            return len(json_content(client.get(deep_page_url)))
+
+        def detail():
+            return len(client.get(f'/projects/{project_id}/').content)
+
+        def detail_projected():
+            return len(client.get(f'/projects/{project_id}/?fields=id,status,market_analysis').content)
+
+        self.stdout.write(f"{'Case':<46}{'ms/request':>12}{'bytes':>14}")
+        for label, func, runs in [
+            ("Full listing (old /projects)", full_listing, 1),
+            ("Paginated list, first page", first_page, repeat),
+            (f"Paginated list, page {deep_page} of {DEEP_PAGE_SIZE} rows", read_deep_page, repeat),
+            ("Detail, all fields", detail, repeat),
+            ("Detail, ?fields=id,status,market_analysis", detail_projected, repeat),
+        ]:
+            started = time.perf_counter()
+            for _ in range(runs):
+                size = func()
+            elapsed = (time.perf_counter() - started) / runs
+            self.stdout.write(f"{label:<46}{elapsed * 1e3:>12.1f}{size:>14,}")
@@ -0,0 +1,126 @@
+"""
+Compare DRF's JSONRenderer with the streaming renderer on a large export.
+
+Seeds projects with multi-kilobyte analysis sections inside a transaction that
+is rolled back afterwards, then renders all of them three ways:
+
+- JSONRenderer: `ProjectSerializer(many=True).data` rendered to one byte
+  string, as a stock DRF list endpoint would. Nothing can be sent until it
+  is done, so its time to first byte is its total time.
+- Streaming: what `GET /projects/export` sends, read chunk by chunk.
+- Streaming (ASGI): the same export served the way the ASGI app serves it,
+  where each chunk is fetched from an async iterator with `sync_to_async`.
+
+Peak memory is measured twice: the Python heap peak with tracemalloc, and the
+growth of the process's peak RSS. Peak RSS never goes down, so the streaming
+cases run first.
+
+Usage:
+    python manage.py bench_render --count 5000
+"""
+
+import resource
+import sys
+import time
+import tracemalloc
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from analyzer.management.commands.bench_projects import SECTION_TEXT
+from analyzer.models import Project
+from analyzer.serializers import ProjectSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+class Command(BaseCommand):
+    help = "Measure peak memory and time to first byte of the stock and streaming JSON renderers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options['count'])
+                self.run()
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        started = time.perf_counter()
+        # Distinct texts per project, so blob deduplication doesn't shrink the export
+        for offset in range(0, count, 500):
+            Project.objects.bulk_create(
+                Project(
+                    startup_idea=f"Idea #{i}: a marketplace connecting local farmers with urban consumers.",
+                    target_market="Urban consumers in tier-1 cities",
+                    status='completed',
+                    **{field: f"{field} of idea #{i}\n{SECTION_TEXT}" for field in Project.ANALYSIS_FIELDS},
+                )
+                for i in range(offset, min(offset + 500, count))
+            )
+        self.stdout.write(f"Seeded {count} projects in {time.perf_counter() - started:.1f}s\n")
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def run(self):
+        client = Client()
+
+        def streaming():
+            response = client.get('/projects/export/')
+            chunks = iter(response.streaming_content)
+            size = len(next(chunks))
+            first_byte = time.perf_counter()
+            for chunk in chunks:
+                size += len(chunk)
+            return first_byte, size
+
+        @async_to_sync
+        async def streaming_asgi():
+            response = await AsyncClient().get('/projects/export/')
+            chunks = aiter(response.streaming_content)
+            size = len(await anext(chunks))
+            first_byte = time.perf_counter()
+            async for chunk in chunks:
+                size += len(chunk)
+            return first_byte, size
+
+        def stock():
+            queryset = Project.objects.select_related(*Project.section_blob_fields())
+            body = JSONRenderer().render(ProjectSerializer(queryset, many=True).data)
+            return time.perf_counter(), len(body)
+
+        self.stdout.write(
+            f"{'Renderer':<16}{'TTFB ms':>10}{'total ms':>10}{'MB sent':>10}"
+            f"{'heap peak MB':>14}{'RSS growth MB':>15}"
+        )
+        for label, func in [("Streaming", streaming), ("Streaming ASGI", streaming_asgi), ("JSONRenderer", stock)]:
+            started = time.perf_counter()
+            first_byte, size = func()
+            total = time.perf_counter() - started
+
+            rss_before = peak_rss_mb()
+            tracemalloc.start()
+            func()
+            _, heap_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rss_growth = peak_rss_mb() - rss_before
+
+            self.stdout.write(
+                f"{label:<16}{(first_byte - started) * 1e3:>10.1f}{total * 1e3:>10.1f}{size / 2 ** 20:>10.1f}"
+                f"{heap_peak / 2 ** 20:>14.1f}{rss_growth:>15.1f}"
+            )
@@ -0,0 +1,127 @@
+"""
+Benchmark /projects/search against a large seeded index.
+
+Seeds projects and their index entries inside a transaction that is rolled
+back afterwards, so the database is left as it was. A small share of the
+analyses mention rare terms (HIPAA, GDPR), the rest share a common
+vocabulary, so both selective and broad queries are measured.
+
+Usage:
+    python manage.py bench_search --count 100000
+"""
+
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from analyzer.models import Project
+from analyzer.search import SEARCH_FIELDS, get_search_index
+
+
+WORDS = (
+    "market customers growth revenue pricing competitors segment channel retention "
+    "platform compliance regulation partners acquisition churn margin subscription "
+    "enterprise onboarding infrastructure scalability security funding runway hiring "
+    "logistics inventory analytics dashboard mobile payments insurance clinics patients"
+).split()
+RARE_TERMS = ("HIPAA", "GDPR", "SOC 2", "FDA clearance")
+
+QUERIES = (
+    ("rare term", "hipaa"),
+    ("rare phrase", '"fda clearance"'),
+    ("rare AND common", "gdpr payments"),
+    ("common term", "revenue"),
+    ("common prefix", "subscri*"),
+    ("two common terms", "pricing churn"),
+    ("excluded term", "clinics -insurance"),
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Measure /projects/search latency over a seeded index of many projects."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000)
+        parser.add_argument('--section-words', type=int, default=120, help="Words per analysis section")
+        parser.add_argument('--rare-share', type=float, default=0.01, help="Share of projects mentioning each rare term")
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        index = get_search_index()
+        if index is None:
+            raise CommandError("Full-text search is not supported on this database.")
+        try:
+            with transaction.atomic():
+                self.seed(index, options)
+                self.run(index, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, index, options):
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+        for offset in range(0, options['count'], 1000):
+            projects = [
+                Project(id=uuid.UUID(int=rng.getrandbits(128)), startup_idea=self.sentence(rng, 30), status='completed')
+                for _ in range(min(1000, options['count'] - offset))
+            ]
+            Project.objects.bulk_create(projects)
+            documents = []
+            for project in projects:
+                fields = {'startup_idea': project.startup_idea, 'target_market': "Small businesses"}
+                for field in SEARCH_FIELDS[2:]:
+                    text = self.sentence(rng, options['section_words'])
+                    for term in RARE_TERMS:
+                        if rng.random() < options['rare_share'] / len(SEARCH_FIELDS[2:]):
+                            text += f" Requires {term} review."
+                    fields[field] = text
+                documents.append((project, fields))
+            index.index(documents)
+        self.stdout.write(f"Seeded and indexed {options['count']:,} projects in {time.perf_counter() - started:.1f}s\n")
+
+    @staticmethod
+    def sentence(rng, words):
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def run(self, index, repeat):
+        client = Client()
+        self.stdout.write(f"{'Query':<28}{'hits (page)':>12}{'index p50 ms':>14}{'endpoint p50 ms':>17}{'p95 ms':>9}")
+        for name, query in QUERIES:
+            index_times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                hits = index.search(query, 21)
+                index_times.append((time.perf_counter() - started) * 1000)
+            endpoint_times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = client.get('/projects/search/', {'q': query})
+                endpoint_times.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.content
+            endpoint_times.sort()
+            self.stdout.write(
+                f"{name + ' ' + query:<28}{len(hits):>12}{statistics.median(index_times):>14.2f}"
+                f"{statistics.median(endpoint_times):>17.2f}{endpoint_times[int(len(endpoint_times) * 0.95) - 1]:>9.2f}"
+            )
+
+        # Incremental maintenance: re-indexing one saved project
+        project = Project.objects.first()
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            project.save()
+            times.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(f"\nProject.save() including re-index: p50 {statistics.median(times):.2f} ms")
@@ -0,0 +1,47 @@
+"""
+Rebuild the full-text search index from the projects.
+
+The index is kept up to date as projects are saved, so this is only needed
+after writes that bypass the model (bulk_create, raw SQL) or to repair it.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from analyzer.models import Project
+from analyzer.search import get_search_index, project_document
+
+
+class Command(BaseCommand):
+    help = "Re-index every project for /projects/search."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        index = get_search_index()
+        if index is None:
+            raise CommandError("Full-text search is not supported on this database.")
+
+        started = time.perf_counter()
+        batch_size = options['batch_size']
+        # Oldest first, so SQLite rowids follow creation order (newest matches are ranked first)
+        projects = (
+            Project.objects.select_related(*Project.section_blob_fields())
+            .order_by('created_at')
+            .iterator(chunk_size=batch_size)
+        )
+        indexed = 0
+        with transaction.atomic():
+            index.clear()
+            while batch := [project for _, project in zip(range(batch_size), projects)]:
+                index.index([(project, project_document(project)) for project in batch])
+                indexed += len(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed:,} projects in {time.perf_counter() - started:.1f}s"
+        ))
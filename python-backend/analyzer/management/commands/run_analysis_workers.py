@@ -0,0 +1,52 @@
+"""
+Run analysis jobs from the database queue (ANALYSIS_JOB_BACKEND=database).
+
+Start one per host (or several); every worker claims jobs independently, so
+adding workers adds throughput. SIGTERM or Ctrl-C stops claiming and exits
+once the running jobs have finished. A worker that dies without stopping
+loses its leases, and its jobs are claimed again by the others.
+
+Usage:
+    python manage.py run_analysis_workers --concurrency 8
+"""
+
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from analyzer.jobs import AnalysisWorker
+
+
+class Command(BaseCommand):
+    help = "Claim and run queued analyses from the database job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.ANALYSIS_JOB_WORKERS,
+            help="Analyses this worker runs at once",
+        )
+        parser.add_argument('--lease-seconds', type=float, default=settings.ANALYSIS_JOB_LEASE_SECONDS)
+        parser.add_argument('--poll-seconds', type=float, default=settings.ANALYSIS_WORKER_POLL_SECONDS)
+        parser.add_argument('--max-attempts', type=int, default=settings.ANALYSIS_JOB_MAX_ATTEMPTS)
+        parser.add_argument('--name', help="Worker name recorded on its leases (default: host:pid:random)")
+
+    def handle(self, *args, **options):
+        # Web processes load the workflow on first use; a worker always needs it, so load it before claiming
+        import analyzer.langgraph_workflow  # noqa: F401
+
+        worker = AnalysisWorker(
+            concurrency=options['concurrency'],
+            lease_seconds=options['lease_seconds'],
+            poll_seconds=options['poll_seconds'],
+            max_attempts=options['max_attempts'],
+            name=options['name'],
+        )
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping: finishing running jobs, not claiming new ones...")
+            worker.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        worker.run()
@@ -0,0 +1,128 @@
+"""
+Report how much space the compressed, deduplicated analysis sections save.
+
+Compares the bytes the sections would take stored as plain text in every
+project row (as before `TextBlob`) with the bytes actually stored: each
+distinct text once, compressed. Also reports the node checkpoints: plain
+JSON while their run is going (or failed, so it can resume), compressed once
+it completed. With `--gc`, also deletes blobs that no project references any
+more (edited, re-run or deleted projects) and compresses the checkpoints of
+completed projects that are still plain.
+
+Usage:
+    python manage.py storage_report
+    python manage.py storage_report --gc --grace-minutes 60
+"""
+
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q, Sum, TextField
+from django.db.models.functions import Cast, Length
+from django.utils import timezone
+
+from analyzer.models import NodeCheckpoint, Project, TextBlob
+
+
+def _mb(size: int) -> str:
+    return f"{size / 2 ** 20:,.2f} MB"
+
+
+def _ratio(value) -> str:
+    return f"{value}x" if value else "n/a"
+
+
+class Command(BaseCommand):
+    help = "Report storage savings of compressed, deduplicated analysis sections; optionally delete unused blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--gc', action='store_true',
+            help="Delete blobs no project references and compress the checkpoints of completed projects",
+        )
+        parser.add_argument(
+            '--grace-minutes', type=int, default=60,
+            help="Only delete unreferenced blobs older than this, so blobs being stored right now are kept",
+        )
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        report = self.report()
+        if options['gc']:
+            cutoff = timezone.now() - timedelta(minutes=options['grace_minutes'])
+            deleted, _ = TextBlob.objects.unreferenced().filter(created_at__lt=cutoff).delete()
+            report['deleted_blobs'] = deleted
+            report['compressed_checkpoints'] = sum(
+                NodeCheckpoint.objects.compress(project)
+                for project in Project.objects.filter(
+                    status='completed', checkpoints__output__isnull=False,
+                ).distinct().only('pk')
+            )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"Sections:      {report['sections']:,} in {report['projects']:,} projects\n"
+            f"As plain text: {_mb(report['logical_bytes'])}\n"
+            f"Distinct:      {report['blobs']:,} blobs, {_mb(report['unique_bytes'])} uncompressed "
+            f"(deduplication {_ratio(report['dedup_ratio'])})\n"
+            f"Stored:        {_mb(report['stored_bytes'])} (compression {_ratio(report['compression_ratio'])})\n"
+            f"Unreferenced:  {report['unreferenced_blobs']:,} blobs, {_mb(report['unreferenced_bytes'])}\n"
+            f"Checkpoints:   {report['checkpoints']:,} ({report['plain_checkpoints']:,} plain JSON, "
+            f"{_mb(report['checkpoint_json_bytes'])}; the rest compressed, {_mb(report['checkpoint_stored_bytes'])})"
+        )
+        for codec, stats in report['codecs'].items():
+            self.stdout.write(f"  {codec:<12} {stats['blobs']:,} blobs, {_mb(stats['stored_bytes'])}")
+        self.stdout.write(self.style.SUCCESS(f"Saved {report['savings_pct']}% of section storage"))
+        if 'deleted_blobs' in report:
+            self.stdout.write(f"Deleted {report['deleted_blobs']:,} unreferenced blobs")
+            self.stdout.write(f"Compressed {report['compressed_checkpoints']:,} checkpoints of completed projects")
+
+    def report(self) -> dict:
+        # What every project row would hold as plain text: one copy of each section it references
+        sections = logical = 0
+        for field in Project.section_blob_fields():
+            totals = Project.objects.aggregate(count=Count(field), size=Sum(f'{field}__size'))
+            sections += totals['count']
+            logical += totals['size'] or 0
+
+        codecs = {}
+        for row in TextBlob.objects.values('codec').annotate(
+            blobs=Count('pk'), size=Sum('size'), stored=Sum(Length('data')),
+        ).order_by('codec'):
+            codecs[row['codec']] = {"blobs": row['blobs'], "bytes": row['size'], "stored_bytes": row['stored']}
+        unreferenced = TextBlob.objects.unreferenced().aggregate(
+            blobs=Count('pk'), size=Sum('size'), stored=Sum(Length('data')),
+        )
+
+        checkpoints = NodeCheckpoint.objects.aggregate(
+            count=Count('pk'),
+            plain=Count('pk', filter=Q(output__isnull=False)),
+            json=Sum(Length(Cast('output', TextField()))),
+            stored=Sum(Length('data')),
+        )
+
+        blobs = sum(stats['blobs'] for stats in codecs.values()) - unreferenced['blobs']
+        unique = sum(stats['bytes'] for stats in codecs.values()) - (unreferenced['size'] or 0)
+        stored = sum(stats['stored_bytes'] for stats in codecs.values())
+        return {
+            "projects": Project.objects.count(),
+            "sections": sections,
+            "logical_bytes": logical,
+            "blobs": blobs,
+            "unique_bytes": unique,
+            "stored_bytes": stored,
+            "unreferenced_blobs": unreferenced['blobs'],
+            "unreferenced_bytes": unreferenced['stored'] or 0,
+            "dedup_ratio": round(logical / unique, 2) if unique else None,
+            "compression_ratio": round(unique / (stored - (unreferenced['stored'] or 0)), 2) if unique else None,
+            "savings_pct": round(100 * (1 - stored / logical), 1) if logical else 0.0,
+            "codecs": codecs,
+            "checkpoints": checkpoints['count'],
+            "plain_checkpoints": checkpoints['plain'],
+            "checkpoint_json_bytes": checkpoints['json'] or 0,
+            "checkpoint_stored_bytes": checkpoints['stored'] or 0,
+        }
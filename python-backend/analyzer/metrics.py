@@ -0,0 +1,313 @@
+"""
+Prometheus-style metrics for the analysis workflow.
+
+Every workflow node records its wall time and errors, and every LLM
+completion records its queue wait (time spent waiting for an in-flight slot
+of the client pool), its latency and its prompt/completion tokens; the pool
+itself reports its client hits/misses and the completions in flight. Samples
+are labelled by node name and model (completions also by the model profile
+the node is routed to, see analyzer.llm_routing), and `GET /metrics` renders
+them in the Prometheus text exposition format.
+
+Metrics live in process memory, so each worker process exposes its own; let
+Prometheus scrape every worker (or sum across instances) as usual. Recording
+a sample is a dict lookup and a bisect under a lock, a few microseconds next
+to LLM calls that take seconds.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# Node and completion latencies range from cache hits to multi-minute generations
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Gauge:
+    """Value that can go up and down, with a fixed set of label names."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *labelvalues) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def value(self, *labelvalues) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Histogram:
+    """Histogram with cumulative `le` buckets, `_sum` and `_count`, per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, *labelvalues) -> int:
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            return sum(entry[0]) if entry else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            values = {labels: (list(counts), total) for labels, (counts, total) in self._values.items()}
+        for labelvalues, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ('le',), labelvalues + (_format_value(float(bound)),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """The set of metrics rendered by `/metrics`."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        for metric in self._metrics:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+NODE_DURATION = REGISTRY.register(Histogram(
+    'analysis_node_duration_seconds', 'Wall time of one workflow node.', ('node', 'model'),
+))
+NODE_ERRORS = REGISTRY.register(Counter(
+    'analysis_node_errors_total', 'Workflow nodes that raised an error.', ('node', 'model'),
+))
+LLM_QUEUE_WAIT = REGISTRY.register(Histogram(
+    'llm_queue_wait_seconds', 'Time a completion waited for an in-flight slot of the client pool.',
+    ('node', 'profile', 'model'), buckets=WAIT_BUCKETS,
+))
+LLM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'llm_request_duration_seconds', 'Latency of one LLM completion, excluding queue wait.', ('node', 'profile', 'model'),
+))
+LLM_REQUESTS = REGISTRY.register(Counter(
+    'llm_requests_total', 'LLM completions requested, by outcome (ok, cached or error).',
+    ('node', 'profile', 'model', 'outcome'),
+))
+LLM_PROMPT_TOKENS = REGISTRY.register(Counter(
+    'llm_prompt_tokens_total', 'Prompt tokens sent to the LLM.', ('node', 'profile', 'model'),
+))
+LLM_COMPLETION_TOKENS = REGISTRY.register(Counter(
+    'llm_completion_tokens_total', 'Completion tokens generated by the LLM.', ('node', 'profile', 'model'),
+))
+LLM_RETRIES = REGISTRY.register(Counter(
+    'llm_retries_total', 'LLM completions retried after a transient error.', ('model',),
+))
+LLM_HEDGES = REGISTRY.register(Counter(
+    'llm_hedged_requests_total', 'Hedged duplicate completions, by outcome (sent, or won the race).', ('model', 'outcome'),
+))
+LLM_CIRCUIT_STATE = REGISTRY.register(Gauge(
+    'llm_circuit_state', 'Circuit breaker state per model: 0 closed, 1 half-open, 2 open.', ('model',),
+))
+LLM_POOL_LOOKUPS = REGISTRY.register(Counter(
+    'llm_pool_client_lookups_total', 'LLM client pool lookups, by outcome (hit, or miss when a client was built).',
+    ('outcome',),
+))
+LLM_POOL_CLIENTS = REGISTRY.register(Gauge(
+    'llm_pool_clients', 'LLM clients kept by the client pool.',
+))
+LLM_POOL_IN_FLIGHT = REGISTRY.register(Gauge(
+    'llm_pool_in_flight', 'Completions holding an in-flight slot of the client pool.',
+))
+LLM_RATE_LIMIT_WAIT = REGISTRY.register(Histogram(
+    'llm_rate_limit_wait_seconds', 'Time a completion waited for RPM/TPM budget before being sent.',
+    ('model',), buckets=WAIT_BUCKETS,
+))
+LLM_RATE_LIMIT_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'llm_rate_limit_queue_depth', 'Completions waiting for RPM/TPM budget.',
+))
+REPORT_SECTIONS_MISSING = REGISTRY.register(Counter(
+    'analysis_report_sections_missing_total',
+    'Sections a stored report lacks, i.e. its prompt asked for them but no heading matched.', ('field', 'section'),
+))
+
+
+class NodeCall:
+    """The node running in the current context, and the profile and model its completion used."""
+
+    __slots__ = ('node', 'profile', 'model')
+
+    def __init__(self, node: str):
+        self.node = node
+        self.profile = None
+        self.model = None
+
+
+_current_call = ContextVar('analysis_node_call', default=None)
+
+
+@contextmanager
+def node_call(node: str):
+    """Record the wall time (and any error) of one node run, labelled by the model it called."""
+    call = NodeCall(node)
+    token = _current_call.set(call)
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        NODE_ERRORS.inc(node, call.model or 'none')
+        raise
+    finally:
+        NODE_DURATION.observe(time.perf_counter() - started, node, call.model or 'none')
+        _current_call.reset(token)
+
+
+def current_call():
+    """The NodeCall of the node running in the current context, or None outside a node."""
+    return _current_call.get()
+
+
+def llm_labels(profile: str, model: str) -> tuple:
+    """(node, profile, model) labels for a completion made from the current node."""
+    call = _current_call.get()
+    if call is None:
+        return ('none', profile, model)
+    call.profile = profile
+    call.model = model
+    return (call.node, profile, model)
+
+
+def token_usage(response) -> tuple:
+    """(prompt, completion) token counts reported with an LLM response, if any."""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage:
+        return usage.get('input_tokens', 0), usage.get('output_tokens', 0)
+    usage = (getattr(response, 'response_metadata', None) or {}).get('token_usage') or {}
+    return usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)
+
+
+@contextmanager
+def track_llm_request(labels: tuple, queue_wait: float):
+    """
+    Record one completion's queue wait, latency, outcome and token usage.
+
+    Yields a callable to hand the response to once it arrives.
+    """
+    LLM_QUEUE_WAIT.observe(queue_wait, *labels)
+    started = time.perf_counter()
+
+    def record(response) -> None:
+        prompt_tokens, completion_tokens = token_usage(response)
+        if prompt_tokens:
+            LLM_PROMPT_TOKENS.inc(*labels, amount=prompt_tokens)
+        if completion_tokens:
+            LLM_COMPLETION_TOKENS.inc(*labels, amount=completion_tokens)
+
+    try:
+        yield record
+    except Exception:
+        LLM_REQUESTS.inc(*labels, 'error')
+        raise
+    finally:
+        LLM_REQUEST_DURATION.observe(time.perf_counter() - started, *labels)
+    LLM_REQUESTS.inc(*labels, 'ok')
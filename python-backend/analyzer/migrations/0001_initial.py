@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:33
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('startup_idea', models.TextField()),
+                ('target_market', models.TextField(blank=True, null=True)),
+                ('market_analysis', models.TextField(blank=True, null=True)),
+                ('cost_prediction', models.TextField(blank=True, null=True)),
+                ('business_strategy', models.TextField(blank=True, null=True)),
+                ('monetization', models.TextField(blank=True, null=True)),
+                ('legal_considerations', models.TextField(blank=True, null=True)),
+                ('tech_stack', models.TextField(blank=True, null=True)),
+                ('strategist_critique', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('analyzing', 'Analyzing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0003_project_status_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('node', models.CharField(max_length=50)),
+                ('output', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='analyzer.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'node'), name='unique_node_checkpoint')],
+            },
+        ),
+    ]
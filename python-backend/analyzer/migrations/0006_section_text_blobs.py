@@ -0,0 +1,164 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:04
+
+import hashlib
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SECTIONS = [
+    'market_analysis',
+    'cost_prediction',
+    'business_strategy',
+    'monetization',
+    'legal_considerations',
+    'tech_stack',
+    'strategist_critique',
+]
+BATCH_SIZE = 500
+
+
+# Point-in-time copies of analyzer.text_blobs, so this migration keeps working
+# whatever later changes that module. New blobs are written with zlib, which
+# needs no optional package; the codec is recorded per blob.
+def text_digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compress_text(text):
+    raw = text.encode('utf-8')
+    data = zlib.compress(raw, 9)
+    if len(data) >= len(raw):
+        return 'raw', raw
+    return 'zlib', data
+
+
+def decompress_text(codec, data):
+    data = bytes(data)
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    return data.decode('utf-8')
+
+
+def move_sections_to_blobs(apps, schema_editor):
+    """Store every section as a (deduplicated, compressed) blob and point the project at it."""
+    Project = apps.get_model('analyzer', 'Project')
+    TextBlob = apps.get_model('analyzer', 'TextBlob')
+
+    projects = Project.objects.only('pk', *SECTIONS).iterator(chunk_size=BATCH_SIZE)
+    while batch := [project for _, project in zip(range(BATCH_SIZE), projects)]:
+        blobs = {}
+        for project in batch:
+            for section in SECTIONS:
+                text = getattr(project, section)
+                if text is None:
+                    continue
+                digest = text_digest(text)
+                if digest not in blobs:
+                    codec, data = compress_text(text)
+                    blobs[digest] = TextBlob(digest=digest, codec=codec, data=data, size=len(text.encode('utf-8')))
+                setattr(project, f'{section}_blob_id', digest)
+        TextBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+        Project.objects.bulk_update(batch, [f'{section}_blob' for section in SECTIONS])
+
+
+def move_blobs_to_sections(apps, schema_editor):
+    """Write every section's text back into the project row."""
+    Project = apps.get_model('analyzer', 'Project')
+
+    blob_fields = [f'{section}_blob' for section in SECTIONS]
+    projects = Project.objects.select_related(*blob_fields).iterator(chunk_size=BATCH_SIZE)
+    while batch := [project for _, project in zip(range(BATCH_SIZE), projects)]:
+        for project in batch:
+            for section in SECTIONS:
+                blob = getattr(project, f'{section}_blob')
+                setattr(project, section, decompress_text(blob.codec, blob.data) if blob else None)
+        Project.objects.bulk_update(batch, SECTIONS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0005_project_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('codec', models.CharField(max_length=10)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='market_analysis_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='cost_prediction_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='business_strategy_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='monetization_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='legal_considerations_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tech_stack_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='strategist_critique_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob'),
+        ),
+        migrations.RunPython(move_sections_to_blobs, move_blobs_to_sections),
+        migrations.RemoveField(
+            model_name='project',
+            name='market_analysis',
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='cost_prediction',
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='business_strategy',
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='monetization',
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='legal_considerations',
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='tech_stack',
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='strategist_critique',
+        ),
+    ]
@@ -0,0 +1,134 @@
+import zlib
+
+from django.conf import settings
+from django.db import migrations
+
+
+# Point-in-time copy of analyzer.search's schema and indexing, so this
+# migration keeps working whatever later changes that module
+TABLE = 'analyzer_project_search'
+ROWIDS_TABLE = 'analyzer_project_search_rowid'
+SEARCH_FIELDS = (
+    'startup_idea',
+    'target_market',
+    'market_analysis',
+    'cost_prediction',
+    'business_strategy',
+    'monetization',
+    'legal_considerations',
+    'tech_stack',
+    'strategist_critique',
+)
+SECTIONS = SEARCH_FIELDS[2:]
+BATCH_SIZE = 500
+
+SQLITE_SCHEMA = [
+    f"CREATE TABLE {ROWIDS_TABLE} (id INTEGER PRIMARY KEY, project_id char(32) NOT NULL UNIQUE)",
+    f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+    f"project_id UNINDEXED, {', '.join(SEARCH_FIELDS)}, tokenize = 'porter unicode61 remove_diacritics 2')",
+]
+POSTGRES_SCHEMA = [
+    f"CREATE TABLE {TABLE} ("
+    "project_id uuid PRIMARY KEY REFERENCES analyzer_project (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "body text NOT NULL, "
+    "document tsvector NOT NULL)",
+    f"CREATE INDEX {TABLE}_document_idx ON {TABLE} USING GIN (document)",
+]
+SCHEMAS = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRES_SCHEMA}
+
+
+def decompress_text(codec, data):
+    data = bytes(data)
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    return data.decode('utf-8')
+
+
+def index_sqlite(cursor, documents):
+    """Give each project the next FTS5 rowid and insert its row."""
+    cursor.executemany(
+        f"INSERT INTO {ROWIDS_TABLE} (project_id) VALUES (%s)",
+        [(project.pk.hex,) for project, _ in documents],
+    )
+    cursor.execute(
+        f"SELECT project_id, id FROM {ROWIDS_TABLE} WHERE project_id IN ({', '.join(['%s'] * len(documents))})",
+        [project.pk.hex for project, _ in documents],
+    )
+    rowids = dict(cursor.fetchall())
+    columns = ', '.join(('rowid', 'project_id') + SEARCH_FIELDS)
+    placeholders = ', '.join(['%s'] * (len(SEARCH_FIELDS) + 2))
+    cursor.executemany(f"INSERT INTO {TABLE} ({columns}) VALUES ({placeholders})", [
+        (rowids[project.pk.hex], project.pk.hex, *(fields[field] for field in SEARCH_FIELDS))
+        for project, fields in documents
+    ])
+
+
+def index_postgres(cursor, documents, config):
+    """Insert each project's weighted tsvector: the idea A, the target market B, the sections C."""
+    rows = []
+    for project, fields in documents:
+        sections = '\n\n'.join(fields[field] for field in SECTIONS if fields[field])
+        body = '\n\n'.join(text for text in (fields['startup_idea'], fields['target_market'], sections) if text)
+        rows.append((
+            project.pk, body,
+            config, fields['startup_idea'] or '',
+            config, fields['target_market'] or '',
+            config, sections,
+        ))
+    cursor.executemany(
+        f"INSERT INTO {TABLE} (project_id, body, document) VALUES (%s, %s, "
+        "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+        "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+        "setweight(to_tsvector(%s::regconfig, %s), 'C'))",
+        rows,
+    )
+
+
+def create_search_index(apps, schema_editor):
+    """Create the backend's search table and index every existing project."""
+    connection = schema_editor.connection
+    if connection.vendor not in SCHEMAS:
+        return
+    for statement in SCHEMAS[connection.vendor]:
+        schema_editor.execute(statement)
+
+    Project = apps.get_model('analyzer', 'Project')
+    # Oldest first, so rowids follow creation order
+    projects = (
+        Project.objects.select_related(*(f'{section}_blob' for section in SECTIONS))
+        .order_by('created_at')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    while batch := [project for _, project in zip(range(BATCH_SIZE), projects)]:
+        documents = []
+        for project in batch:
+            fields = {'startup_idea': project.startup_idea, 'target_market': project.target_market}
+            for section in SECTIONS:
+                blob = getattr(project, f'{section}_blob')
+                fields[section] = decompress_text(blob.codec, blob.data) if blob else None
+            documents.append((project, fields))
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                index_sqlite(cursor, documents)
+            else:
+                index_postgres(cursor, documents, getattr(settings, 'SEARCH_CONFIG', 'english'))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in SCHEMAS:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {ROWIDS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0006_section_text_blobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:10
+
+import hashlib
+import random
+import re
+import struct
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+# Point-in-time copy of analyzer.similarity, so this migration keeps working
+# whatever later changes that module. The signatures it stores must match the
+# ones the app computes, so none of this may change either.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20261016)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+_WORD_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset("""
+a about an and app application are as at based be by can for from help helps
+how i idea in into is it its let lets of on or our platform service that the
+their them they this to using via we which who will with would you your
+""".split())
+
+
+def _stem(word):
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def _hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little') % _PRIME
+
+
+def idea_signature(startup_idea, target_market):
+    text = f"{startup_idea} {target_market or ''}".lower()
+    words = {_stem(word) for word in _WORD_RE.findall(text) if word not in STOPWORDS}
+    if not words:
+        return None
+    hashes = [_hash(word) for word in words]
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(signature):
+    buckets = []
+    for band in range(BANDS):
+        rows = struct.pack(f'<{ROWS}q', *signature[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def pack_signature(signature):
+    return struct.pack(f'<{NUM_PERMUTATIONS}q', *signature)
+
+
+def index_existing_ideas(apps, schema_editor):
+    """Store the signature and LSH buckets of every existing project's idea."""
+    Project = apps.get_model('analyzer', 'Project')
+    IdeaSignature = apps.get_model('analyzer', 'IdeaSignature')
+    IdeaBucket = apps.get_model('analyzer', 'IdeaBucket')
+
+    projects = Project.objects.only('pk', 'startup_idea', 'target_market').iterator(chunk_size=BATCH_SIZE)
+    while batch := [project for _, project in zip(range(BATCH_SIZE), projects)]:
+        signatures, buckets = [], []
+        for project in batch:
+            signature = idea_signature(project.startup_idea, project.target_market)
+            if signature is None:
+                continue
+            signatures.append(IdeaSignature(project=project, signature=pack_signature(signature)))
+            buckets.extend(
+                IdeaBucket(project=project, band=band, bucket=bucket)
+                for band, bucket in enumerate(band_buckets(signature))
+            )
+        IdeaSignature.objects.bulk_create(signatures)
+        IdeaBucket.objects.bulk_create(buckets)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0007_project_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdeaSignature',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='idea_signature', serialize=False, to='analyzer.project')),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IdeaBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='analyzer.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='idea_bucket_lookup_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_ideas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0008_idea_signatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectRendition',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rendition', serialize=False, to='analyzer.project')),
+                ('updated_at', models.DateTimeField()),
+                ('gzip', models.BinaryField()),
+                ('br', models.BinaryField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,204 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+import hashlib
+import re
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 200
+
+# Point-in-time copy of analyzer.sections and analyzer.text_blobs, so this
+# migration keeps working whatever later changes those modules (or the prompts
+# the section headings are read from). Sections of each field, as (key, title).
+SECTION_SPECS = {
+    'market_analysis': [
+        ('target_audience_deep_dive', 'TARGET AUDIENCE DEEP DIVE'),
+        ('market_size_analysis', 'MARKET SIZE ANALYSIS'),
+        ('competitive_landscape', 'COMPETITIVE LANDSCAPE'),
+        ('market_trends_dynamics', 'MARKET TRENDS & DYNAMICS'),
+        ('opportunities_threats', 'OPPORTUNITIES & THREATS'),
+        ('data_driven_insights', 'DATA-DRIVEN INSIGHTS'),
+    ],
+    'cost_prediction': [
+        ('initial_setup_costs', 'INITIAL SETUP COSTS (One-Time Investments)'),
+        ('monthly_operating_costs', 'MONTHLY OPERATING COSTS (Recurring)'),
+        ('financial_projections', 'FINANCIAL PROJECTIONS (Years 1-3)'),
+        ('funding_requirements', 'FUNDING REQUIREMENTS'),
+        ('cost_optimization_strategies', 'COST OPTIMIZATION STRATEGIES'),
+    ],
+    'business_strategy': [
+        ('executive_summary', 'EXECUTIVE SUMMARY'),
+        ('vision_mission_values', 'VISION, MISSION & VALUES'),
+        ('value_proposition_canvas', 'VALUE PROPOSITION CANVAS'),
+        ('business_model_deep_dive', 'BUSINESS MODEL DEEP DIVE'),
+        ('go_to_market_strategy', 'GO-TO-MARKET STRATEGY'),
+        ('competitive_moats_advantages', 'COMPETITIVE MOATS & ADVANTAGES'),
+        ('key_success_metrics_kpis', 'KEY SUCCESS METRICS & KPIs'),
+        ('risk_analysis_contingency', 'RISK ANALYSIS & CONTINGENCY'),
+        ('90_day_action_plan', '90-DAY ACTION PLAN'),
+    ],
+    'monetization': [
+        ('model_1', 'MODEL 1'),
+        ('model_2', 'MODEL 2'),
+        ('model_3', 'MODEL 3'),
+        ('model_4', 'MODEL 4'),
+        ('pricing_psychology_recommendations', 'PRICING PSYCHOLOGY RECOMMENDATIONS'),
+        ('monetization_roadmap', 'MONETIZATION ROADMAP'),
+        ('metrics_to_track', 'METRICS TO TRACK'),
+    ],
+    'legal_considerations': [
+        ('business_structure_analysis', 'BUSINESS STRUCTURE ANALYSIS'),
+        ('intellectual_property_strategy', 'INTELLECTUAL PROPERTY STRATEGY'),
+        ('regulatory_compliance', 'REGULATORY COMPLIANCE'),
+        ('essential_legal_documents', 'ESSENTIAL LEGAL DOCUMENTS'),
+        ('risk_mitigation_strategy', 'RISK MITIGATION STRATEGY'),
+        ('compliance_roadmap_timeline', 'COMPLIANCE ROADMAP & TIMELINE'),
+        ('legal_budget_estimate', 'LEGAL BUDGET ESTIMATE'),
+    ],
+    'tech_stack': [
+        ('architecture_overview', 'ARCHITECTURE OVERVIEW'),
+        ('frontend_architecture', 'FRONTEND ARCHITECTURE'),
+        ('backend_architecture', 'BACKEND ARCHITECTURE'),
+        ('database_architecture', 'DATABASE ARCHITECTURE'),
+        ('cloud_infrastructure', 'CLOUD INFRASTRUCTURE'),
+        ('devops_ci_cd', 'DEVOPS & CI/CD'),
+        ('security_architecture', 'SECURITY ARCHITECTURE'),
+        ('third_party_integrations', 'THIRD-PARTY INTEGRATIONS'),
+        ('mvp_development_plan', 'MVP DEVELOPMENT PLAN'),
+        ('team_composition', 'TEAM COMPOSITION'),
+        ('technology_budget_estimate', 'TECHNOLOGY BUDGET ESTIMATE'),
+    ],
+    'strategist_critique': [
+        ('executive_synthesis', 'EXECUTIVE SYNTHESIS'),
+        ('integrated_strategic_framework', 'INTEGRATED STRATEGIC FRAMEWORK'),
+        ('prioritized_action_roadmap', 'PRIORITIZED ACTION ROADMAP'),
+        ('resource_allocation', 'RESOURCE ALLOCATION'),
+        ('success_metrics_dashboard', 'SUCCESS METRICS DASHBOARD'),
+        ('risk_mitigation_matrix', 'RISK MITIGATION MATRIX'),
+        ('90_day_execution_playbook', '90-DAY EXECUTION PLAYBOOK'),
+    ],
+}
+ANALYSIS_FIELDS = list(SECTION_SPECS)
+_WORD_RE = re.compile(r'[a-z0-9]+')
+MAX_HEADING_LENGTH = 120
+MIN_TITLE_OVERLAP = 0.6
+
+
+def _words(text):
+    return _WORD_RE.findall(text.lower())
+
+
+def _heading_of(line, title):
+    if len(line) > MAX_HEADING_LENGTH:
+        return False
+    line = re.sub(r'^[\s#*_>]*(?:\d+[.)]\s*)?', '', line).strip('*_ ')
+    title_words = _words(re.sub(r'\(.*?\)', '', title))
+    line_words = _words(line)
+    if not title_words or not line_words or line_words[0] != title_words[0]:
+        return False
+    found = sum(word in line_words for word in title_words)
+    return found / len(title_words) >= MIN_TITLE_OVERLAP
+
+
+def parse_sections(field, text):
+    """The (key, title, text) sections of a report, in order."""
+    specs = SECTION_SPECS[field]
+    if not text:
+        return []
+    found = []
+    lines = text.splitlines()
+    next_spec = 0
+    for index, line in enumerate(lines):
+        for position in range(next_spec, len(specs)):
+            if _heading_of(line, specs[position][1]):
+                found.append((position, index))
+                next_spec = position + 1
+                break
+    sections = []
+    for number, (position, heading_line) in enumerate(found):
+        end = found[number + 1][1] if number + 1 < len(found) else len(lines)
+        key, title = specs[position]
+        sections.append((key, title, '\n'.join(lines[heading_line + 1:end]).strip('\n')))
+    return sections
+
+
+def text_digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compress_text(text):
+    raw = text.encode('utf-8')
+    data = zlib.compress(raw, 9)
+    if len(data) >= len(raw):
+        return 'raw', raw
+    return 'zlib', data
+
+
+def decompress_text(codec, data):
+    data = bytes(data)
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    return data.decode('utf-8')
+
+
+def split_existing_analyses(apps, schema_editor):
+    """Store the sections of every existing project's analysis fields."""
+    Project = apps.get_model('analyzer', 'Project')
+    TextBlob = apps.get_model('analyzer', 'TextBlob')
+    AnalysisSection = apps.get_model('analyzer', 'AnalysisSection')
+
+    blob_fields = [f'{field}_blob' for field in ANALYSIS_FIELDS]
+    projects = Project.objects.select_related(*blob_fields).only('pk', *blob_fields).iterator(chunk_size=BATCH_SIZE)
+    while batch := [project for _, project in zip(range(BATCH_SIZE), projects)]:
+        blobs, sections = {}, []
+        for project in batch:
+            for field in ANALYSIS_FIELDS:
+                source = getattr(project, f'{field}_blob')
+                if source is None:
+                    continue
+                parsed = parse_sections(field, decompress_text(source.codec, source.data))
+                for position, (key, title, text) in enumerate(parsed):
+                    digest = text_digest(text)
+                    if digest not in blobs:
+                        codec, data = compress_text(text)
+                        blobs[digest] = TextBlob(digest=digest, codec=codec, data=data, size=len(text.encode('utf-8')))
+                    sections.append(AnalysisSection(
+                        project=project, field=field, key=key, title=title,
+                        position=position, source_digest=source.digest, blob_id=digest,
+                    ))
+        TextBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+        AnalysisSection.objects.bulk_create(sections)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0010_analysisjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=100)),
+                ('title', models.CharField(max_length=200)),
+                ('position', models.PositiveSmallIntegerField()),
+                ('source_digest', models.CharField(max_length=64)),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='analyzer.textblob')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='analyzer.project')),
+            ],
+            options={
+                'ordering': ['field', 'position'],
+                'constraints': [models.UniqueConstraint(fields=('project', 'field', 'key'), name='unique_analysis_section')],
+            },
+        ),
+        migrations.RunPython(split_existing_analyses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0011_analysissection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nodecheckpoint',
+            name='profile',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='nodecheckpoint',
+            name='model',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:05
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+
+def compress_output(output):
+    """Point-in-time copy of analyzer.text_blobs.compress_text (zlib only) for a checkpoint's JSON."""
+    raw = json.dumps(output).encode('utf-8')
+    data = zlib.compress(raw, 9)
+    if len(data) >= len(raw):
+        return 'raw', raw
+    return 'zlib', data
+
+
+def compress_completed_checkpoints(apps, schema_editor):
+    """Compress the checkpoints of every project whose run already completed."""
+    NodeCheckpoint = apps.get_model('analyzer', 'NodeCheckpoint')
+
+    checkpoints = (
+        NodeCheckpoint.objects.filter(project__status='completed', output__isnull=False)
+        .only('pk', 'output')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    while batch := [checkpoint for _, checkpoint in zip(range(BATCH_SIZE), checkpoints)]:
+        for checkpoint in batch:
+            checkpoint.codec, checkpoint.data = compress_output(checkpoint.output)
+            checkpoint.output = None
+        NodeCheckpoint.objects.bulk_update(batch, ['output', 'codec', 'data'])
+
+
+def decompress_checkpoints(apps, schema_editor):
+    """Write every compressed checkpoint back as plain JSON."""
+    NodeCheckpoint = apps.get_model('analyzer', 'NodeCheckpoint')
+
+    checkpoints = NodeCheckpoint.objects.filter(codec__isnull=False).iterator(chunk_size=BATCH_SIZE)
+    while batch := [checkpoint for _, checkpoint in zip(range(BATCH_SIZE), checkpoints)]:
+        for checkpoint in batch:
+            data = bytes(checkpoint.data)
+            if checkpoint.codec == 'zstd':
+                import zstandard
+                data = zstandard.ZstdDecompressor().decompress(data)
+            elif checkpoint.codec == 'zlib':
+                data = zlib.decompress(data)
+            checkpoint.output = json.loads(data)
+            checkpoint.codec = checkpoint.data = None
+        NodeCheckpoint.objects.bulk_update(batch, ['output', 'codec', 'data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0013_analysisjob_refresh_cache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='nodecheckpoint',
+            name='output',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='nodecheckpoint',
+            name='codec',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='nodecheckpoint',
+            name='data',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(compress_completed_checkpoints, decompress_checkpoints),
+    ]
@@ -1,6 +1,159 @@
-from django.db import models
+from datetime import timedelta
+from functools import cached_property
+import gzip
+import json
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 import uuid
 
+from . import metrics
+from .search import SEARCH_FIELDS, index_project, unindex_project
+from .sections import parse_sections
+from .similarity import band_buckets, idea_signature, pack_signature, similarity, unpack_signature
+from .text_blobs import compress_text, decompress_text, text_digest
+
+
+class ProjectManager(models.Manager):
+    
+    def prepare_analysis(self, project_id, startup_idea, target_market, rerun=False):
+        """
+        Create or update the project for an analysis request in one transaction.
+        
+        Returns (project, reusable). `reusable` is True when the project
+        already holds a completed analysis of this exact idea (and `rerun`
+        is not set); the caller should then serve the stored results
+        instead of calling any LLM. Otherwise the project is reset to
+        `pending` with empty sections.
+        """
+        with transaction.atomic():
+            project, created = self.select_for_update().get_or_create(
+                pk=project_id or uuid.uuid4(),
+                defaults={"startup_idea": startup_idea, "target_market": target_market},
+            )
+            if created:
+                return project, False
+            
+            if not rerun and project.has_analysis_for(startup_idea, target_market):
+                # The caller serves the stored sections, possibly from async code where
+                # lazily loading a blob would be a database query on the event loop
+                return self.select_related(*Project.section_blob_fields()).get(pk=project.pk), True
+            
+            same_input = (
+                project.startup_idea == startup_idea
+                and (project.target_market or None) == (target_market or None)
+            )
+            if rerun or not same_input:
+                # Start over: drop stored sections and node checkpoints
+                project.checkpoints.all().delete()
+                for field in Project.ANALYSIS_FIELDS:
+                    setattr(project, field, None)
+            
+            project.startup_idea = startup_idea
+            project.target_market = target_market
+            project.status = 'pending'
+            project.error = None
+            project.started_at = None
+            project.completed_at = None
+            project.save()
+            return project, False
+    
+    def prepare_refinement(self, source, startup_idea, target_market, rerun_nodes):
+        """
+        Create a project for a paraphrase of `source`'s idea that reuses its analysis.
+        
+        The new project gets copies of the source's node checkpoints except
+        `rerun_nodes`, so running it replays the saved outputs and only
+        calls the LLM for those nodes (and any the source never saved).
+        """
+        with transaction.atomic():
+            project = self.create(startup_idea=startup_idea, target_market=target_market)
+            NodeCheckpoint.objects.bulk_create([
+                NodeCheckpoint(
+                    project=project, node=checkpoint.node, output=checkpoint.output,
+                    codec=checkpoint.codec, data=checkpoint.data,
+                    profile=checkpoint.profile, model=checkpoint.model,
+                )
+                for checkpoint in source.checkpoints.exclude(node__in=rerun_nodes)
+            ])
+            return project
+
+
+class TextBlobManager(models.Manager):
+    
+    def store(self, text):
+        """
+        Return the blob holding `text`, inserting it unless it is already stored.
+        
+        Returns None for None. The returned blob carries its text, so reading
+        it back does not decompress anything.
+        """
+        if text is None:
+            return None
+        codec, data = compress_text(text)
+        blob = TextBlob(digest=text_digest(text), codec=codec, data=data, size=len(text.encode('utf-8')))
+        # The same text stored earlier (or concurrently) keeps its existing row
+        self.bulk_create([blob], ignore_conflicts=True)
+        blob.__dict__['text'] = text
+        return blob
+    
+    def unreferenced(self):
+        """Blobs no project section points to any more."""
+        queryset = self.all()
+        for field in Project.section_blob_fields():
+            queryset = queryset.exclude(pk__in=Project.objects.filter(**{f'{field}__isnull': False}).values(field))
+        return queryset.exclude(pk__in=AnalysisSection.objects.values('blob'))
+
+
+class TextBlob(models.Model):
+    """
+    One analysis section's text, compressed and keyed by its SHA-256.
+    
+    Identical sections (e.g. a cached agent response served to several
+    projects) share one row. Blobs are never updated; blobs left unreferenced
+    by edited or deleted projects are removed by `manage.py storage_report --gc`.
+    """
+    
+    digest = models.CharField(max_length=64, primary_key=True)
+    codec = models.CharField(max_length=10)
+    data = models.BinaryField()
+    # Uncompressed size in bytes
+    size = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = TextBlobManager()
+    
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.codec}, {len(self.data)}/{self.size} bytes)"
+    
+    @cached_property
+    def text(self) -> str:
+        """The section text, decompressed on first access."""
+        return decompress_text(self.codec, self.data)
+
+
+def section_text(name: str) -> property:
+    """
+    Expose a project's `<name>_blob` foreign key as the section's plain text.
+    
+    Reading fetches the blob (unless it was loaded with select_related) and
+    decompresses it on first access; assigning stores the text as a blob.
+    """
+    blob_field = f'{name}_blob'
+    
+    def get(project):
+        blob = getattr(project, blob_field)
+        return blob.text if blob is not None else None
+    
+    def set(project, text):
+        setattr(project, blob_field, TextBlob.objects.store(text))
+    
+    return property(get, set)
+
 
 class Project(models.Model):
     """Model to store startup analysis projects."""
@@ -12,25 +165,517 @@ class Project(models.Model):
         ('failed', 'Failed'),
     ]
     
+    # The analysis sections, in the order the frontend shows them
+    ANALYSIS_FIELDS = [
+        'market_analysis',
+        'cost_prediction',
+        'business_strategy',
+        'monetization',
+        'legal_considerations',
+        'tech_stack',
+        'strategist_critique',
+    ]
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     startup_idea = models.TextField()
     target_market = models.TextField(blank=True, null=True)
     
-    # Analysis results
-    market_analysis = models.TextField(blank=True, null=True)
-    cost_prediction = models.TextField(blank=True, null=True)
-    business_strategy = models.TextField(blank=True, null=True)
-    monetization = models.TextField(blank=True, null=True)
-    legal_considerations = models.TextField(blank=True, null=True)
-    tech_stack = models.TextField(blank=True, null=True)
-    strategist_critique = models.TextField(blank=True, null=True)
+    # Analysis results, stored as shared compressed blobs; read and assign them as text
+    market_analysis_blob = models.ForeignKey(TextBlob, blank=True, null=True, on_delete=models.PROTECT, related_name='+')
+    cost_prediction_blob = models.ForeignKey(TextBlob, blank=True, null=True, on_delete=models.PROTECT, related_name='+')
+    business_strategy_blob = models.ForeignKey(TextBlob, blank=True, null=True, on_delete=models.PROTECT, related_name='+')
+    monetization_blob = models.ForeignKey(TextBlob, blank=True, null=True, on_delete=models.PROTECT, related_name='+')
+    legal_considerations_blob = models.ForeignKey(TextBlob, blank=True, null=True, on_delete=models.PROTECT, related_name='+')
+    tech_stack_blob = models.ForeignKey(TextBlob, blank=True, null=True, on_delete=models.PROTECT, related_name='+')
+    strategist_critique_blob = models.ForeignKey(TextBlob, blank=True, null=True, on_delete=models.PROTECT, related_name='+')
+    market_analysis = section_text('market_analysis')
+    cost_prediction = section_text('cost_prediction')
+    business_strategy = section_text('business_strategy')
+    monetization = section_text('monetization')
+    legal_considerations = section_text('legal_considerations')
+    tech_stack = section_text('tech_stack')
+    strategist_critique = section_text('strategist_critique')
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True, null=True)
+    # Status transitions: pending -> analyzing (started_at) -> completed/failed (completed_at)
+    started_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProjectManager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Backs the cursor pagination of /projects
+            models.Index(fields=['-created_at'], name='project_created_at_idx'),
+        ]
     
     def __str__(self):
         return f"{self.startup_idea[:50]}... ({self.status})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        project = super().from_db(db, field_names, values)
+        project._mark_split(project.ANALYSIS_FIELDS)
+        return project
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._mark_split([
+            field for field in self.ANALYSIS_FIELDS
+            if fields is None or f'{field}_blob' in fields or f'{field}_blob_id' in fields
+        ])
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        columns = None if update_fields is None else set(update_fields)
+        # Only sections whose text changed since it was loaded (or last split) are split again
+        changed = [
+            field for field in self.ANALYSIS_FIELDS
+            if (columns is None or f'{field}_blob' in columns) and self._section_changed(field)
+        ]
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if columns is None or set(self.search_columns()) & columns:
+                index_project(self)
+            if columns is None or {'startup_idea', 'target_market'} & columns:
+                IdeaSignature.objects.index(self)
+            if changed:
+                AnalysisSection.objects.split(self, changed)
+        self._mark_split(changed)
+    
+    @classmethod
+    def section_blob_fields(cls, sections=None) -> list:
+        """Foreign keys backing the given analysis sections (default: all of them)."""
+        return [f'{field}_blob' for field in cls.ANALYSIS_FIELDS if sections is None or field in sections]
+    
+    @classmethod
+    def search_columns(cls) -> list:
+        """The model fields holding the text of SEARCH_FIELDS."""
+        return [f'{field}_blob' if field in cls.ANALYSIS_FIELDS else field for field in SEARCH_FIELDS]
+    
+    def _section_changed(self, field) -> bool:
+        """Whether a section's blob differs from the one last loaded or split (unknown counts as changed)."""
+        attname = f'{field}_blob_id'
+        if attname not in self.__dict__:
+            # Deferred, so not being written
+            return False
+        split = getattr(self, '_split_blobs', {})
+        if field not in split:
+            # A new project has no sections to clear
+            return not (self._state.adding and self.__dict__[attname] is None)
+        return split[field] != self.__dict__[attname]
+    
+    def _mark_split(self, fields) -> None:
+        """Remember the blobs of these sections as stored and split."""
+        if not hasattr(self, '_split_blobs'):
+            self._split_blobs = {}
+        split = self._split_blobs
+        for field in fields:
+            attname = f'{field}_blob_id'
+            if attname in self.__dict__:
+                split[field] = self.__dict__[attname]
+    
+    def has_analysis_for(self, startup_idea, target_market) -> bool:
+        """Whether this project holds a completed analysis of exactly this idea."""
+        return (
+            self.status == 'completed'
+            and self.startup_idea == startup_idea
+            and (self.target_market or None) == (target_market or None)
+        )
+    
+    def mark_analyzing(self) -> None:
+        """Record the pending -> analyzing transition."""
+        self._transition(status='analyzing', error=None, started_at=timezone.now())
+    
+    def mark_failed(self, error: str) -> None:
+        """Record the transition to failed; sections that did finish are kept."""
+        self._transition(status='failed', error=error, completed_at=timezone.now())
+    
+    def save_partial(self, results: dict) -> None:
+        """Store the sections of one finished agent while the analysis is still running."""
+        self._transition(**results)
+    
+    def save_analysis(self, result: dict) -> None:
+        """
+        Store every analysis section and mark the project completed, in a single UPDATE.
+        
+        The run's node checkpoints are compressed in the same transaction:
+        they are only replayed again by "refine" requests.
+        """
+        fields = {field: result.get(field) for field in self.ANALYSIS_FIELDS}
+        with transaction.atomic():
+            self._transition(status='completed', error=None, completed_at=timezone.now(), **fields)
+            NodeCheckpoint.objects.compress(self)
+    
+    def _transition(self, **fields) -> None:
+        """Write only the given columns (plus `updated_at`) and mirror them on this instance."""
+        fields['updated_at'] = timezone.now()
+        columns = {}
+        for field, value in fields.items():
+            setattr(self, field, value)
+            if field in self.ANALYSIS_FIELDS:
+                # Sections are stored as blobs; the setter above stored this one
+                field = f'{field}_blob'
+                value = getattr(self, field)
+            columns[field] = value
+        
+        with transaction.atomic():
+            Project.objects.filter(pk=self.pk).update(**columns)
+            # Changed text is re-indexed for search and re-split into sections in the same transaction
+            if any(field in SEARCH_FIELDS for field in fields):
+                index_project(self)
+            changed = [field for field in self.ANALYSIS_FIELDS if field in fields]
+            if changed:
+                AnalysisSection.objects.split(self, changed)
+        self._mark_split(changed)
+
+
+class IdeaSignatureManager(models.Manager):
+    
+    def index(self, project) -> None:
+        """Store the MinHash signature and LSH buckets of a project's idea, unless they are unchanged."""
+        signature = idea_signature(project.startup_idea, project.target_market)
+        packed = pack_signature(signature) if signature is not None else None
+        stored = self.filter(project=project).values_list('signature', flat=True).first()
+        if stored is not None and bytes(stored) == packed:
+            return
+        
+        IdeaBucket.objects.filter(project=project).delete()
+        if packed is None:
+            self.filter(project=project).delete()
+            return
+        self.update_or_create(project=project, defaults={'signature': packed})
+        IdeaBucket.objects.bulk_create([
+            IdeaBucket(project=project, band=band, bucket=bucket)
+            for band, bucket in enumerate(band_buckets(signature))
+        ])
+    
+    def find_similar(self, startup_idea, target_market, threshold: float):
+        """
+        The completed project whose idea is most similar to this one.
+        
+        Returns (project, similarity), or None when no completed project
+        reaches `threshold` (an estimated Jaccard similarity of the ideas'
+        words, 0-1). Only projects sharing an LSH bucket are compared.
+        """
+        signature = idea_signature(startup_idea, target_market)
+        if signature is None:
+            return None
+        
+        buckets = Q()
+        for band, bucket in enumerate(band_buckets(signature)):
+            buckets |= Q(band=band, bucket=bucket)
+        # Projects sharing the most bands first; a cap bounds the work for very generic ideas
+        candidates = (
+            IdeaBucket.objects.filter(buckets, project__status='completed')
+            .values('project')
+            .annotate(bands=Count('id'))
+            .order_by('-bands')
+            .values_list('project', 'bands')[:settings.SIMILAR_IDEA_CANDIDATES]
+        )
+        
+        best = None
+        for project_id, stored in self.filter(project__in=[pk for pk, _ in candidates]).values_list('project', 'signature'):
+            score = similarity(signature, unpack_signature(stored))
+            if score >= threshold and (best is None or score > best[1]):
+                best = (project_id, score)
+        if best is None:
+            return None
+        
+        project = Project.objects.select_related(*Project.section_blob_fields()).get(pk=best[0])
+        return project, best[1]
+
+
+class IdeaSignature(models.Model):
+    """MinHash signature of a project's idea and target market (see analyzer.similarity)."""
+    
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='idea_signature')
+    signature = models.BinaryField()
+    
+    objects = IdeaSignatureManager()
+    
+    def __str__(self):
+        return f"Idea signature of {self.project_id}"
+
+
+class IdeaBucket(models.Model):
+    """One LSH band of a project's idea signature; ideas sharing a bucket are near-duplicate candidates."""
+    
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='idea_bucket_lookup_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Band {self.band} bucket {self.bucket} of {self.project_id}"
+
+
+class ProjectRendition(models.Model):
+    """A completed project's detail JSON, stored precompressed (see analyzer.renditions)."""
+    
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='rendition')
+    # The Project.updated_at this rendition was serialized from; stale once they differ
+    updated_at = models.DateTimeField()
+    gzip = models.BinaryField()
+    br = models.BinaryField(blank=True, null=True)
+    
+    def __str__(self):
+        return f"Rendition of {self.project_id} ({len(self.gzip)} bytes gzipped)"
+    
+    def encoded(self, encoding) -> bytes:
+        """The body in a content encoding ('br', 'gzip' or None for identity)."""
+        if encoding is None:
+            return gzip.decompress(bytes(self.gzip))
+        return bytes(getattr(self, encoding))
+
+
+class AnalysisSectionManager(models.Manager):
+    
+    def split(self, project, fields=None) -> None:
+        """
+        Store the sections of a project's analysis fields (default: all of them).
+        
+        Fields whose text is unchanged since they were last split are skipped;
+        a field that was cleared loses its sections. The sections of a
+        malformed report (one whose headings don't all match its prompt) are
+        stored as far as they were found, and the missing ones are logged and
+        counted in `/metrics`.
+        """
+        fields = fields or Project.ANALYSIS_FIELDS
+        split = dict(
+            self.filter(project=project, field__in=fields).values_list('field', 'source_digest').distinct()
+        )
+        for field in fields:
+            digest = getattr(project, f'{field}_blob_id')
+            if digest is not None and split.get(field) == digest:
+                continue
+            self.filter(project=project, field=field).delete()
+            if digest is None:
+                continue
+            report = parse_sections(field, getattr(project, field))
+            if not report.valid:
+                print(f"⚠️ {field} of project {project.pk} is missing sections: {', '.join(report.missing)}")
+                for key in report.missing:
+                    metrics.REPORT_SECTIONS_MISSING.inc(field, key)
+            self.bulk_create([
+                AnalysisSection(
+                    project=project,
+                    field=field,
+                    key=section.key,
+                    title=section.title,
+                    position=position,
+                    source_digest=digest,
+                    blob=TextBlob.objects.store(section.text),
+                )
+                for position, section in enumerate(report.sections)
+            ])
+
+
+class AnalysisSection(models.Model):
+    """One numbered section of an analysis field, as split by analyzer.sections."""
+    
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='sections')
+    field = models.CharField(max_length=50)
+    key = models.CharField(max_length=100)
+    title = models.CharField(max_length=200)
+    # Order of the section in the report
+    position = models.PositiveSmallIntegerField()
+    # Digest of the whole field's text the section was split from
+    source_digest = models.CharField(max_length=64)
+    blob = models.ForeignKey(TextBlob, on_delete=models.PROTECT, related_name='+')
+    
+    objects = AnalysisSectionManager()
+    
+    class Meta:
+        ordering = ['field', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'field', 'key'], name='unique_analysis_section'),
+        ]
+    
+    def __str__(self):
+        return f"{self.field}/{self.key} of {self.project_id}"
+    
+    @property
+    def text(self) -> str:
+        return self.blob.text
+
+
+@receiver(post_delete, sender=Project)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_project(instance)
+
+
+class NodeCheckpointManager(models.Manager):
+    
+    def compress(self, project) -> int:
+        """
+        Compress the outputs of a project's checkpoints once its run completed.
+        
+        A running or failed run reads its checkpoints back, so they are kept
+        as plain JSON until then. Returns the number of checkpoints compressed.
+        """
+        checkpoints = list(self.filter(project=project, output__isnull=False))
+        for checkpoint in checkpoints:
+            checkpoint.codec, checkpoint.data = compress_text(json.dumps(checkpoint.output))
+            checkpoint.output = None
+        self.bulk_update(checkpoints, ['output', 'codec', 'data'])
+        return len(checkpoints)
+
+
+class NodeCheckpoint(models.Model):
+    """Output of one finished workflow node, so a failed run can resume after it."""
+    
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='checkpoints')
+    node = models.CharField(max_length=50)
+    # The output as JSON while the run is going; once it completed, compressed into `data` instead
+    output = models.JSONField(blank=True, null=True)
+    codec = models.CharField(max_length=10, blank=True, null=True)
+    data = models.BinaryField(blank=True, null=True)
+    # Model profile and model the node's completion used; null when it made none
+    profile = models.CharField(max_length=50, blank=True, null=True)
+    model = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = NodeCheckpointManager()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'node'], name='unique_node_checkpoint'),
+        ]
+    
+    def __str__(self):
+        return f"{self.node} checkpoint for {self.project_id}"
+    
+    @property
+    def saved_output(self) -> dict:
+        """The node's output, decompressed if the run already completed."""
+        if self.codec is None:
+            return self.output
+        return json.loads(decompress_text(self.codec, self.data))
+
+
+class AnalysisJobManager(models.Manager):
+    
+    def active(self):
+        """Jobs waiting for or held by a worker."""
+        return self.filter(state__in=AnalysisJob.ACTIVE_STATES)
+    
+    def claimable(self):
+        """Queued jobs, and running jobs whose worker let the lease expire (it crashed or hung)."""
+        return self.filter(Q(state='queued') | Q(state='running', lease_expires_at__lt=timezone.now()))
+    
+    def claim(self, worker: str, limit: int, lease_seconds: float) -> list:
+        """
+        Lease up to `limit` claimable jobs to `worker`, oldest first.
+        
+        On databases with SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL),
+        concurrent workers lock disjoint rows and never wait on each other.
+        Elsewhere (SQLite) each job is taken with a compare-and-set UPDATE
+        that only matches while the job is still in the state it was read
+        in, so of several workers racing for a job exactly one wins it.
+        """
+        now = timezone.now()
+        lease = {'state': 'running', 'worker': worker, 'lease_expires_at': now + timedelta(seconds=lease_seconds)}
+        
+        if connections[self.db].features.has_select_for_update_skip_locked:
+            with transaction.atomic(using=self.db):
+                jobs = list(self.claimable().select_for_update(skip_locked=True).order_by('created_at')[:limit])
+                for job in jobs:
+                    for field, value in lease.items():
+                        setattr(job, field, value)
+                    job.attempts += 1
+                    job.updated_at = now
+                self.bulk_update(jobs, [*lease, 'attempts', 'updated_at'])
+            return jobs
+        
+        claimed = []
+        for job in self.claimable().order_by('created_at')[:limit * 2]:
+            won = self.filter(
+                pk=job.pk, state=job.state, worker=job.worker, lease_expires_at=job.lease_expires_at,
+            ).update(**lease, attempts=F('attempts') + 1, updated_at=now)
+            if won:
+                for field, value in lease.items():
+                    setattr(job, field, value)
+                job.attempts += 1
+                claimed.append(job)
+                if len(claimed) == limit:
+                    break
+        return claimed
+    
+    def renew(self, worker: str, job_ids, lease_seconds: float) -> set:
+        """Extend the worker's leases on the given jobs; returns the ids it still holds."""
+        held = self.filter(pk__in=list(job_ids), state='running', worker=worker)
+        ids = set(held.values_list('pk', flat=True))
+        held.update(lease_expires_at=timezone.now() + timedelta(seconds=lease_seconds))
+        return ids
+    
+    def held(self, job):
+        """
+        The job's row, while the claim `job` was read from still holds it.
+        
+        Every claim increments `attempts`, so a worker that lost its lease
+        and claimed the job again is told apart from its earlier claim.
+        """
+        return self.filter(pk=job.pk, state='running', worker=job.worker, attempts=job.attempts)
+    
+    def finish(self, job, state: str, error=None) -> bool:
+        """Record a claimed job's outcome; False if its lease was lost to another worker meanwhile."""
+        return bool(self.held(job).update(
+            state=state, error=error, lease_expires_at=None, updated_at=timezone.now(),
+        ))
+
+
+class AnalysisJob(models.Model):
+    """
+    A queued analysis in the durable, database-backed job queue (see analyzer.jobs).
+    
+    Workers lease jobs: `queued` -> `running` (held by `worker` until
+    `lease_expires_at`, renewed while it runs) -> `done` / `failed`. A running
+    job whose lease expires is claimed again by another worker.
+    """
+    
+    STATE_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    ACTIVE_STATES = ('queued', 'running')
+    
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='jobs')
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default='queued')
+    # Claims so far, including ones whose worker crashed
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=200, blank=True, null=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    # A rerun: the worker calls the LLM instead of replaying cached completions
+    refresh_cache = models.BooleanField(default=False)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = AnalysisJobManager()
+    
+    class Meta:
+        indexes = [
+            # Backs claiming: the oldest claimable jobs
+            models.Index(fields=['state', 'created_at'], name='analysis_job_claim_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project'],
+                condition=Q(state__in=['queued', 'running']),
+                name='one_active_job_per_project',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Analysis job {self.pk} for {self.project_id} ({self.state})"
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ProjectCursorPagination(CursorPagination):
+    """
+    Cursor pagination over projects, newest first.
+    
+    Cursors seek on `created_at` instead of counting an OFFSET, so every
+    page costs the same no matter how deep into the list it is.
+    """
+    
+    ordering = '-created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
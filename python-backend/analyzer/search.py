@@ -0,0 +1,274 @@
+"""
+Full-text search over projects: the idea, the target market and every analysis section.
+
+The index is a side table kept up to date incrementally. A project is
+re-indexed whenever it is saved or one of its sections is written
+(`Project.save`, `Project._transition`), and dropped when it is deleted.
+
+- SQLite: an FTS5 table with Porter stemming. Results are ranked by bm25,
+  with the idea weighted highest, and snippets come from FTS5's `snippet()`.
+- PostgreSQL: weighted `tsvector`s with a GIN index. Results are ranked by
+  `ts_rank_cd`, and snippets come from `ts_headline`.
+
+Finding the matches is fast, but scoring every one is not: a broad term like
+"revenue" matches nearly every analysis. So only the newest
+`SEARCH_RANK_WINDOW` matches are ranked, and snippets are only made for the
+page returned. Queries with fewer matches than the window are ranked exactly.
+Older matches of a broader query are never returned, however relevant: recall
+is traded for latency. `SEARCH_RANK_WINDOW=0` ranks every match instead.
+
+Other databases have no search index. The index holds its own copy of the
+searchable text, so `manage.py rebuild_search_index` can always recreate it
+from the projects.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+
+
+TABLE = 'analyzer_project_search'
+# SQLite only: the FTS5 rowid of each project, allocated in indexing (i.e. creation) order
+ROWIDS_TABLE = 'analyzer_project_search_rowid'
+
+# Indexed project fields, in column order; the sections follow Project.ANALYSIS_FIELDS
+SEARCH_FIELDS = (
+    'startup_idea',
+    'target_market',
+    'market_analysis',
+    'cost_prediction',
+    'business_strategy',
+    'monetization',
+    'legal_considerations',
+    'tech_stack',
+    'strategist_critique',
+)
+
+# bm25 column weights (project_id, idea, target market, then each section)
+SQLITE_WEIGHTS = (0.0, 5.0, 2.0) + (1.0,) * (len(SEARCH_FIELDS) - 2)
+SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS = '<mark>', '</mark>', '…'
+SNIPPET_TOKENS = 24
+
+_QUERY_TOKEN_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+
+@dataclass
+class SearchHit:
+    project_id: str
+    score: float
+    snippet: str
+
+
+def project_document(project) -> dict:
+    """Indexed text of a project, by field (None for empty fields)."""
+    return {field: getattr(project, field) for field in SEARCH_FIELDS}
+
+
+def fts5_query(text: str) -> str:
+    """
+    Translate a web-search style query into FTS5 syntax.
+
+    Supports `"exact phrases"`, `OR`, `-excluded` terms and `prefix*`; every
+    other term is quoted, so punctuation in user input can't break the query.
+    """
+    positive, negative = [], []
+    for negated, phrase, word in _QUERY_TOKEN_RE.findall(text):
+        if word == 'OR':
+            if positive and positive[-1] != 'OR':
+                positive.append('OR')
+            continue
+        if word.startswith('-') and len(word) > 1:
+            negated, word = '-', word[1:]
+        prefix = word.endswith('*') and len(word) > 1
+        term = (phrase or word.rstrip('*')).replace('"', '""').strip()
+        if not term:
+            continue
+        term = f'"{term}"' + (' *' if prefix else '')
+        (negative if negated else positive).append(term)
+
+    while positive and positive[-1] == 'OR':
+        positive.pop()
+    if not positive:
+        return ''
+    query = ' '.join(positive)
+    for term in negative:
+        query = f'({query}) NOT {term}'
+    return query
+
+
+def _candidates(limit: int, offset: int):
+    """How many of the newest matches to rank for this page (None = all of them)."""
+    window = settings.SEARCH_RANK_WINDOW
+    return max(window, offset + limit) if window else None
+
+
+class SQLiteSearchIndex:
+    """FTS5 index; each project keeps a fixed integer rowid, so updates are point writes."""
+
+    def __init__(self, using: str = 'default'):
+        self.using = using
+
+    def index(self, documents) -> None:
+        """Insert or replace (project, {field: text}) documents."""
+        documents = [(project.pk.hex, fields) for project, fields in documents]
+        if not documents:
+            return
+        with connections[self.using].cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR IGNORE INTO {ROWIDS_TABLE} (project_id) VALUES (%s)",
+                [(project_id,) for project_id, _ in documents],
+            )
+            cursor.execute(
+                f"SELECT project_id, id FROM {ROWIDS_TABLE} WHERE project_id IN ({', '.join(['%s'] * len(documents))})",
+                [project_id for project_id, _ in documents],
+            )
+            rowids = dict(cursor.fetchall())
+            rows = [
+                (rowids[project_id], project_id, *(fields.get(field) for field in SEARCH_FIELDS))
+                for project_id, fields in documents
+            ]
+            columns = ', '.join(('rowid', 'project_id') + SEARCH_FIELDS)
+            placeholders = ', '.join(['%s'] * (len(SEARCH_FIELDS) + 2))
+            cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(f"INSERT INTO {TABLE} ({columns}) VALUES ({placeholders})", rows)
+
+    def remove(self, project) -> None:
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"SELECT id FROM {ROWIDS_TABLE} WHERE project_id = %s", [project.pk.hex])
+            row = cursor.fetchone()
+            if row is not None:
+                cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", row)
+                cursor.execute(f"DELETE FROM {ROWIDS_TABLE} WHERE id = %s", row)
+
+    def clear(self) -> None:
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+            cursor.execute(f"DELETE FROM {ROWIDS_TABLE}")
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list:
+        match = fts5_query(query)
+        if not match:
+            return []
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        candidates = _candidates(limit, offset)
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, score FROM ("
+                f"  SELECT rowid, bm25({TABLE}, {weights}) AS score FROM {TABLE}"
+                f"  WHERE {TABLE} MATCH %s ORDER BY rowid DESC LIMIT %s"
+                f") ORDER BY score LIMIT %s OFFSET %s",
+                [match, -1 if candidates is None else candidates, limit, offset],
+            )
+            ranked = cursor.fetchall()
+            if not ranked:
+                return []
+
+            # One pass over the page's rowid range: FTS5 re-runs the whole query for
+            # each value of a plain `rowid IN (...)`, which is slow for prefix terms
+            rowids = [rowid for rowid, _ in ranked]
+            cursor.execute(
+                f"SELECT rowid, project_id, snippet({TABLE}, -1, %s, %s, %s, %s) FROM {TABLE} "
+                f"WHERE {TABLE} MATCH %s AND rowid BETWEEN %s AND %s "
+                f"AND +rowid IN ({', '.join(['%s'] * len(rowids))})",
+                [
+                    SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS,
+                    match, min(rowids), max(rowids), *rowids,
+                ],
+            )
+            snippets = {rowid: (project_id, snippet) for rowid, project_id, snippet in cursor.fetchall()}
+        # bm25 is lower-is-better; report higher-is-better scores
+        return [
+            SearchHit(snippets[rowid][0], round(-score, 6), snippets[rowid][1])
+            for rowid, score in ranked if rowid in snippets
+        ]
+
+
+class PostgresSearchIndex:
+    """tsvector index: the idea weighted A, the target market B, the sections C."""
+
+    def __init__(self, using: str = 'default'):
+        self.using = using
+
+    def index(self, documents) -> None:
+        """Insert or replace (project, {field: text}) documents."""
+        config = settings.SEARCH_CONFIG
+        rows = []
+        for project, fields in documents:
+            sections = '\n\n'.join(fields[field] for field in SEARCH_FIELDS[2:] if fields.get(field))
+            body = '\n\n'.join(text for text in (fields.get('startup_idea'), fields.get('target_market'), sections) if text)
+            rows.append((
+                project.pk, body,
+                config, fields.get('startup_idea') or '',
+                config, fields.get('target_market') or '',
+                config, sections,
+            ))
+        if not rows:
+            return
+        with connections[self.using].cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (project_id, body, document) VALUES (%s, %s, "
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'C')) "
+                "ON CONFLICT (project_id) DO UPDATE SET body = EXCLUDED.body, document = EXCLUDED.document",
+                rows,
+            )
+
+    def remove(self, project) -> None:
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE project_id = %s", [project.pk])
+
+    def clear(self) -> None:
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"TRUNCATE {TABLE}")
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list:
+        config = settings.SEARCH_CONFIG
+        options = (
+            f"MaxFragments=2, MinWords=8, MaxWords={SNIPPET_TOKENS}, "
+            f"FragmentDelimiter=\" {SNIPPET_ELLIPSIS} \", StartSel={SNIPPET_START}, StopSel={SNIPPET_END}"
+        )
+        with connections[self.using].cursor() as cursor:
+            # Take the newest matches, rank them, then only highlight the returned page
+            cursor.execute(
+                "SELECT project_id, score, ts_headline(%s::regconfig, body, query, %s) FROM ("
+                "  SELECT project_id, body, query, ts_rank_cd(document, query) AS score FROM ("
+                "    SELECT search.project_id, search.body, search.document, query"
+                f"    FROM {TABLE} AS search JOIN analyzer_project AS project ON project.id = search.project_id,"
+                "      websearch_to_tsquery(%s::regconfig, %s) AS query"
+                "    WHERE search.document @@ query ORDER BY project.created_at DESC LIMIT %s"
+                "  ) AS recent ORDER BY score DESC LIMIT %s OFFSET %s"
+                ") AS top ORDER BY score DESC",
+                [config, options, config, query, _candidates(limit, offset), limit, offset],
+            )
+            return [
+                SearchHit(project_id.hex, round(score, 6), snippet)
+                for project_id, score, snippet in cursor.fetchall()
+            ]
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteSearchIndex,
+    'postgresql': PostgresSearchIndex,
+}
+
+
+def get_search_index(using: str = 'default'):
+    """The search index of a database, or None if its backend has no full-text search support here."""
+    backend = SEARCH_BACKENDS.get(connections[using].vendor)
+    return backend(using) if backend else None
+
+
+def index_project(project) -> None:
+    """Re-index one project (its current idea and sections)."""
+    index = get_search_index(project._state.db or 'default')
+    if index is not None:
+        index.index([(project, project_document(project))])
+
+
+def unindex_project(project) -> None:
+    index = get_search_index(project._state.db or 'default')
+    if index is not None:
+        index.remove(project)
@@ -0,0 +1,164 @@
+"""
+Section-level structure of the agents' reports.
+
+Every specialist prompt lists the sections its report must have ("1. TARGET
+AUDIENCE DEEP DIVE", "2. MARKET SIZE ANALYSIS", ... or "MODEL 1:", "PRICING
+PSYCHOLOGY RECOMMENDATIONS" for the monetization expert). `SECTION_SPECS`
+reads those headings out of the prompts, so the prompt stays the single
+definition of each report's structure.
+
+`parse_sections` splits a report at those headings. The models format
+headings loosely (markdown `#`/`**`, different case, extra words after the
+title), so a line is a heading when it is short and holds most of the words
+of the next expected section's title. Sections the model skipped are reported
+as `missing`. Text before the first heading is not part of any section.
+
+The parsed sections are stored one row each (`AnalysisSection`) and served by
+`/projects/<id>/sections/<agent>/<section>`. Downstream nodes use
+`select_sections` to read only the sections they need.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from . import prompts
+
+
+@dataclass
+class SectionSpec:
+    key: str
+    title: str
+
+
+@dataclass
+class ParsedSection:
+    key: str
+    title: str
+    text: str
+
+
+@dataclass
+class ParsedReport:
+    sections: list = field(default_factory=list)
+    # Keys of the spec's sections that were not found, in spec order
+    missing: list = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return bool(self.sections) and not self.missing
+
+
+# Report field of each agent, and the prompt whose headings structure it. The
+# final refinement rewrites the strategist's plan, so it follows that structure.
+AGENT_FIELDS = {
+    'market_analyst': 'market_analysis',
+    'cost_predictor': 'cost_prediction',
+    'business_strategist': 'business_strategy',
+    'monetization': 'monetization',
+    'legal_advisor': 'legal_considerations',
+    'tech_architect': 'tech_stack',
+    'final_refinement': 'strategist_critique',
+}
+FIELD_PROMPTS = {
+    'market_analysis': prompts.MARKET_ANALYST_PROMPT,
+    'cost_prediction': prompts.COST_PREDICTOR_PROMPT,
+    'business_strategy': prompts.BUSINESS_STRATEGIST_PROMPT,
+    'monetization': prompts.MONETIZATION_PROMPT,
+    'legal_considerations': prompts.LEGAL_ADVISOR_PROMPT,
+    'tech_stack': prompts.TECH_ARCHITECT_PROMPT,
+    'strategist_critique': prompts.STRATEGIST_PROMPT,
+}
+
+# Headings in a prompt start at column 0: "3. COMPETITIVE LANDSCAPE", "MODEL 2: [...]"
+# or an all-caps title on its own line ("METRICS TO TRACK", but not "REQUIRED SECTIONS:")
+_PROMPT_HEADING_RE = re.compile(
+    r"^(?:\d+\.\s+(?P<numbered>[A-Z0-9].*?)|(?P<model>MODEL \d+):.*|(?P<caps>[A-Z][A-Z0-9 &/,'-]+[A-Z0-9]))\s*$"
+)
+_WORD_RE = re.compile(r'[a-z0-9]+')
+# Longest line still taken for a heading; longer lines are prose
+MAX_HEADING_LENGTH = 120
+# Share of a title's words a line must contain to be its heading
+MIN_TITLE_OVERLAP = 0.6
+
+
+def _words(text: str) -> list:
+    return _WORD_RE.findall(text.lower())
+
+
+def _title_words(title: str) -> list:
+    """The words naming a section, without parenthesized notes ("(Years 1-3)")."""
+    return _words(re.sub(r'\(.*?\)', '', title))
+
+
+def section_key(title: str) -> str:
+    """URL-friendly key of a section title: "OPPORTUNITIES & THREATS" -> "opportunities_threats"."""
+    return '_'.join(_title_words(title))
+
+
+def prompt_sections(prompt: str) -> list:
+    """The sections a prompt asks for, in order."""
+    specs = []
+    for line in prompt.splitlines():
+        match = _PROMPT_HEADING_RE.match(line)
+        if match:
+            title = match.group('numbered') or match.group('model') or match.group('caps')
+            specs.append(SectionSpec(section_key(title), title))
+    return specs
+
+
+SECTION_SPECS = {report_field: prompt_sections(prompt) for report_field, prompt in FIELD_PROMPTS.items()}
+
+
+def _heading_of(line: str, spec: SectionSpec) -> bool:
+    """Whether a report line is the heading of `spec`."""
+    if len(line) > MAX_HEADING_LENGTH:
+        return False
+    # Drop markdown and list markup: "## **2. Market Size Analysis**" -> "2. Market Size Analysis"
+    line = re.sub(r'^[\s#*_>]*(?:\d+[.)]\s*)?', '', line).strip('*_ ')
+    title_words = _title_words(spec.title)
+    line_words = _words(line)
+    if not title_words or not line_words or line_words[0] != title_words[0]:
+        return False
+    found = sum(word in line_words for word in title_words)
+    return found / len(title_words) >= MIN_TITLE_OVERLAP
+
+
+def parse_sections(report_field: str, text: str) -> ParsedReport:
+    """Split a report into the sections its prompt defines."""
+    specs = SECTION_SPECS.get(report_field, [])
+    if not text or not specs:
+        return ParsedReport(missing=[spec.key for spec in specs])
+
+    found = []  # (spec index, first body line index)
+    lines = text.splitlines()
+    next_spec = 0
+    for index, line in enumerate(lines):
+        # Headings come in prompt order, but the model may skip some
+        for position in range(next_spec, len(specs)):
+            if _heading_of(line, specs[position]):
+                found.append((position, index))
+                next_spec = position + 1
+                break
+
+    report = ParsedReport()
+    for number, (position, heading_line) in enumerate(found):
+        end = found[number + 1][1] if number + 1 < len(found) else len(lines)
+        spec = specs[position]
+        body = '\n'.join(lines[heading_line + 1:end]).strip('\n')
+        report.sections.append(ParsedSection(spec.key, spec.title, body))
+    found_positions = {position for position, _ in found}
+    report.missing = [spec.key for position, spec in enumerate(specs) if position not in found_positions]
+    return report
+
+
+def select_sections(report_field: str, text: str, keys) -> str:
+    """
+    Only the named sections of a report, each under its heading.
+
+    Falls back to the whole report when none of them can be found, so a
+    downstream node never gets less than it did before.
+    """
+    chosen = [section for section in parse_sections(report_field, text).sections if section.key in keys]
+    if not chosen:
+        return text
+    return '\n\n'.join(f"{section.title}\n{section.text}" for section in chosen)
@@ -1,9 +1,20 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Project
 
 
 class ProjectSerializer(serializers.ModelSerializer):
-    """Serializer for Project model."""
+    """
+    Serializer for Project model.
+    
+    Pass `fields` (an iterable of field names) to serialize only those fields.
+    """
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
     
     class Meta:
         model = Project
@@ -19,6 +30,9 @@ class ProjectSerializer(serializers.ModelSerializer):
             'tech_stack',
             'strategist_critique',
             'status',
+            'error',
+            'started_at',
+            'completed_at',
             'created_at',
             'updated_at',
         ]
@@ -32,17 +46,73 @@ class ProjectSerializer(serializers.ModelSerializer):
             'tech_stack',
             'strategist_critique',
             'status',
+            'error',
+            'started_at',
+            'completed_at',
             'created_at',
             'updated_at',
         ]
 
 
+class ProjectListSerializer(serializers.ModelSerializer):
+    """
+    Lightweight serializer for project listings.
+    
+    Leaves out the analysis sections; `idea_excerpt` is annotated by the
+    queryset (see ProjectViewSet) so the full idea text is never loaded.
+    """
+    
+    idea_excerpt = serializers.CharField(read_only=True)
+    
+    class Meta:
+        model = Project
+        fields = [
+            'id',
+            'idea_excerpt',
+            'status',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = fields
+
+
+class ProjectSearchResultSerializer(ProjectListSerializer):
+    """A project listing plus its search `score` and a highlighted `snippet` of the best match."""
+    
+    score = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+    
+    class Meta(ProjectListSerializer.Meta):
+        fields = ProjectListSerializer.Meta.fields + ['score', 'snippet']
+        read_only_fields = fields
+
+
 class AnalyzeRequestSerializer(serializers.Serializer):
     """Serializer for analyze endpoint request."""
     
     startupIdea = serializers.CharField(required=True)
     targetMarket = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     projectId = serializers.UUIDField(required=False, allow_null=True)
+    wait = serializers.BooleanField(required=False, default=False)
+    rerun = serializers.BooleanField(required=False, default=False)
+    # Handling of a near-duplicate of a stored analysis; defaults to SIMILAR_IDEA_MODE
+    similar = serializers.ChoiceField(choices=['offer', 'reuse', 'refine', 'ignore'], required=False)
+
+
+class AnalyzeBatchRequestSerializer(serializers.Serializer):
+    """Serializer for batch analyze endpoint request."""
+    
+    items = AnalyzeRequestSerializer(many=True, allow_empty=False)
+    
+    def validate_items(self, items):
+        if len(items) > settings.ANALYSIS_BATCH_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"A batch may hold at most {settings.ANALYSIS_BATCH_MAX_ITEMS} items."
+            )
+        project_ids = [item['projectId'] for item in items if item.get('projectId')]
+        if len(project_ids) != len(set(project_ids)):
+            raise serializers.ValidationError("Each projectId may appear only once per batch.")
+        return items
 
 
 class AnalysisResultSerializer(serializers.Serializer):
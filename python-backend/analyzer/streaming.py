@@ -0,0 +1,111 @@
+"""
+Incremental JSON rendering for project listings and exports.
+
+DRF's JSONRenderer serializes a whole response into Python structures and
+then one byte string, so peak memory grows with the response and nothing is
+sent until the last row is encoded. `StreamingJSONResponse` writes the same
+JSON (compact, non-ASCII kept, like JSONRenderer with default settings) one
+row at a time, straight from a queryset iterator, so memory stays flat and
+the first byte leaves as soon as the first row is read.
+
+Output is buffered into chunks of about `CHUNK_BYTES`, so a large export is
+not one socket write per row.
+
+Under ASGI, Django reads a synchronous stream to the end (in a thread) before
+sending any of it. There the response gets an async iterator instead, which
+fetches one chunk at a time with `sync_to_async`, so the rows are still read
+and sent as they go.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+CHUNK_BYTES = 64 * 1024
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def encode_json(data) -> str:
+    # JSONRenderer escapes these two as well: they are valid JSON but end lines in JavaScript
+    return _encoder.encode(data).replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+
+def iter_json_rows(rows, serializer, envelope=None, key='results'):
+    """
+    Yield the JSON of `rows` as encoded text chunks.
+
+    Each row is serialized with `serializer.to_representation` (one
+    serializer instance is reused for every row). Without `envelope` the
+    output is a bare array; with it, the output is the envelope object with
+    the array under `key`, e.g. {"next": ..., "results": [...]}.
+    """
+    if envelope is None:
+        head, tail = '[', ']'
+    else:
+        head = encode_json(envelope)[:-1] + (',' if envelope else '') + f'{encode_json(key)}:['
+        tail = ']}'
+    # The opening bytes go out before the first row is read
+    yield head
+
+    buffer, size, separator = [], 0, ''
+    for row in rows:
+        text = separator + encode_json(serializer.to_representation(row))
+        separator = ','
+        buffer.append(text)
+        size += len(text)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    buffer.append(tail)
+    yield ''.join(buffer)
+
+
+async def aiter_chunks(chunks):
+    """
+    Yield the items of the synchronous iterator `chunks`, each fetched with `sync_to_async`.
+
+    Every fetch runs in the request's one sync thread, so a queryset iterator
+    keeps using the same database connection (and server-side cursor).
+    """
+    fetch = sync_to_async(next)
+    try:
+        while (chunk := await fetch(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Releases the cursor when the client disconnects mid-stream
+        await sync_to_async(chunks.close)()
+
+
+def served_async(request) -> bool:
+    """Whether `request` (a Django or DRF request) is being served by the ASGI handler."""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    A JSON response rendered row by row by `iter_json_rows`.
+
+    Pass `asynchronous=True` when serving under ASGI (see `served_async`).
+    """
+
+    def __init__(self, rows, serializer, envelope=None, key='results', asynchronous=False, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        chunks = (chunk.encode('utf-8') for chunk in iter_json_rows(rows, serializer, envelope, key))
+        super().__init__(aiter_chunks(chunks) if asynchronous else chunks, **kwargs)
+
+
+def json_content(response) -> bytes:
+    """The body of a (streaming or regular) response, for tests and benchmarks."""
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+def response_json(response):
+    """The decoded JSON body of a (streaming or regular) response."""
+    return json.loads(json_content(response))
@@ -0,0 +1,82 @@
+import json
+
+from django.test import TestCase
+
+from analyzer.models import Project
+
+
+IDEA = "A marketplace connecting local farmers with urban restaurants"
+MARKET = "Independent restaurants in tier-1 cities"
+
+
+class StoredAnalysisAsyncTests(TestCase):
+    """The async endpoints serve a stored analysis without touching the database on the event loop."""
+
+    def setUp(self):
+        self.project = Project.objects.create(
+            startup_idea=IDEA,
+            target_market=MARKET,
+            status='completed',
+            **{field: f"Stored {field}" for field in Project.ANALYSIS_FIELDS},
+        )
+
+    def request_body(self, **extra) -> dict:
+        return {"startupIdea": IDEA, "targetMarket": MARKET, "projectId": str(self.project.pk), **extra}
+
+    async def test_wait_serves_stored_analysis(self):
+        response = await self.async_client.post('/analyze/wait', self.request_body(), content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["status"], 'completed')
+        self.assertEqual(body["analysis"]["marketAnalysis"], "Stored market_analysis")
+        self.assertEqual(body["analysis"]["strategistCritique"], "Stored strategist_critique")
+
+    async def test_wait_serves_near_duplicate_reuse(self):
+        body = {"startupIdea": IDEA, "targetMarket": MARKET, "similar": "reuse"}
+        response = await self.async_client.post('/analyze/wait', body, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["similarTo"]["projectId"], str(self.project.pk))
+        self.assertEqual(response.json()["analysis"]["techStack"], "Stored tech_stack")
+
+    async def test_stream_serves_stored_analysis(self):
+        response = await self.async_client.post('/analyze/stream', self.request_body(), content_type='application/json')
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+        events = [block for block in content.split('\n\n') if block]
+        self.assertEqual([event.split('\n')[0] for event in events], ["event: start", "event: done"])
+        done = json.loads(events[-1].split('\n', 1)[1][len('data: '):])
+        self.assertEqual(done["analysis"]["legalConsiderations"], "Stored legal_considerations")
+
+    async def test_batch_serves_stored_analysis(self):
+        body = {"items": [self.request_body()]}
+        response = await self.async_client.post('/analyze/batch', body, content_type='application/json')
+        lines = [json.loads(line) for line in b''.join([chunk async for chunk in response.streaming_content]).splitlines()]
+
+        item = next(line for line in lines if line["event"] == "item")
+        self.assertTrue(item["success"])
+        self.assertEqual(item["analysis"]["monetization"], "Stored monetization")
+        self.assertEqual(lines[-1]["failed"], 0)
+
+
+class AsyncListingTests(TestCase):
+    """Under ASGI the listings stream from an async iterator instead of being read to the end first."""
+
+    def setUp(self):
+        Project.objects.create(startup_idea=IDEA, target_market=MARKET, status='completed', market_analysis="Stored")
+
+    async def test_export_streams_asynchronously(self):
+        response = await self.async_client.get('/projects/export/')
+
+        self.assertTrue(response.is_async)
+        rows = json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual([row["startup_idea"] for row in rows], [IDEA])
+
+    async def test_list_streams_asynchronously(self):
+        response = await self.async_client.get('/projects/')
+
+        self.assertTrue(response.is_async)
+        body = json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertIsNone(body["next"])
+        self.assertEqual(len(body["results"]), 1)
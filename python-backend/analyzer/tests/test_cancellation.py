@@ -0,0 +1,32 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+
+from analyzer.models import Project
+from analyzer.views import run_project_analysis
+
+
+async def never_finishes(*args, **kwargs):
+    await asyncio.Event().wait()
+
+
+class CancelledAnalysisTests(TestCase):
+    """A run cancelled by a client disconnect leaves its project failed, not analyzing."""
+
+    def setUp(self):
+        self.project = Project.objects.create(startup_idea="Farm to restaurant marketplace")
+
+    @mock.patch('analyzer.langgraph_workflow.arun_analysis', never_finishes)
+    async def test_cancelled_run_marks_project_failed(self):
+        task = asyncio.ensure_future(run_project_analysis(self.project))
+        while self.project.status != 'analyzing':
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        project = await sync_to_async(Project.objects.get)(pk=self.project.pk)
+        self.assertEqual(project.status, 'failed')
+        self.assertEqual(project.error, 'cancelled')
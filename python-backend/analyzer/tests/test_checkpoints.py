@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from analyzer.checkpoints import ProjectCheckpointStore
+from analyzer.models import NodeCheckpoint, Project
+
+
+class CompressCheckpointsTests(TestCase):
+
+    def setUp(self):
+        self.project = Project.objects.create(startup_idea="Farm to restaurant marketplace")
+        ProjectCheckpointStore(self.project).save('market_analyst', {"market_analysis": "Chefs buy daily."}, 'fast', 'small')
+
+    def test_completed_run_compresses_checkpoints(self):
+        self.project.save_analysis({"market_analysis": "Chefs buy daily."})
+
+        checkpoint = NodeCheckpoint.objects.get(project=self.project)
+        self.assertIsNone(checkpoint.output)
+        self.assertIsNotNone(checkpoint.codec)
+        self.assertEqual(ProjectCheckpointStore(self.project).load('market_analyst'), {"market_analysis": "Chefs buy daily."})
+
+    def test_refinement_replays_compressed_checkpoints(self):
+        self.project.save_analysis({"market_analysis": "Chefs buy daily."})
+
+        refined = Project.objects.prepare_refinement(self.project, "Farm to cafe marketplace", None, ['final_refinement'])
+
+        self.assertEqual(ProjectCheckpointStore(refined).load('market_analyst'), {"market_analysis": "Chefs buy daily."})
+
+    def test_failed_run_keeps_plain_checkpoints(self):
+        self.project.mark_failed("rate limited")
+
+        self.assertEqual(NodeCheckpoint.objects.get(project=self.project).output, {"market_analysis": "Chefs buy daily."})
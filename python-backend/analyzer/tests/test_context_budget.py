@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase
+
+from analyzer.context_budget import compact_text, count_tokens
+
+
+def report(sections: int) -> str:
+    return "\n".join(
+        f"## {number}. Section number {number} of the market report\n"
+        + "\n".join(f"- Finding {number}.{line} is worth ${number}{line}00 a month to the business" for line in range(6))
+        for number in range(1, sections + 1)
+    )
+
+
+class CompactTextTests(SimpleTestCase):
+
+    def test_dropped_heading_takes_its_body_with_it(self):
+        text = report(12)
+        budget = count_tokens(text) // 3
+
+        compacted = compact_text(text, budget).splitlines()
+
+        headings = [line for line in compacted if line.startswith("## ")]
+        self.assertLess(len(headings), 12)
+        kept_sections = {heading.split(".")[0][3:] for heading in headings}
+        for line in compacted:
+            if line.startswith("- Finding "):
+                self.assertIn(line[len("- Finding "):].split(".")[0], kept_sections, line)
+        self.assertLessEqual(count_tokens("\n".join(compacted)), budget)
+
+    def test_text_within_budget_is_unchanged(self):
+        text = report(2)
+
+        self.assertEqual(compact_text(text, count_tokens(text)), text)
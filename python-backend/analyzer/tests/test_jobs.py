@@ -0,0 +1,58 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from analyzer.jobs import run_analysis_job
+from analyzer.models import AnalysisJob, Project
+
+
+def fake_stream(startup_idea, target_market=None, checkpoints=None, refresh=False):
+    yield "market_analyst", {"market_analysis": "Chefs buy produce every morning."}
+
+
+@mock.patch('analyzer.langgraph_workflow.stream_analysis', fake_stream)
+class JobLeaseTests(TransactionTestCase):
+    """Only the worker currently holding a job's lease may record its results."""
+
+    def setUp(self):
+        self.project = Project.objects.create(startup_idea="Farm to restaurant marketplace")
+        self.job = AnalysisJob.objects.create(project=self.project)
+
+    def claim(self, worker: str):
+        [job] = AnalysisJob.objects.claim(worker, 1, lease_seconds=60)
+        return job
+
+    def expire_lease(self):
+        AnalysisJob.objects.filter(pk=self.job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_worker_holding_the_lease_records_results(self):
+        job = self.claim('worker-a')
+
+        self.assertTrue(run_analysis_job(self.project.pk, job=job))
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'completed')
+        self.assertEqual(AnalysisJob.objects.get(pk=self.job.pk).state, 'done')
+
+    def test_worker_that_lost_its_lease_discards_results(self):
+        stale = self.claim('worker-a')
+        self.expire_lease()
+        current = self.claim('worker-b')
+
+        self.assertFalse(run_analysis_job(self.project.pk, job=stale))
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'pending')
+        self.assertIsNone(self.project.market_analysis)
+        job = AnalysisJob.objects.get(pk=self.job.pk)
+        self.assertEqual((job.state, job.worker, job.attempts), ('running', 'worker-b', current.attempts))
+
+    def test_reclaim_by_the_same_worker_supersedes_its_earlier_claim(self):
+        stale = self.claim('worker-a')
+        self.expire_lease()
+        self.claim('worker-a')
+
+        self.assertFalse(run_analysis_job(self.project.pk, job=stale))
+        self.assertEqual(AnalysisJob.objects.get(pk=self.job.pk).state, 'running')
@@ -0,0 +1,30 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from analyzer import metrics
+from analyzer.llm_pool import LLMClientPool
+
+
+@mock.patch.object(LLMClientPool, '_build', lambda self, *args, **kwargs: object())
+class PoolMetricsTests(SimpleTestCase):
+    """The pool's counts are exported on /metrics, not only by stats() in the serving process."""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        self.pool = LLMClientPool(api_key='test-key')
+        self.addCleanup(self.pool.close)
+
+    def test_lookups_are_counted_by_outcome(self):
+        self.pool.get('test-model', 0.7, 1000)
+        self.pool.get('test-model', 0.7, 1000)
+
+        self.assertEqual(metrics.LLM_POOL_LOOKUPS.value('miss'), 1)
+        self.assertEqual(metrics.LLM_POOL_LOOKUPS.value('hit'), 1)
+        self.assertEqual(metrics.LLM_POOL_CLIENTS.value(), 1)
+
+    def test_in_flight_follows_held_slots(self):
+        with self.pool.slot():
+            self.assertEqual(metrics.LLM_POOL_IN_FLIGHT.value(), 1)
+        self.assertEqual(metrics.LLM_POOL_IN_FLIGHT.value(), 0)
+        self.assertIn('llm_pool_in_flight 0', metrics.REGISTRY.render())
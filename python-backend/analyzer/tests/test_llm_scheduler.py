@@ -0,0 +1,132 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from analyzer import metrics
+from analyzer.llm_resilience import CircuitBreaker, HedgeCancelled, ResilientCaller
+from analyzer.llm_scheduler import LLMScheduler
+
+
+MODEL = 'test-model'
+
+
+class SchedulerSettlementTests(SimpleTestCase):
+    """A reservation is returned however the call ends, so failures don't shrink the budget."""
+
+    def setUp(self):
+        self.scheduler = LLMScheduler(requests_per_minute=10, tokens_per_minute=1000)
+
+    def budget(self) -> dict:
+        return self.scheduler.stats()["budgets"][MODEL]
+
+    def test_failed_call_returns_its_tokens(self):
+        with self.assertRaises(RuntimeError):
+            with self.scheduler.admit(MODEL, 400):
+                self.assertEqual(self.budget()["tokens_available"], 600)
+                raise RuntimeError("upstream 500")
+
+        self.assertEqual(self.budget()["tokens_available"], 1000)
+        # The request was sent, so it still counts against the RPM limit
+        self.assertLess(self.budget()["requests_available"], 10)
+
+    def test_hedge_cancelled_call_returns_its_request(self):
+        with self.assertRaises(HedgeCancelled):
+            with self.scheduler.admit(MODEL, 400):
+                raise HedgeCancelled()
+
+        self.assertEqual(self.budget(), {"requests_available": 10, "tokens_available": 1000})
+
+    def test_settled_call_is_not_refunded_again(self):
+        with self.scheduler.admit(MODEL, 400) as ticket:
+            self.scheduler.settle(ticket, 300)
+        self.scheduler.release(ticket)
+
+        self.assertEqual(self.budget()["tokens_available"], 700)
+
+    def test_async_failed_call_returns_its_tokens(self):
+        async def fail():
+            async with self.scheduler.aadmit(MODEL, 400):
+                raise RuntimeError("upstream 500")
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(fail())
+
+        self.assertEqual(self.budget()["tokens_available"], 1000)
+
+    def test_async_cancelled_call_returns_its_reservation(self):
+        async def cancel():
+            started = asyncio.Event()
+
+            async def call():
+                async with self.scheduler.aadmit(MODEL, 400):
+                    started.set()
+                    await asyncio.sleep(60)
+
+            task = asyncio.create_task(call())
+            await started.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel())
+
+        self.assertEqual(self.budget(), {"requests_available": 10, "tokens_available": 1000})
+
+
+class HedgeAndRetrySettlementTests(SimpleTestCase):
+    """Retries are admitted afresh after the failed attempt gave its tokens back; hedges share a ticket."""
+
+    def setUp(self):
+        self.scheduler = LLMScheduler(requests_per_minute=10, tokens_per_minute=1000)
+
+    def tokens_available(self) -> int:
+        return self.scheduler.stats()["budgets"][MODEL]["tokens_available"]
+
+    def test_hedge_reserves_nothing_more(self):
+        with self.scheduler.admit(MODEL, 400) as ticket:
+            with self.scheduler.join(ticket):
+                self.assertEqual(self.tokens_available(), 600)
+                self.scheduler.settle(ticket, 300)
+
+        self.assertEqual(self.tokens_available(), 700)
+
+    def test_failed_hedge_leaves_the_call_reservation(self):
+        with self.scheduler.admit(MODEL, 400) as ticket:
+            with self.assertRaises(RuntimeError):
+                with self.scheduler.join(ticket):
+                    raise RuntimeError("upstream 500")
+            self.assertEqual(self.tokens_available(), 600)
+            self.scheduler.settle(ticket, 300)
+
+        self.assertEqual(self.tokens_available(), 700)
+
+    def test_retried_call_reserves_once(self):
+        caller = ResilientCaller(max_retries=2, backoff_base=0, backoff_max=0, breaker_failures=0)
+        failures = iter([TimeoutError("read timed out")])
+
+        def attempt(race, hedge):
+            with self.scheduler.admit(MODEL, 400) as ticket:
+                error = next(failures, None)
+                if error is not None:
+                    raise error
+                self.scheduler.settle(ticket, 250)
+                return "answer"
+
+        self.assertEqual(caller.call(MODEL, attempt), "answer")
+        self.assertEqual(self.tokens_available(), 750)
+
+
+class DisabledBreakerTests(SimpleTestCase):
+    """LLM_BREAKER_FAILURES=0 never opens the breaker, nor reports it open."""
+
+    def setUp(self):
+        metrics.LLM_CIRCUIT_STATE.reset()
+
+    def test_failures_never_open_it(self):
+        breaker = CircuitBreaker(MODEL, failure_threshold=0)
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(metrics.LLM_CIRCUIT_STATE.value(MODEL), CircuitBreaker.CLOSED)
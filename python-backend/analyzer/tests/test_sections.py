@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from analyzer import metrics
+from analyzer.models import AnalysisSection, Project
+from analyzer.sections import parse_sections
+
+
+# A market analysis that skipped "MARKET SIZE ANALYSIS" and everything after "COMPETITIVE LANDSCAPE"
+MALFORMED_REPORT = """Here is my analysis.
+
+## 1. Target Audience Deep Dive
+Chefs who buy produce every morning.
+
+## **3. Competitive Landscape**
+Wholesalers and a few regional apps.
+"""
+
+
+class ParseSectionsTests(SimpleTestCase):
+
+    def test_malformed_report_lists_missing_sections(self):
+        report = parse_sections('market_analysis', MALFORMED_REPORT)
+
+        self.assertFalse(report.valid)
+        self.assertEqual([section.key for section in report.sections], ['target_audience_deep_dive', 'competitive_landscape'])
+        self.assertEqual(report.sections[1].text, "Wholesalers and a few regional apps.")
+        self.assertEqual(report.missing, [
+            'market_size_analysis', 'market_trends_dynamics', 'opportunities_threats', 'data_driven_insights',
+        ])
+
+    def test_report_without_headings_is_invalid(self):
+        report = parse_sections('market_analysis', "The model answered in one paragraph.")
+
+        self.assertFalse(report.valid)
+        self.assertEqual(report.sections, [])
+
+
+class SplitMalformedReportTests(TestCase):
+
+    def test_stores_found_sections_and_counts_missing_ones(self):
+        before = metrics.REPORT_SECTIONS_MISSING.value('market_analysis', 'market_size_analysis')
+
+        project = Project.objects.create(startup_idea="Farm to restaurant marketplace", market_analysis=MALFORMED_REPORT)
+
+        stored = AnalysisSection.objects.filter(project=project, field='market_analysis')
+        self.assertEqual([section.key for section in stored], ['target_audience_deep_dive', 'competitive_landscape'])
+        self.assertEqual(metrics.REPORT_SECTIONS_MISSING.value('market_analysis', 'market_size_analysis'), before + 1)
+
+    def test_unchanged_report_is_not_split_again(self):
+        project = Project.objects.create(startup_idea="Farm to restaurant marketplace", market_analysis="One paragraph.")
+        before = metrics.REPORT_SECTIONS_MISSING.value('market_analysis', 'market_size_analysis')
+
+        project = Project.objects.get(pk=project.pk)
+        project.target_market = "Independent restaurants"
+        project.save()
+        project.save(update_fields=['status'])
+
+        self.assertEqual(metrics.REPORT_SECTIONS_MISSING.value('market_analysis', 'market_size_analysis'), before)
+
+
+class ProjectSaveIndexingTests(TestCase):
+
+    def setUp(self):
+        self.project = Project.objects.create(startup_idea="Farm to restaurant marketplace")
+
+    @mock.patch('analyzer.models.index_project')
+    def test_save_of_unsearched_fields_skips_the_index(self, index_project):
+        self.project.status = 'failed'
+        self.project.save(update_fields=['status', 'updated_at'])
+
+        index_project.assert_not_called()
+
+    @mock.patch('analyzer.models.index_project')
+    def test_save_of_a_section_reindexes(self, index_project):
+        self.project.market_analysis = "Chefs buy produce every morning."
+        self.project.save(update_fields=['market_analysis_blob'])
+
+        index_project.assert_called_once_with(self.project)
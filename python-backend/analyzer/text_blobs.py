@@ -0,0 +1,85 @@
+"""
+Compression codecs for the analysis sections stored as `TextBlob`s.
+
+Sections are LLM prose of a few kilobytes each, which compresses well. Blobs
+are keyed by the SHA-256 of their text, so a section that recurs across
+projects (e.g. a cached agent response served again) is stored once.
+
+The codec is chosen by `TEXT_BLOB_CODEC`: `zstd` (needs the `zstandard`
+package; falls back to `zlib` if it is missing) or `zlib`. Each blob records
+its codec, so blobs written with another codec stay readable. Text that
+does not shrink is stored uncompressed (`raw`).
+"""
+
+import hashlib
+import threading
+import zlib
+
+from django.conf import settings
+
+
+CODECS = ('zstd', 'zlib', 'raw')
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 9
+
+_zstd = None
+_zstd_lock = threading.Lock()
+
+
+def _zstandard():
+    """Return the zstandard module, or False if it is not installed."""
+    global _zstd
+    if _zstd is not None:
+        return _zstd
+
+    with _zstd_lock:
+        if _zstd is None:
+            try:
+                import zstandard
+                _zstd = zstandard
+            except ImportError:
+                print("⚠️ zstandard not installed, compressing analysis sections with zlib")
+                _zstd = False
+    return _zstd
+
+
+def text_digest(text: str) -> str:
+    """Content address of a text: the hex SHA-256 of its UTF-8 encoding."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compress_text(text: str, codec: str = None) -> tuple:
+    """Compress `text`; returns (codec used, data)."""
+    raw = text.encode('utf-8')
+    codec = codec or settings.TEXT_BLOB_CODEC
+    if codec == 'zstd' and not _zstandard():
+        codec = 'zlib'
+
+    if codec == 'zstd':
+        data = _zstandard().ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    elif codec == 'zlib':
+        data = zlib.compress(raw, ZLIB_LEVEL)
+    elif codec == 'raw':
+        data = raw
+    else:
+        raise ValueError(f"Unknown TEXT_BLOB_CODEC '{codec}'. Use one of {CODECS}.")
+
+    if len(data) >= len(raw):
+        return 'raw', raw
+    return codec, data
+
+
+def decompress_text(codec: str, data) -> str:
+    """Inverse of `compress_text`."""
+    data = bytes(data)
+    if codec == 'zstd':
+        if not _zstandard():
+            raise RuntimeError("This section is zstd-compressed; install the zstandard package to read it.")
+        raw = _zstandard().ZstdDecompressor().decompress(data)
+    elif codec == 'zlib':
+        raw = zlib.decompress(data)
+    elif codec == 'raw':
+        raw = data
+    else:
+        raise ValueError(f"Unknown text blob codec '{codec}'.")
+    return raw.decode('utf-8')
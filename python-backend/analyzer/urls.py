@@ -1,7 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import ProjectViewSet, AnalyzeView, health_check, api_root
+from .views import (
+    ProjectViewSet,
+    AnalyzeView,
+    AnalysisStatusView,
+    AsyncAnalyzeView,
+    analyze_stream,
+    analyze_batch,
+    health_check,
+    metrics_view,
+    api_root,
+)
 
 router = DefaultRouter()
 router.register(r'projects', ProjectViewSet)
@@ -9,6 +19,11 @@ router.register(r'projects', ProjectViewSet)
 urlpatterns = [
     path('', api_root, name='api-root'),
     path('health', health_check, name='health-check'),
+    path('metrics', metrics_view, name='metrics'),
     path('analyze', AnalyzeView.as_view(), name='analyze'),
+    path('analyze/stream', analyze_stream, name='analyze-stream'),
+    path('analyze/wait', AsyncAnalyzeView.as_view(), name='analyze-wait'),
+    path('analyze/batch', analyze_batch, name='analyze-batch'),
+    path('analyze/<uuid:project_id>', AnalysisStatusView.as_view(), name='analysis-status'),
     path('', include(router.urls)),
 ]
@@ -1,15 +1,198 @@
+import asyncio
+import json
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models.functions import Substr
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import action, api_view
+from rest_framework.generics import get_object_or_404 as get_object_or_404_drf
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
-from .models import Project
+from .checkpoints import ProjectCheckpointStore
+from .metrics import REGISTRY
+from .models import AnalysisSection, IdeaSignature, Project, ProjectRendition
+from .pagination import ProjectCursorPagination
+from .renditions import ENCODINGS, accepted_encoding, compress_rendition, etag_matches, project_etag
+from .search import get_search_index
+from .sections import AGENT_FIELDS, SECTION_SPECS
+from .streaming import StreamingJSONResponse, served_async
 from .serializers import (
     ProjectSerializer,
+    ProjectListSerializer,
+    ProjectSearchResultSerializer,
     AnalyzeRequestSerializer,
+    AnalyzeBatchRequestSerializer,
     AnalyzeResponseSerializer,
 )
-from .langgraph_workflow import run_analysis
+from .jobs import JobQueueFull, get_job_runner
+
+# The LangGraph workflow (and with it LangChain and the Groq client) is imported
+# inside the views that run it, so processes that never analyze anything
+# (migrate, shell, a worker answering /health) don't pay for loading it.
+
+
+# Analysis fields mapped to the camelCase keys the frontend expects
+ANALYSIS_RESPONSE_KEYS = {
+    "market_analysis": "marketAnalysis",
+    "cost_prediction": "costPrediction",
+    "business_strategy": "businessStrategy",
+    "monetization": "monetization",
+    "legal_considerations": "legalConsiderations",
+    "tech_stack": "techStack",
+    "strategist_critique": "strategistCritique",
+}
+
+
+def format_analysis(result) -> dict:
+    """Map analysis fields (from a result dict or a Project) to the frontend's camelCase keys."""
+    get = result.get if isinstance(result, dict) else lambda field: getattr(result, field)
+    return {key: get(field) for field, key in ANALYSIS_RESPONSE_KEYS.items()}
+
+
+# Nodes a "refine" request re-runs for a near-duplicate idea; the rest replay the match's checkpoints
+REFINE_NODES = ("final_refinement",)
+
+
+def similar_to(similar) -> dict:
+    """Describe a near-duplicate match, a (project, similarity) pair."""
+    project, score = similar
+    return {
+        "projectId": str(project.pk),
+        "similarity": round(score, 3),
+        "ideaExcerpt": project.startup_idea[:ProjectViewSet.IDEA_EXCERPT_LENGTH],
+    }
+
+
+def completed_response(project, similar=None) -> dict:
+    """Response body for a project whose analysis is stored (no LLM call needed)."""
+    response = {
+        "success": True,
+        "projectId": str(project.pk),
+        "status": project.status,
+        "analysis": format_analysis(project),
+    }
+    if similar is not None:
+        response["similarTo"] = similar_to(similar)
+    return response
+
+
+def similar_offer_response(similar) -> dict:
+    """Response body offering a stored analysis of a near-duplicate idea instead of analyzing."""
+    return {
+        "success": True,
+        "projectId": None,
+        "status": "similar",
+        "similarTo": similar_to(similar),
+        "message": 'A similar idea was already analyzed. Resubmit with "similar": "reuse", "refine" or "ignore".',
+    }
+
+
+def prepare_analysis_request(data) -> tuple:
+    """
+    Create or reset the project of a validated analyze request, checking for near-duplicates first.
+    
+    New ideas (no projectId, no rerun) are looked up in the similarity
+    index. On a match the request's `similar` mode decides:
+        offer  - nothing is created; the caller answers with the match
+        reuse  - the matched project is served as is
+        refine - a new project replays the match's agents and only re-runs REFINE_NODES
+        ignore - analyze from scratch
+    
+    Returns (project, reusable, similar), where `similar` is the matched
+    (project, similarity) or None, and `project` is None for an offer.
+    """
+    startup_idea, target_market = data['startupIdea'], data.get('targetMarket')
+    mode = data.get('similar') or settings.SIMILAR_IDEA_MODE
+    
+    similar = None
+    if mode != 'ignore' and settings.SIMILAR_IDEA_THRESHOLD > 0 and not data.get('projectId') and not data['rerun']:
+        similar = IdeaSignature.objects.find_similar(startup_idea, target_market, settings.SIMILAR_IDEA_THRESHOLD)
+    
+    if similar is not None:
+        match, score = similar
+        print(f"🔁 Near-duplicate of {match.pk} (similarity {score:.2f}), mode {mode}")
+        if mode == 'offer':
+            return None, False, similar
+        if mode == 'reuse':
+            return match, True, similar
+        project = Project.objects.prepare_refinement(match, startup_idea, target_market, rerun_nodes=REFINE_NODES)
+        return project, False, similar
+    
+    project, reusable = Project.objects.prepare_analysis(
+        data.get('projectId'), startup_idea, target_market, rerun=data['rerun'],
+    )
+    return project, reusable, None
+
+
+def parse_analyze_request(request):
+    """
+    Validate a JSON analyze request outside DRF (for the async views).
+    
+    Returns (validated_data, body, None) or (None, None, error response).
+    """
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        return None, None, JsonResponse({"success": False, "error": "Invalid JSON body"}, status=400)
+    
+    serializer = AnalyzeRequestSerializer(data=body)
+    if not serializer.is_valid():
+        return None, None, JsonResponse({"success": False, "error": serializer.errors}, status=400)
+    return serializer.validated_data, body, None
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def ndjson_line(data: dict) -> str:
+    """Encode one newline-delimited JSON record."""
+    return json.dumps(data) + "\n"
+
+
+async def run_project_analysis(project, refresh=False) -> dict:
+    """
+    Run the workflow for a prepared project on the event loop and store the result.
+    
+    With `refresh` (a rerun) cached completions are not reused. Marks the
+    project failed and re-raises if the workflow fails or is cancelled (the
+    client disconnected), so it never stays `analyzing`.
+    """
+    from .langgraph_workflow import arun_analysis
+    
+    print(f"📊 Starting analysis for: {project.startup_idea[:100]}...")
+    await sync_to_async(project.mark_analyzing)()
+    
+    try:
+        analysis_result = await arun_analysis(
+            project.startup_idea, project.target_market,
+            checkpoints=await ProjectCheckpointStore.aload(project), refresh=refresh,
+        )
+    except asyncio.CancelledError:
+        print(f"🛑 Analysis of {project.pk} cancelled")
+        await sync_to_async(project.mark_failed)("cancelled")
+        raise
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        await sync_to_async(project.mark_failed)(str(e))
+        raise
+    
+    await sync_to_async(project.save_analysis)(analysis_result)
+    return analysis_result
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -17,10 +200,266 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ViewSet for managing Project objects.
     
     Provides CRUD operations for startup analysis projects.
+    
+    The list is cursor-paginated and only carries an excerpt of each idea;
+    fetch a project for its analysis. `GET /projects/<id>?fields=a,b` returns
+    (and loads) only the named fields. `GET /projects/search?q=` searches the
+    ideas and analyses.
+    
+    Project details carry a strong ETag and answer a matching If-None-Match
+    with 304. Completed projects are served from a precompressed rendition.
+    
+    The list and `GET /projects/export` (every project in full) are rendered
+    row by row as they stream out.
+    
+    `GET /projects/<id>/sections/<agent>/<section>` returns one numbered
+    section of an agent's report, so clients can load only what they show.
     """
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    pagination_class = ProjectCursorPagination
+    
+    # Characters of the startup idea shown in the project list
+    IDEA_EXCERPT_LENGTH = 200
+    SEARCH_PAGE_SIZE = 20
+    SEARCH_MAX_PAGE_SIZE = 100
+    # Rows fetched from the database at a time by /projects/export
+    EXPORT_CHUNK_SIZE = 200
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        if self.action in ('list', 'search'):
+            return queryset.only('id', 'status', 'created_at', 'updated_at').annotate(
+                idea_excerpt=Substr('startup_idea', 1, self.IDEA_EXCERPT_LENGTH),
+            )
+        
+        if self.action in ('retrieve', 'export'):
+            fields = self.get_requested_fields()
+            # Sections live in blobs: join them in (they are decompressed only when serialized)
+            blob_fields = Project.section_blob_fields(fields)
+            if fields:
+                columns = [field for field in fields if field != 'id' and field not in Project.ANALYSIS_FIELDS]
+                queryset = queryset.only('id', *columns, *blob_fields)
+            return queryset.select_related(*blob_fields)
+        
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProjectListSerializer
+        return ProjectSerializer
+    
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('retrieve', 'export'):
+            kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+    
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return StreamingJSONResponse(page, self.get_serializer(), envelope={
+            "next": self.paginator.get_next_link(),
+            "previous": self.paginator.get_previous_link(),
+        }, asynchronous=served_async(request))
+    
+    def retrieve(self, request, *args, **kwargs):
+        # Only the version columns are read before deciding whether anything needs sending
+        stamp = get_object_or_404_drf(Project.objects.only('id', 'status', 'updated_at'), pk=kwargs['pk'])
+        fields = self.get_requested_fields()
+        etag = project_etag(stamp.pk, stamp.updated_at, fields)
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            return self.not_modified(etag)
+        
+        if stamp.status != 'completed' or fields:
+            response = super().retrieve(request, *args, **kwargs)
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+            return response
+        
+        rendition = self.get_rendition(stamp)
+        encoding = accepted_encoding(
+            request.headers.get('Accept-Encoding'),
+            [encoding for encoding in ENCODINGS if getattr(rendition, encoding)],
+        )
+        response = HttpResponse(rendition.encoded(encoding), content_type='application/json')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['ETag'] = project_etag(stamp.pk, rendition.updated_at, encoding=encoding)
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+    
+    def get_rendition(self, stamp):
+        """The precompressed JSON of a completed project, serialized and stored on first use."""
+        rendition = ProjectRendition.objects.filter(project=stamp, updated_at=stamp.updated_at).first()
+        if rendition is None:
+            project = self.get_queryset().get(pk=stamp.pk)
+            data = JSONRenderer().render(self.get_serializer(project).data)
+            rendition, _ = ProjectRendition.objects.update_or_create(
+                project=project,
+                defaults={'updated_at': project.updated_at, **compress_rendition(data)},
+            )
+        return rendition
+    
+    @staticmethod
+    def not_modified(etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+    
+    def get_requested_fields(self):
+        """Valid field names from `?fields=`, or None to return every field."""
+        requested = self.request.query_params.get('fields')
+        if not requested:
+            return None
+        fields = [field.strip() for field in requested.split(',')]
+        return [field for field in fields if field in ProjectSerializer.Meta.fields] or None
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Every project with its analysis, newest first, as one streamed JSON array.
+        
+        GET /projects/export?status=completed&fields=id,startup_idea,market_analysis
+        
+        Rows are read EXPORT_CHUNK_SIZE at a time and encoded one by one, so
+        memory stays flat however many projects there are.
+        """
+        queryset = self.get_queryset()
+        project_status = request.query_params.get('status')
+        if project_status:
+            queryset = queryset.filter(status=project_status)
+        return StreamingJSONResponse(
+            queryset.iterator(chunk_size=self.EXPORT_CHUNK_SIZE), self.get_serializer(),
+            asynchronous=served_async(request),
+        )
+    
+    def get_agent_field(self, agent):
+        """The analysis field an agent writes; raises 404 for unknown agents."""
+        if agent not in AGENT_FIELDS:
+            raise Http404(f"Unknown agent {agent!r}; expected one of {', '.join(AGENT_FIELDS)}")
+        return AGENT_FIELDS[agent]
+    
+    @action(detail=True, methods=['get'])
+    def sections(self, request, pk=None):
+        """
+        The sections each agent's report was split into, without their text.
+        
+        GET /projects/<id>/sections
+        
+        `missing` lists the sections the prompt asked for but the report does
+        not have; it is empty until the agent has finished.
+        """
+        project = get_object_or_404_drf(Project.objects.only('id', *Project.section_blob_fields()), pk=pk)
+        stored = {}
+        for row in AnalysisSection.objects.filter(project=project).values('field', 'key', 'title', 'blob__size'):
+            stored.setdefault(row['field'], []).append(
+                {"key": row['key'], "title": row['title'], "size": row['blob__size']}
+            )
+        
+        agents = []
+        for agent, field in AGENT_FIELDS.items():
+            sections = stored.get(field, [])
+            found = {section["key"] for section in sections}
+            finished = getattr(project, f'{field}_blob_id') is not None
+            agents.append({
+                "agent": agent,
+                "field": field,
+                "sections": sections,
+                "missing": [spec.key for spec in SECTION_SPECS[field] if finished and spec.key not in found],
+            })
+        return Response({"projectId": str(project.pk), "agents": agents})
+    
+    @action(detail=True, methods=['get'], url_path=r'sections/(?P<agent>[a-z_]+)')
+    def agent_sections(self, request, pk=None, agent=None):
+        """
+        The sections of one agent's report, with their text.
+        
+        GET /projects/<id>/sections/market_analyst?keys=market_size_analysis,competitive_landscape
+        """
+        field = self.get_agent_field(agent)
+        project = get_object_or_404_drf(Project.objects.only('id'), pk=pk)
+        queryset = AnalysisSection.objects.filter(project=project, field=field).select_related('blob')
+        keys = request.query_params.get('keys')
+        if keys:
+            queryset = queryset.filter(key__in=[key.strip() for key in keys.split(',')])
+        return Response({
+            "projectId": str(project.pk),
+            "agent": agent,
+            "sections": [
+                {"key": section.key, "title": section.title, "text": section.text}
+                for section in queryset
+            ],
+        })
+    
+    @action(detail=True, methods=['get'], url_path=r'sections/(?P<agent>[a-z_]+)/(?P<section>[a-z0-9_]+)')
+    def section(self, request, pk=None, agent=None, section=None):
+        """
+        One section of an agent's report.
+        
+        GET /projects/<id>/sections/cost_predictor/funding_requirements
+        """
+        field = self.get_agent_field(agent)
+        stored = get_object_or_404_drf(
+            AnalysisSection.objects.select_related('blob'), project=pk, field=field, key=section,
+        )
+        return Response({
+            "projectId": str(stored.project_id),
+            "agent": agent,
+            "key": stored.key,
+            "title": stored.title,
+            "text": stored.text,
+        })
     
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over ideas, target markets and analysis sections.
+        
+        GET /projects/search?q=hipaa compliance&limit=20&offset=0
+        
+        `q` takes "exact phrases", OR, -excluded terms and prefix* terms.
+        Results are ranked by relevance, best first, among the newest
+        SEARCH_RANK_WINDOW matches only: older matches of a broad query are
+        not returned (see analyzer.search).
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"success": False, "error": "Pass a search query as ?q="}, status=status.HTTP_400_BAD_REQUEST)
+        
+        index = get_search_index()
+        if index is None:
+            return Response(
+                {"success": False, "error": "Search is not supported on this database"},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.SEARCH_PAGE_SIZE)), 1), self.SEARCH_MAX_PAGE_SIZE)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            return Response({"success": False, "error": "limit and offset must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # One extra hit tells whether there is a next page, without counting every match
+        hits = index.search(query, limit + 1, offset)
+        projects = self.get_queryset().in_bulk([hit.project_id for hit in hits[:limit]])
+        results = []
+        for hit in hits[:limit]:
+            project = projects.get(uuid.UUID(hit.project_id))
+            if project is not None:
+                project.score, project.snippet = hit.score, hit.snippet
+                results.append(project)
+        
+        next_url = None
+        if len(hits) > limit:
+            next_url = replace_query_param(request.build_absolute_uri(), 'offset', offset + limit)
+        return Response({
+            "query": query,
+            "next": next_url,
+            "results": ProjectSearchResultSerializer(results, many=True).data,
+        })
 
 class AnalyzeView(APIView):
     """
@@ -30,8 +469,17 @@ class AnalyzeView(APIView):
     {
         "startupIdea": "Your startup idea description",
         "targetMarket": "Optional target market",
-        "projectId": "Optional existing project UUID"
+        "projectId": "Optional existing project UUID",
+        "wait": false,
+        "similar": "offer"
     }
+    
+    By default the analysis is queued and the response (202) only carries the
+    project id; poll GET /analyze/<projectId> for status and partial results.
+    Pass "wait": true to run the analysis inside the request instead.
+    
+    A new idea that paraphrases an analyzed one is handled per "similar"
+    (see prepare_analysis_request).
     """
     
     def post(self, request):
@@ -44,40 +492,322 @@ class AnalyzeView(APIView):
             )
         
         startup_idea = serializer.validated_data['startupIdea']
-        target_market = serializer.validated_data.get('targetMarket')
         project_id = serializer.validated_data.get('projectId')
         
-        print(f"📊 Starting analysis for: {startup_idea[:100]}...")
+        runner = get_job_runner()
+        if project_id and runner.is_active(project_id):
+            # Already queued or running; don't start a second copy
+            project = get_object_or_404(Project, pk=project_id)
+            return Response(self.job_response(project), status=status.HTTP_202_ACCEPTED)
+        
+        project, reusable, similar = prepare_analysis_request(serializer.validated_data)
+        if project is None:
+            return Response(similar_offer_response(similar), status=status.HTTP_200_OK)
+        if reusable:
+            print(f"♻️ Serving stored analysis for {project.pk}")
+            return Response(completed_response(project, similar), status=status.HTTP_200_OK)
+        
+        refresh = serializer.validated_data['rerun']
+        if serializer.validated_data['wait']:
+            return self.run_inline(project, similar, refresh)
+        
+        try:
+            runner.submit(project.pk, refresh=refresh)
+        except JobQueueFull as e:
+            project.mark_failed(str(e))
+            return Response(
+                {"success": False, "projectId": str(project.pk), "error": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        print(f"📥 Queued analysis {project.pk}: {startup_idea[:100]}...")
+        return Response(self.job_response(project, similar), status=status.HTTP_202_ACCEPTED)
+    
+    def run_inline(self, project, similar=None, refresh=False):
+        """Run the whole workflow in this request (the original, blocking mode)."""
+        from .langgraph_workflow import run_analysis
+        
+        print(f"📊 Starting analysis for: {project.startup_idea[:100]}...")
+        project.mark_analyzing()
         
         try:
             # Run the LangGraph workflow
-            analysis_result = run_analysis(startup_idea, target_market)
-            
-            print("✅ Analysis complete!")
-            
-            # Format response to match frontend expectations
-            response_data = {
-                "success": True,
-                "projectId": str(project_id) if project_id else None,
-                "analysis": {
-                    "marketAnalysis": analysis_result["market_analysis"],
-                    "costPrediction": analysis_result["cost_prediction"],
-                    "businessStrategy": analysis_result["business_strategy"],
-                    "monetization": analysis_result["monetization"],
-                    "legalConsiderations": analysis_result["legal_considerations"],
-                    "techStack": analysis_result["tech_stack"],
-                    "strategistCritique": analysis_result["strategist_critique"],
-                }
-            }
-            
-            return Response(response_data, status=status.HTTP_200_OK)
-            
+            analysis_result = run_analysis(
+                project.startup_idea, project.target_market,
+                checkpoints=ProjectCheckpointStore(project), refresh=refresh,
+            )
         except Exception as e:
             print(f"❌ Error: {str(e)}")
+            project.mark_failed(str(e))
             return Response(
-                {"success": False, "error": str(e)},
+                {"success": False, "projectId": str(project.pk), "error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        
+        project.save_analysis(analysis_result)
+        print("✅ Analysis complete!")
+        return Response(completed_response(project, similar), status=status.HTTP_200_OK)
+    
+    @staticmethod
+    def job_response(project, similar=None) -> dict:
+        response = {
+            "success": True,
+            "projectId": str(project.pk),
+            "status": project.status,
+            "statusUrl": f"/analyze/{project.pk}",
+        }
+        if similar is not None:
+            response["similarTo"] = similar_to(similar)
+        return response
+
+
+class AnalysisStatusView(APIView):
+    """
+    Poll the status of a queued analysis.
+    
+    GET /analyze/<projectId>
+    
+    Returns the project's status plus whatever sections have completed so
+    far (missing sections are null until their agent finishes).
+    """
+    
+    def get(self, request, project_id):
+        project = get_object_or_404(Project.objects.select_related(*Project.section_blob_fields()), pk=project_id)
+        return Response({
+            "success": project.status != 'failed',
+            "projectId": str(project.pk),
+            "status": project.status,
+            "analysis": format_analysis(project),
+            "error": project.error,
+        })
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAnalyzeView(View):
+    """
+    Async API endpoint that runs the analysis inside the request.
+    
+    POST /analyze/wait  (same body as /analyze)
+    
+    Returns the complete analysis, like /analyze with "wait": true, but every
+    agent awaits its LLM call. Served by the ASGI app, one event loop can
+    multiplex many in-flight analyses without a thread per request.
+    """
+    
+    http_method_names = ['post']
+    
+    async def post(self, request):
+        data, _, error_response = parse_analyze_request(request)
+        if error_response:
+            return error_response
+        
+        project, reusable, similar = await sync_to_async(prepare_analysis_request)(data)
+        if project is None:
+            return JsonResponse(similar_offer_response(similar))
+        if reusable:
+            print(f"♻️ Serving stored analysis for {project.pk}")
+            return JsonResponse(completed_response(project, similar))
+        
+        try:
+            await run_project_analysis(project, refresh=data['rerun'])
+        except Exception as e:
+            return JsonResponse({"success": False, "projectId": str(project.pk), "error": str(e)}, status=500)
+        
+        print("✅ Analysis complete!")
+        return JsonResponse(completed_response(project, similar))
+
+
+@csrf_exempt
+@require_POST
+async def analyze_stream(request):
+    """
+    Stream an analysis as server-sent events while the workflow runs.
+    
+    POST /analyze/stream  (same body as /analyze; add "tokens": true for token deltas)
+    
+    Events:
+        start  - sent immediately, before any LLM call
+        node   - one per finished graph node, with the sections it produced
+        token  - LLM token deltas (only when "tokens" is true)
+        done   - the complete analysis
+        error  - the workflow failed; the stream ends
+    
+    This is an async view: served by the ASGI app it holds no worker thread
+    while the stream is open.
+    """
+    data, body, error_response = parse_analyze_request(request)
+    if error_response:
+        return error_response
+    
+    tokens = bool(body.get('tokens'))
+    project, reusable, similar = await sync_to_async(prepare_analysis_request)(data)
+    if project is None:
+        return JsonResponse(similar_offer_response(similar))
+    
+    async def events():
+        start = {"projectId": str(project.pk)}
+        if similar is not None:
+            start["similarTo"] = similar_to(similar)
+        yield sse_event("start", start)
+        if reusable:
+            print(f"♻️ Serving stored analysis for {project.pk}")
+            yield sse_event("done", completed_response(project, similar))
+            return
+        
+        from .langgraph_workflow import astream_analysis
+        
+        await sync_to_async(project.mark_analyzing)()
+        results = {}
+        try:
+            checkpoints = await ProjectCheckpointStore.aload(project)
+            async for kind, node_name, payload in astream_analysis(
+                project.startup_idea, project.target_market,
+                tokens=tokens, checkpoints=checkpoints, refresh=data['rerun'],
+            ):
+                if kind == "token":
+                    yield sse_event("token", {"node": node_name, "delta": payload})
+                    continue
+                
+                if payload:
+                    results.update(payload)
+                    await sync_to_async(project.save_partial)(payload)
+                yield sse_event("node", {
+                    "node": node_name,
+                    "analysis": {ANALYSIS_RESPONSE_KEYS[field]: text for field, text in payload.items()},
+                })
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client disconnected; record it so the project does not stay 'analyzing'
+            print(f"🛑 Streamed analysis of {project.pk} cancelled")
+            await sync_to_async(project.mark_failed)("cancelled")
+            raise
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            await sync_to_async(project.mark_failed)(str(e))
+            yield sse_event("error", {"success": False, "projectId": str(project.pk), "error": str(e)})
+            return
+        
+        await sync_to_async(project.save_analysis)(results)
+        print("✅ Streamed analysis complete!")
+        yield sse_event("done", completed_response(project, similar))
+    
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # keep nginx & co. from buffering the stream
+    return response
+
+
+def prepare_batch(items: list) -> list:
+    """Create or reset the project of every batch item; returns prepare_analysis_request's triples."""
+    return [prepare_analysis_request(item) for item in items]
+
+
+@csrf_exempt
+@require_POST
+async def analyze_batch(request):
+    """
+    Analyze many ideas in one request, streaming each result as NDJSON.
+    
+    POST /analyze/batch
+    {
+        "items": [{"startupIdea": "...", "targetMarket": "...", "projectId": "..."}, ...]
+    }
+    
+    Every item gets its own Project. Up to ANALYSIS_BATCH_CONCURRENCY items
+    run at once on this request's event loop, and all of their agent calls
+    share the LLM client pool's in-flight slots, so the pool stays busy and
+    the batch takes about (items x calls) / concurrency rather than
+    items x pipeline latency.
+    
+    Items that are near-duplicates of analyzed ideas follow their "similar"
+    mode like /analyze; an offered item is not analyzed and its item line
+    has status "similar" (and a null projectId throughout).
+    
+    Lines (in completion order, not item order):
+        {"event": "start", "items": [{"index": 0, "projectId": "..."}, ...]}
+        {"event": "item", "index": 0, "success": true, "projectId": "...", "status": "completed", "analysis": {...}}
+        {"event": "item", "index": 1, "success": false, "projectId": "...", "status": "failed", "error": "..."}
+        {"event": "done", "items": 2, "completed": 1, "failed": 1, "seconds": 42.0}
+    """
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        return JsonResponse({"success": False, "error": "Invalid JSON body"}, status=400)
+    
+    serializer = AnalyzeBatchRequestSerializer(data=body)
+    if not serializer.is_valid():
+        return JsonResponse({"success": False, "error": serializer.errors}, status=400)
+    
+    items = serializer.validated_data['items']
+    prepared = await sync_to_async(prepare_batch)(items)
+    
+    limit = asyncio.Semaphore(settings.ANALYSIS_BATCH_CONCURRENCY)
+    
+    async def analyze(index, project, reusable, similar):
+        """Run one item; returns its item line."""
+        if project is None:
+            return {"event": "item", "index": index, **similar_offer_response(similar)}
+        if not reusable:
+            try:
+                async with limit:
+                    await run_project_analysis(project, refresh=items[index]['rerun'])
+            except asyncio.CancelledError:
+                if project.status == 'pending':
+                    # Cancelled while waiting for its turn (a started one marked itself failed)
+                    await sync_to_async(project.mark_failed)("cancelled")
+                raise
+            except Exception as e:
+                return {
+                    "event": "item",
+                    "index": index,
+                    "success": False,
+                    "projectId": str(project.pk),
+                    "status": project.status,
+                    "error": str(e),
+                }
+        return {"event": "item", "index": index, **completed_response(project, similar)}
+    
+    async def lines():
+        started = time.perf_counter()
+        yield ndjson_line({
+            "event": "start",
+            "items": [
+                {"index": index, "projectId": str(project.pk) if project else None}
+                for index, (project, *_) in enumerate(prepared)
+            ],
+        })
+        
+        tasks = [
+            asyncio.ensure_future(analyze(index, *item))
+            for index, item in enumerate(prepared)
+        ]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                if not line["success"]:
+                    failed += 1
+                yield ndjson_line(line)
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client went away: stop the analyses that have not finished, and
+            # wait for each to mark its project failed ("cancelled")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        print(f"✅ Batch of {len(tasks)} analyses complete ({failed} failed)")
+        yield ndjson_line({
+            "event": "done",
+            "items": len(tasks),
+            "completed": len(tasks) - failed,
+            "failed": failed,
+            "seconds": round(time.perf_counter() - started, 3),
+        })
+    
+    response = StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @api_view(['GET'])
@@ -86,6 +816,12 @@ def health_check(request):
     return Response({"status": "healthy"})
 
 
+@require_GET
+def metrics_view(request):
+    """Per-node latency, queue wait, token and error metrics in Prometheus text format."""
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @api_view(['GET'])
 def api_root(request):
     """API root endpoint."""
@@ -94,7 +830,15 @@ def api_root(request):
         "version": "1.0.0",
         "endpoints": {
             "analyze": "/analyze",
+            "analysis_status": "/analyze/<projectId>",
+            "analyze_stream": "/analyze/stream",
+            "analyze_wait": "/analyze/wait",
+            "analyze_batch": "/analyze/batch",
             "projects": "/projects",
+            "projects_search": "/projects/search?q=",
+            "projects_export": "/projects/export",
+            "project_sections": "/projects/<id>/sections/<agent>/<section>",
             "health": "/health",
+            "metrics": "/metrics",
         }
     })
@@ -1,5 +1,10 @@
 """
 ASGI config for startup_analyzer project.
+
+Serve the app through this module so long-lived streams (`/analyze/stream`)
+run on the event loop instead of pinning a sync worker:
+
+    gunicorn startup_analyzer.asgi:application -k uvicorn.workers.UvicornWorker
 """
 
 import os
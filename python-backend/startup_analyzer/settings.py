@@ -47,6 +47,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock when a transaction starts, so concurrent
+            # analyses wait for each other instead of failing to upgrade a
+            # read lock with "database is locked"
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -87,3 +94,89 @@ REST_FRAMEWORK = {
 
 # LLM Configuration (Groq Cloud API)
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+# Override to point the Groq client at a proxy or a local stub server
+GROQ_API_BASE = os.getenv('GROQ_API_BASE') or None
+# Max concurrent LLM completions per worker process, shared by all analyses
+LLM_MAX_IN_FLIGHT = int(os.getenv('LLM_MAX_IN_FLIGHT', '8'))
+# Keep-alive HTTP connections kept open to the LLM API per worker process
+LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', '20'))
+LLM_REQUEST_TIMEOUT = float(os.getenv('LLM_REQUEST_TIMEOUT', '120'))
+# Model profiles the workflow nodes are routed to (see analyzer.llm_routing)
+LLM_MODEL_PROFILES = {
+    'large': {
+        'model': os.getenv('LLM_LARGE_MODEL', 'llama-3.3-70b-versatile'),
+        'temperature': float(os.getenv('LLM_LARGE_TEMPERATURE', '0.7')),
+        'max_tokens': int(os.getenv('LLM_LARGE_MAX_TOKENS', '4096')),
+        'timeout': float(os.getenv('LLM_LARGE_TIMEOUT', str(LLM_REQUEST_TIMEOUT))),
+    },
+    'fast': {
+        'model': os.getenv('LLM_FAST_MODEL', 'llama-3.1-8b-instant'),
+        'temperature': float(os.getenv('LLM_FAST_TEMPERATURE', '0.7')),
+        'max_tokens': int(os.getenv('LLM_FAST_MAX_TOKENS', '4096')),
+        'timeout': float(os.getenv('LLM_FAST_TIMEOUT', '60')),
+    },
+}
+# Profile of each node, e.g. "market_analyst=fast,legal_advisor=fast"; other nodes use LLM_DEFAULT_PROFILE
+LLM_NODE_PROFILES = dict(
+    route.replace(' ', '').split('=', 1) for route in os.getenv('LLM_NODE_PROFILES', '').split(',') if '=' in route
+)
+LLM_DEFAULT_PROFILE = os.getenv('LLM_DEFAULT_PROFILE', 'large')
+# Groq rate limits per model for this worker process (0 = unlimited); calls queue until they fit
+LLM_RATE_LIMIT_RPM = int(os.getenv('LLM_RATE_LIMIT_RPM', '0'))
+LLM_RATE_LIMIT_TPM = int(os.getenv('LLM_RATE_LIMIT_TPM', '0'))
+# Retries of transient LLM errors (429, 5xx, timeouts) with jittered exponential backoff
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '3'))
+LLM_RETRY_BACKOFF = float(os.getenv('LLM_RETRY_BACKOFF', '0.5'))  # seconds, doubled per retry
+LLM_RETRY_BACKOFF_MAX = float(os.getenv('LLM_RETRY_BACKOFF_MAX', '20'))
+# Consecutive failures that open a model's circuit breaker (0 = never), and seconds before a trial call
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', '5'))
+LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', '30'))
+# Send a hedged duplicate once a call runs past this percentile of recent latencies (0 = off, e.g. 95)
+LLM_HEDGE_PERCENTILE = float(os.getenv('LLM_HEDGE_PERCENTILE', '0'))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))
+
+# Agent response cache: 'memory' (per-process LRU), 'django' (a cache from CACHES) or 'none'
+LLM_CACHE_BACKEND = os.getenv('LLM_CACHE_BACKEND', 'memory')
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', str(60 * 60 * 24)))  # seconds, 0 = never expire
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '1000'))  # memory backend only
+LLM_CACHE_ALIAS = os.getenv('LLM_CACHE_ALIAS', 'default')  # django backend only
+
+# Analysis sections are stored compressed, deduplicated by content: 'zstd' (falls back to zlib) or 'zlib'
+TEXT_BLOB_CODEC = os.getenv('TEXT_BLOB_CODEC', 'zstd')
+# PostgreSQL text search configuration used by /projects/search (SQLite uses FTS5 with Porter stemming)
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'english')
+# Search ranks only this many of the newest matches of a query: older matches of a broad query are
+# never returned, however relevant (0 = rank every match in the database; exact, but slower for broad terms)
+SEARCH_RANK_WINDOW = int(os.getenv('SEARCH_RANK_WINDOW', '2000'))
+# New ideas at least this similar (estimated Jaccard of their words) to a completed analysis are near-duplicates (0 = off)
+SIMILAR_IDEA_THRESHOLD = float(os.getenv('SIMILAR_IDEA_THRESHOLD', '0.6'))
+# What /analyze does with a near-duplicate unless the request says: 'offer', 'reuse', 'refine' or 'ignore'
+SIMILAR_IDEA_MODE = os.getenv('SIMILAR_IDEA_MODE', 'offer')
+# Most LSH candidates whose signatures are compared per lookup
+SIMILAR_IDEA_CANDIDATES = int(os.getenv('SIMILAR_IDEA_CANDIDATES', '50'))
+
+# Analysis workflow
+# Max number of LangGraph nodes (LLM calls) running at once within one analysis
+ANALYSIS_MAX_CONCURRENCY = int(os.getenv('ANALYSIS_MAX_CONCURRENCY', '6'))
+# Background worker threads per process that run queued /analyze jobs
+ANALYSIS_JOB_WORKERS = int(os.getenv('ANALYSIS_JOB_WORKERS', '4'))
+# Jobs that may wait for a worker before /analyze starts answering 503
+ANALYSIS_JOB_QUEUE_SIZE = int(os.getenv('ANALYSIS_JOB_QUEUE_SIZE', '100'))
+# Where queued /analyze jobs run: 'thread' (in this process) or 'database' (durable, run by `manage.py run_analysis_workers`)
+ANALYSIS_JOB_BACKEND = os.getenv('ANALYSIS_JOB_BACKEND', 'thread')
+# Database queue: seconds a worker holds a job without renewing it, and claims before a job is given up
+ANALYSIS_JOB_LEASE_SECONDS = float(os.getenv('ANALYSIS_JOB_LEASE_SECONDS', '60'))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv('ANALYSIS_JOB_MAX_ATTEMPTS', '3'))
+# Seconds an idle database worker waits before polling the queue again
+ANALYSIS_WORKER_POLL_SECONDS = float(os.getenv('ANALYSIS_WORKER_POLL_SECONDS', '1'))
+# Analyses of one /analyze/batch request running at once (their LLM calls share LLM_MAX_IN_FLIGHT)
+ANALYSIS_BATCH_CONCURRENCY = int(os.getenv('ANALYSIS_BATCH_CONCURRENCY', '8'))
+ANALYSIS_BATCH_MAX_ITEMS = int(os.getenv('ANALYSIS_BATCH_MAX_ITEMS', '500'))
+
+# Token budget for each review node's input sections; longer inputs are compacted (0 = no limit)
+CONTEXT_TOKEN_BUDGETS = {
+    'strategist_synthesis': int(os.getenv('SYNTHESIS_CONTEXT_TOKENS', '6000')),
+    'critic_review': int(os.getenv('CRITIC_CONTEXT_TOKENS', '4000')),
+}
+# tiktoken encoding used to count context tokens (approximated if not available offline)
+TOKENIZER_ENCODING = os.getenv('TOKENIZER_ENCODING', 'cl100k_base')
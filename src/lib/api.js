@@ -109,6 +109,28 @@ export async function analyzeStartup(startupIdea, targetMarket, projectId) {
 
   const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
 
+  const pollAnalysis = async (id) => {
+    // Analyses take a few minutes; give up after ~10 minutes of polling.
+    for (let poll = 0; poll < 200; poll++) {
+      await sleep(3000);
+
+      let data;
+      try {
+        const response = await fetchWithTimeout(`${DJANGO_API_URL}/analyze/${id}`, { method: 'GET' }, 15000);
+        data = await response.json();
+      } catch (e) {
+        // Transient network errors shouldn't abandon a running analysis.
+        console.warn('Polling analysis status failed:', e);
+        continue;
+      }
+
+      if (data?.status === 'completed') return data.analysis;
+      if (data?.status === 'failed') throw new Error(data.error || 'Analysis failed');
+    }
+
+    throw new Error('Analysis is taking longer than expected. Please check back later.');
+  };
+
   // 1) Pre-wake backend (no CORS preflight for simple GET)
   try {
     await fetchWithTimeout(`${DJANGO_API_URL}/health`, { method: 'GET' }, 12000);
@@ -151,6 +173,11 @@ export async function analyzeStartup(startupIdea, targetMarket, projectId) {
       const data = await response.json();
       if (!data?.success) throw new Error(data?.error || 'Analysis failed');
 
+      // The backend queues the analysis (202) and returns the project id to poll.
+      if (data.status && data.status !== 'completed') {
+        return await pollAnalysis(data.projectId);
+      }
+
       return data.analysis;
     } catch (e) {
       console.warn('Django analyze request failed:', e);